@@ -117,6 +117,8 @@ export default function App() {
     supports_animation_color: false,
     supports_ball_count: false,
     ball_count: 3,
+    supports_meteor_count: false,
+    meteor_count: 1,
     game_score: 0,
     game_wave: 1,
     game_over: false,
@@ -136,6 +138,7 @@ export default function App() {
   const isGameMode = ledState.mode === 'game';
   const animationColorSupported = ledState.mode === 'animation' && ledState.supports_animation_color;
   const ballCountSupported = ledState.mode === 'animation' && ledState.supports_ball_count;
+  const meteorCountSupported = ledState.mode === 'animation' && ledState.supports_meteor_count;
 
   const wsRef = useRef(null);
   const reconnectTimer = useRef(null);
@@ -960,6 +963,32 @@ export default function App() {
               </View>
             )}
 
+            {meteorCountSupported && (
+              <View style={styles.ballCountSection}>
+                <Text style={styles.animationToolLabel}>Meteor Rain</Text>
+                <View style={styles.ballCountRow}>
+                  <TouchableOpacity
+                    style={styles.ballCountBtn}
+                    onPress={() => send('decrease_meteor_count')}
+                    activeOpacity={0.6}
+                  >
+                    <Text style={styles.ballCountBtnText}>-</Text>
+                  </TouchableOpacity>
+                  <View style={styles.ballCountValueBox}>
+                    <Text style={styles.ballCountValue}>{ledState.meteor_count || 1}</Text>
+                    <Text style={styles.ballCountCaption}>meteors</Text>
+                  </View>
+                  <TouchableOpacity
+                    style={styles.ballCountBtn}
+                    onPress={() => send('increase_meteor_count')}
+                    activeOpacity={0.6}
+                  >
+                    <Text style={styles.ballCountBtnText}>+</Text>
+                  </TouchableOpacity>
+                </View>
+              </View>
+            )}
+
             {/* AI Create / Edit Section */}
             <View style={styles.aiSection}>
               <Text style={styles.aiSectionTitle}>
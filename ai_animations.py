@@ -11,6 +11,9 @@ import uuid
 from datetime import datetime
 
 from animations import blend_colors, clamp, monotonic_millis, scale_color
+import fastled_math
+import primitives
+from framebuffer import FrameBuffer
 from led_operations import fade_to_black, fill_all, get_pixel, set_pixel
 from config import LED_COUNT
 
@@ -52,6 +55,18 @@ WS2812B strip running at 50 FPS.
     blend_colors(c1, c2, t) -> (r,g,b)  # t: 0.0-1.0
     scale_color(c, f) -> (r,g,b)  # f: 0.0-1.0
     monotonic_millis() -> int
+    FastLED-style integer math (table lookups, cheaper than math.sin):
+    sin8(x), cos8(x) -> 0-255 (period 256); sin16(x), cos16(x) -> -32767..32767 (period 65536)
+    beat8(bpm), beat16(bpm), beatsin8(bpm, lo, hi), beatsin16(bpm, lo, hi)
+    scale8(v, s), qadd8(a, b), qsub8(a, b)
+    frame_millis() -> int  # one timestamp per frame; beat functions use it
+    Vectorized soft shapes, each drawn in one call instead of a per-LED loop. Positions may be
+    fractional (anti-aliased, smooth motion); color is (r,g,b); mode is "add" (default, saturating),
+    "max", "over" (blend by coverage) or "set":
+    draw_glow(strip, center, radius, color, falloff=1.0, mode="add")
+    draw_ring(strip, center, radius, width, color, mode="add")  # expanding shockwave: grow radius
+    draw_trail(strip, head, length, color, direction=1, falloff=2.0, mode="add")  # comet / meteor
+    draw_gradient(strip, start, end, color_a, color_b, mode="over")  # shaded span between two points
 - strip.numPixels() == __LED_COUNT__. Cache any pre-computed lists in ai_state.
 - Always set pixels to non-zero values. Never leave all LEDs black.
 
@@ -216,7 +231,7 @@ def _load_reference_animations():
     _reference_cache = (
         "\n\n## Reference animations — study technique, do NOT copy verbatim\n\n"
         "The files below are hand-tuned production animations from this project. "
-        "They use module-level `import` statements and direct `rpi_ws281x` calls "
+        "They use module-level `import` statements, numpy and direct `rpi_ws281x` calls "
         "that are NOT available in your sandbox. DO NOT copy imports or module-level "
         "state. Instead, study the *techniques* — palette gradients, layered sine "
         "waves with different bpms/phases, particle physics, multi-stage scene "
@@ -411,68 +426,16 @@ def validate_code(code):
 
 
 # ---------------------------------------------------------------------------
-# Mock strip for sandbox validation
+# Sandboxed execution
 # ---------------------------------------------------------------------------
 
 
-class _MockStrip:
-    def __init__(self, n=LED_COUNT):
-        self._n = n
-        self._pixels = [(0, 0, 0)] * n
-        self._any_nonblack = False
-
-    def numPixels(self):
-        return self._n
-
-    def setPixelColor(self, i, color):
-        if 0 <= i < self._n:
-            r = (color >> 16) & 0xFF
-            g = (color >> 8) & 0xFF
-            b = color & 0xFF
-            self._pixels[i] = (r, g, b)
-            if r or g or b:
-                self._any_nonblack = True
-
-    def getPixelColor(self, i):
-        if 0 <= i < self._n:
-            r, g, b = self._pixels[i]
-            return (r << 16) | (g << 8) | b
-        return 0
-
-    def show(self):
-        pass
-
-
-def _mock_set_pixel(strip, i, r, g, b):
-    r2, g2, b2 = int(max(0, min(255, r))), int(max(0, min(255, g))), int(max(0, min(255, b)))
-    if 0 <= i < strip._n:
-        strip._pixels[i] = (r2, g2, b2)
-        if r2 or g2 or b2:
-            strip._any_nonblack = True
-
-
-def _mock_fill_all(strip, r, g, b):
-    r2, g2, b2 = int(max(0, min(255, r))), int(max(0, min(255, g))), int(max(0, min(255, b)))
-    strip._pixels = [(r2, g2, b2)] * strip._n
-    if r2 or g2 or b2:
-        strip._any_nonblack = True
+FASTLED_SANDBOX_NAMES = (
+    "sin8", "cos8", "sin16", "cos16", "beat8", "beat16", "beatsin8", "beatsin16",
+    "scale8", "qadd8", "qsub8", "frame_millis",
+)
 
-
-def _mock_fade_to_black(strip, i, fade):
-    if 0 <= i < strip._n:
-        r, g, b = strip._pixels[i]
-        strip._pixels[i] = (max(0, r - fade), max(0, g - fade), max(0, b - fade))
-
-
-def _mock_get_pixel(strip, i):
-    if 0 <= i < strip._n:
-        return strip._pixels[i]
-    return (0, 0, 0)
-
-
-# ---------------------------------------------------------------------------
-# Sandboxed execution
-# ---------------------------------------------------------------------------
+PRIMITIVE_SANDBOX_NAMES = ("draw_glow", "draw_ring", "draw_trail", "draw_gradient")
 
 
 class _RestrictedTime:
@@ -504,6 +467,8 @@ def create_sandbox_globals():
         "blend_colors": blend_colors,
         "scale_color": scale_color,
         "monotonic_millis": monotonic_millis,
+        **{name: getattr(fastled_math, name) for name in FASTLED_SANDBOX_NAMES},
+        **{name: getattr(primitives, name) for name in PRIMITIVE_SANDBOX_NAMES},
     }
 
 
@@ -518,19 +483,23 @@ def compile_ai_animation(code):
     if not callable(step_fn):
         raise ValueError("ai_step function not found after execution")
 
-    mock = _MockStrip()
-    mock_sandbox = create_sandbox_globals()
-    mock_sandbox["set_pixel"] = _mock_set_pixel
-    mock_sandbox["fill_all"] = _mock_fill_all
-    mock_sandbox["fade_to_black"] = _mock_fade_to_black
-    mock_sandbox["get_pixel"] = _mock_get_pixel
+    # Dry-run a separate copy on a scratch frame so the real ai_state stays untouched
+    test_frame = FrameBuffer(LED_COUNT)
+    test_sandbox = create_sandbox_globals()
     try:
-        exec(compile(code, "<ai_animation_test>", "exec"), mock_sandbox)
-        test_fn = mock_sandbox.get("ai_step")
+        exec(compile(code, "<ai_animation_test>", "exec"), test_sandbox)
+        test_fn = test_sandbox.get("ai_step")
         if callable(test_fn):
+            any_light = False
             for _ in range(15):
-                test_fn(mock)
-            if not mock._any_nonblack:
+                # Frame timestamps are per thread, so this doesn't disturb a running render loop
+                fastled_math.begin_frame()
+                try:
+                    test_fn(test_frame)
+                finally:
+                    fastled_math.end_frame()
+                any_light = any_light or bool(test_frame.to_words().any())
+            if not any_light:
                 raise ValueError("Animation produced no visible light after 15 frames")
     except ValueError:
         raise
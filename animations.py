@@ -1,8 +1,15 @@
 import math
 import random
 import time
+from functools import lru_cache
 
-from led_operations import fade_to_black, fill_all, set_pixel
+import numpy as np
+
+from config import SPARKLE_SEED
+from led_operations import fill_all, set_pixel
+from parallel_render import partition_safe, render_ranges
+from particles import ParticlePool, add_glows, add_points, add_rings, scale_colors
+from primitives import apply_weights
 
 
 def monotonic_millis():
@@ -67,10 +74,10 @@ METEOR_PALETTE = [
 # State containers for animations
 fade_in_out_state = {"direction": 1, "brightness": 0}
 running_lights_state = {"position": 0}
-twinkle_state = {"pixels": []}
-twinkle_random_state = {"used_indices": []}
-sparkle_state = {"initialized": False, "flash_levels": []}
-snow_sparkle_state = {"pixels": [], "timer": 0, "base_color": (16, 16, 16)}
+twinkle_state = {"pixels": [], "rng": None}
+twinkle_random_state = {"used_indices": [], "rng": None}
+sparkle_state = {"initialized": False, "flash_levels": [], "rng": None}
+snow_sparkle_state = {"pixels": [], "timer": 0, "base_color": (16, 16, 16), "rng": None}
 cylon_state = {"pos": 0, "forward": True}
 split_cyclones_state = {"depth": 0, "phase": 1, "progress": 0.0, "max_depth": 0}
 color_wipe_state = {"index": 0, "done": False, "last_color": None}
@@ -94,10 +101,10 @@ wheel_step_state = {"pos": 0}
 death_show_state = {
     "start_time": None,
     "last_time": 0.0,
-    "waves": [],
-    "bursts": [],
-    "embers": [],
-    "comets": [],
+    "waves": ParticlePool(pos=1, vel=1, radius=1, width=1, strength=1, color=3),
+    "bursts": ParticlePool(pos=1, age=1, life=1, radius=1, color=3, halo=3),
+    "embers": ParticlePool(capacity=128, pos=1, vel=1, age=1, life=1, color=3),
+    "comets": ParticlePool(pos=1, vel=1, length=1, color=3, trail=3),
     "next_wave": 0.0,
     "next_burst": 0.0,
     "next_comet": 0.0,
@@ -170,13 +177,13 @@ def cylon_bounce_step(strip, red, green, blue, eye_size, speed_delay, return_del
             st["forward"] = True
 
 
+CYCLONE_EYE_FALLOFF = np.array([0.18, 0.55, 1.0, 0.55, 0.18])
+
+
 def draw_cyclone_eye(strip, center, color, direction):
     num_leds = strip.numPixels()
-    falloff = [0.18, 0.55, 1.0, 0.55, 0.18]
-    for offset, scale in zip(range(-2, 3), falloff):
-        index = center + offset
-        if 0 <= index < num_leds:
-            set_pixel(strip, index, *scale_color(color, scale))
+    start = max(0, center - 2)
+    apply_weights(strip, start, CYCLONE_EYE_FALLOFF[start - (center - 2) :], color, mode="set")
 
     sparkle_index = center + direction
     if 0 <= sparkle_index < num_leds:
@@ -236,10 +243,29 @@ def split_cyclones_step(strip):
         st["progress"] = 0.0
 
 
+def effect_random(st):
+    """The effect's own generator, kept in its state dict.
+
+    Seeded from SPARKLE_SEED when that is set, so a run can be replayed frame for frame.
+    """
+    if st.get("rng") is None:
+        st["rng"] = np.random.default_rng(SPARKLE_SEED)
+    return st["rng"]
+
+
+@lru_cache(maxsize=8)
+def level_gradient(start, end):
+    """blend_colors(start, end, level / 255) for every 0-255 level."""
+    ratio = np.arange(256)[:, None] / 255.0
+    start = np.array(start, dtype=np.float64)
+    return np.floor(start + (np.array(end, dtype=np.float64) - start) * ratio).astype(np.float32)
+
+
 def twinkle_step(strip, red, green, blue, count, only_one):
+    st = twinkle_state
     if only_one:
         fill_all(strip, 0, 0, 0)
-    idx = random.randint(0, strip.numPixels() - 1)
+    idx = effect_random(st).integers(strip.numPixels())
     set_pixel(strip, idx, red, green, blue)
 
 
@@ -249,8 +275,8 @@ def twinkle_random_step(strip, count, only_one):
     if only_one:
         fill_all(strip, 0, 0, 0)
         st["used_indices"] = []
-    idx = random.randint(0, num_leds - 1)
-    set_pixel(strip, idx, random.randint(0, 255), random.randint(0, 255), random.randint(0, 255))
+    idx, red, green, blue = effect_random(st).integers(0, (num_leds, 256, 256, 256))
+    set_pixel(strip, idx, red, green, blue)
 
 
 def sparkle_step(strip, red, green, blue):
@@ -260,18 +286,22 @@ def sparkle_step(strip, red, green, blue):
     flash_color = (255, 250, 235)
 
     if not st["initialized"] or len(st["flash_levels"]) != num_leds:
-        st["flash_levels"] = [0] * num_leds
+        st["flash_levels"] = np.zeros(num_leds, dtype=np.int16)
         st["initialized"] = True
 
-    flash_count = random.randint(2, max(4, num_leds // 55))
-    for _ in range(flash_count):
-        st["flash_levels"][random.randint(0, num_leds - 1)] = random.randint(180, 255)
+    # One draw for the whole frame: flash count, flash positions and levels, per-LED decay
+    max_flashes = max(4, num_leds // 55)
+    draws = effect_random(st).random(1 + 2 * max_flashes + num_leds)
+    flash_count = 2 + int(draws[0] * (max_flashes - 1))
+    positions = (draws[1 : 1 + flash_count] * num_leds).astype(np.intp)
+    flashes = draws[1 + max_flashes : 1 + max_flashes + flash_count]
+    decay = (35 + draws[1 + 2 * max_flashes :] * 36).astype(np.int16)
 
-    for i in range(num_leds):
-        st["flash_levels"][i] = max(0, st["flash_levels"][i] - random.randint(35, 70))
-        level = st["flash_levels"][i] / 255.0
-        color = blend_colors(base_color, flash_color, level)
-        set_pixel(strip, i, *color)
+    levels = st["flash_levels"]
+    levels[positions] = 180 + (flashes * 76).astype(np.int16)
+    np.subtract(levels, decay, out=levels)
+    np.maximum(levels, 0, out=levels)
+    strip.pixels[:] = level_gradient(base_color, flash_color)[levels]
 
 
 def snow_sparkle_step(strip, red, green, blue):
@@ -279,7 +309,7 @@ def snow_sparkle_step(strip, red, green, blue):
     num_leds = strip.numPixels()
 
     if st["timer"] == 0:
-        st["pixels"] = random.sample(range(num_leds), 2)
+        st["pixels"] = effect_random(st).choice(num_leds, min(2, num_leds), replace=False).tolist()
         for p in st["pixels"]:
             set_pixel(strip, p, 255, 255, 255)
         st["timer"] = 5
@@ -394,36 +424,49 @@ def meteor_color_for_offset(offset, meteor_size, trail_length):
     return blend_colors((255, 210, 120), (45, 8, 0), (ratio - 0.45) / 0.55)
 
 
-def meteor_rain_step(strip, red, green, blue, meteor_size, meteor_trail_decay, meteor_random_decay, speed_delay):
+@lru_cache(maxsize=8)
+def meteor_trail(meteor_size, trail_length):
+    """Colors from the head (row 0) to the end of the trail, built once per size."""
+    offsets = range(meteor_size + trail_length)
+    return np.array([meteor_color_for_offset(offset, meteor_size, trail_length) for offset in offsets], dtype=np.float32)
+
+
+def meteor_rain_step(
+    strip, red, green, blue, meteor_size, meteor_trail_decay, meteor_random_decay, speed_delay, meteor_count=1
+):
     st = meteor_rain_state
-    num_leds = strip.numPixels()
+    pixels = strip.pixels
+    num_leds = len(pixels)
     trail_length = max(18, meteor_trail_decay // 2)
     head_size = max(3, meteor_size // 2)
-
-    for j in range(num_leds):
-        fade_to_black(strip, j, 20)
-
-    head_position = int(round(st["pos"]))
-    total_length = head_size + trail_length
-    for offset in range(total_length):
-        pixel = head_position - offset
-        if 0 <= pixel < num_leds:
-            set_pixel(strip, pixel, *meteor_color_for_offset(offset, head_size, trail_length))
-
-    st["pos"] += st["speed"]
-    if st["pos"] - total_length > num_leds:
+    trail = meteor_trail(head_size, trail_length)
+    total_length = len(trail)
+
+    # The frame persists between steps, so the whole strip decays in place
+    np.subtract(pixels, 20, out=pixels)
+    np.maximum(pixels, 0, out=pixels)
+
+    # The head visits cycle / speed positions before wrapping; further meteors
+    # trail it by an even share of that cycle, so they too advance by speed each step
+    speed = st["speed"]
+    cycle = (math.floor((num_leds + total_length) / speed) + 1) * speed
+    positions = (st["pos"] - np.arange(meteor_count) * (cycle / meteor_count)) % cycle
+    index = np.rint(positions).astype(np.intp)[:, None] - np.arange(total_length)
+    visible = (index >= 0) & (index < num_leds)
+    pixels[index[visible]] = np.broadcast_to(trail, index.shape + (3,))[visible]
+
+    st["pos"] += speed
+    if st["pos"] >= cycle - speed / 2:
         st["pos"] = 0.0
 
 
 def reset_death_show_state():
+    for kind in ("waves", "bursts", "embers", "comets"):
+        death_show_state[kind].clear()
     death_show_state.update(
         {
             "start_time": None,
             "last_time": 0.0,
-            "waves": [],
-            "bursts": [],
-            "embers": [],
-            "comets": [],
             "next_wave": 0.0,
             "next_burst": 0.0,
             "next_comet": 0.0,
@@ -432,36 +475,8 @@ def reset_death_show_state():
     )
 
 
-def add_frame_color(frame, index, color):
-    if 0 <= index < len(frame):
-        frame[index][0] = clamp(frame[index][0] + color[0])
-        frame[index][1] = clamp(frame[index][1] + color[1])
-        frame[index][2] = clamp(frame[index][2] + color[2])
-
-
-def draw_frame_glow(frame, center, radius, color, falloff_power=1.7):
-    start = max(0, int(math.floor(center - radius - 1)))
-    end = min(len(frame) - 1, int(math.ceil(center + radius + 1)))
-    safe_radius = max(0.001, radius)
-    for index in range(start, end + 1):
-        distance = abs(index - center)
-        if distance > safe_radius:
-            continue
-        strength = (1.0 - (distance / safe_radius)) ** falloff_power
-        add_frame_color(frame, index, scale_color(color, strength))
-
-
 def spawn_death_wave(origin, speed, width, color, strength=1.0):
-    death_show_state["waves"].append(
-        {
-            "origin": origin,
-            "radius": 0.0,
-            "speed": speed,
-            "width": width,
-            "color": color,
-            "strength": strength,
-        }
-    )
+    death_show_state["waves"].spawn(pos=origin, vel=speed, width=width, strength=strength, color=color)
 
 
 def spawn_death_burst(origin, size_scale=1.0):
@@ -473,33 +488,26 @@ def spawn_death_burst(origin, size_scale=1.0):
         ]
     )
     core_color, halo_color = palette_core
-    death_show_state["bursts"].append(
-        {
-            "origin": origin,
-            "age": 0.0,
-            "duration": random.uniform(0.65, 1.05) * size_scale,
-            "radius": random.uniform(5.0, 14.0) * size_scale,
-            "core": core_color,
-            "halo": halo_color,
-        }
+    death_show_state["bursts"].spawn(
+        pos=origin,
+        life=random.uniform(0.65, 1.05) * size_scale,
+        radius=random.uniform(5.0, 14.0) * size_scale,
+        color=core_color,
+        halo=halo_color,
     )
 
     ember_count = max(6, int(random.randint(7, 14) * size_scale))
-    for _ in range(ember_count):
+    velocities = np.empty(ember_count)
+    lives = np.empty(ember_count)
+    colors = np.empty((ember_count, 3))
+    for i in range(ember_count):
         direction = random.choice([-1.0, 1.0])
         if random.random() < 0.2:
             direction *= random.uniform(0.15, 0.5)
-        speed = direction * random.uniform(12.0, 58.0) * size_scale
-        ember_color = blend_colors(halo_color, core_color, random.random() * 0.65)
-        death_show_state["embers"].append(
-            {
-                "pos": origin,
-                "vel": speed,
-                "age": 0.0,
-                "life": random.uniform(0.55, 1.6) * size_scale,
-                "color": ember_color,
-            }
-        )
+        velocities[i] = direction * random.uniform(12.0, 58.0) * size_scale
+        colors[i] = blend_colors(halo_color, core_color, random.random() * 0.65)
+        lives[i] = random.uniform(0.55, 1.6) * size_scale
+    death_show_state["embers"].spawn(ember_count, pos=origin, vel=velocities, life=lives, color=colors)
 
 
 def spawn_death_comet(num_leds, direction=None):
@@ -520,70 +528,87 @@ def spawn_death_comet(num_leds, direction=None):
     )
     length = random.uniform(14.0, 28.0)
     margin = random.uniform(3.0, 16.0)
-    death_show_state["comets"].append(
-        {
-            "pos": -margin if go_right else (num_leds - 1.0 + margin),
-            "speed": random.uniform(34.0, 86.0) * (1.0 if go_right else -1.0),
-            "length": length,
-            "head": head_color,
-            "trail": trail_color,
-        }
+    death_show_state["comets"].spawn(
+        pos=-margin if go_right else (num_leds - 1.0 + margin),
+        vel=random.uniform(34.0, 86.0) * (1.0 if go_right else -1.0),
+        length=length,
+        color=head_color,
+        trail=trail_color,
     )
 
 
-def draw_death_wave(frame, wave):
-    ring_center = wave["origin"]
-    radius = wave["radius"]
-    width = wave["width"]
-    start = max(0, int(math.floor(ring_center - radius - width - 2)))
-    end = min(len(frame) - 1, int(math.ceil(ring_center + radius + width + 2)))
-
-    for index in range(start, end + 1):
-        distance = abs(index - ring_center)
-        ring_distance = abs(distance - radius)
-        if ring_distance > width:
-            continue
-        strength = (1.0 - (ring_distance / max(0.001, width))) * wave["strength"]
-        add_frame_color(frame, index, scale_color(wave["color"], strength))
-
-
-def draw_death_burst(frame, burst):
-    age_ratio = min(1.0, max(0.0, burst["age"] / burst["duration"]))
-    radius = burst["radius"] * age_ratio
-    center = burst["origin"]
-    pulse = 0.6 + 0.4 * math.sin(age_ratio * math.pi)
-    draw_frame_glow(frame, center, 1.6 + radius * 0.18, scale_color(burst["core"], pulse), 1.4)
-
-    ring_width = max(1.5, 3.8 * (1.0 - age_ratio * 0.55))
-    start = max(0, int(math.floor(center - radius - ring_width - 1)))
-    end = min(len(frame) - 1, int(math.ceil(center + radius + ring_width + 1)))
-    for index in range(start, end + 1):
-        ring_distance = abs(abs(index - center) - radius)
-        if ring_distance > ring_width:
-            continue
-        ring_strength = (1.0 - (ring_distance / ring_width)) * (1.0 - age_ratio * 0.35)
-        add_frame_color(frame, index, scale_color(burst["halo"], ring_strength))
-
-
-def draw_death_ember(frame, ember):
-    age_ratio = min(1.0, max(0.0, ember["age"] / ember["life"]))
-    ember_color = scale_color(ember["color"], 1.0 - age_ratio)
-    draw_frame_glow(frame, ember["pos"], 1.4 + age_ratio * 0.9, ember_color, 2.3)
-
+def update_death_particles(st, dt, num_leds):
+    """Advance every particle by ``dt`` and drop the ones that have finished."""
+    waves = st["waves"]
+    waves["radius"] += waves["vel"] * dt
+    waves["strength"] *= 0.994
+    waves.cull((waves["radius"] - waves["width"] <= num_leds + 8.0) & (waves["strength"] > 0.03))
+
+    bursts = st["bursts"]
+    bursts["age"] += dt
+    bursts.cull(bursts["age"] <= bursts["life"])
+
+    embers = st["embers"]
+    embers["age"] += dt
+    embers["pos"] += embers["vel"] * dt
+    embers["vel"] *= 0.989
+    positions = embers["pos"]
+    embers.cull((positions >= 0.0) & (positions < num_leds) & (embers["age"] <= embers["life"]))
+
+    comets = st["comets"]
+    comets["pos"] += comets["vel"] * dt
+    positions = comets["pos"]
+    lengths = comets["length"]
+    comets.cull((positions >= -lengths) & (positions <= num_leds - 1 + lengths))
+
+
+def draw_death_particles(pixels, st):
+    waves = st["waves"]
+    add_rings(pixels, waves["pos"], waves["radius"], waves["width"], waves["color"], waves["strength"])
+
+    bursts = st["bursts"]
+    age_ratio = np.clip(bursts["age"] / bursts["life"], 0.0, 1.0)
+    radius = bursts["radius"] * age_ratio
+    pulse = 0.6 + 0.4 * np.sin(age_ratio * math.pi)
+    add_glows(pixels, bursts["pos"], 1.6 + radius * 0.18, scale_colors(bursts["color"], pulse), 1.4)
+    ring_width = np.maximum(1.5, 3.8 * (1.0 - age_ratio * 0.55))
+    add_rings(pixels, bursts["pos"], radius, ring_width, bursts["halo"], 1.0 - age_ratio * 0.35)
+
+    embers = st["embers"]
+    age_ratio = np.clip(embers["age"] / embers["life"], 0.0, 1.0)
+    add_glows(pixels, embers["pos"], 1.4 + age_ratio * 0.9, scale_colors(embers["color"], 1.0 - age_ratio), 2.3)
+
+    comets = st["comets"]
+    if not len(comets):
+        return
+    add_glows(pixels, comets["pos"], 2.8, comets["color"], 1.35)
+    # Trail: one pixel per step behind the head, fading from head to trail color
+    trail_steps = np.maximum(8, comets["length"].astype(np.intp))[:, None]
+    steps = np.arange(1, int(trail_steps.max()) + 1)
+    direction = np.where(comets["vel"] >= 0, 1.0, -1.0)[:, None]
+    ratio = steps / trail_steps
+    head = comets["color"][:, None, :]
+    mix = np.minimum(1.0, ratio * 1.1)[..., None]
+    trail_colors = np.clip(np.floor(head + (comets["trail"][:, None, :] - head) * mix), 0.0, 255.0)
+    add_points(
+        pixels,
+        np.rint(comets["pos"][:, None] - steps * direction),
+        scale_colors(trail_colors, 1.0 - ratio * 0.82),
+        steps <= trail_steps,
+    )
 
-def draw_death_comet(frame, comet):
-    direction = 1.0 if comet["speed"] >= 0 else -1.0
-    head_position = comet["pos"]
-    draw_frame_glow(frame, head_position, 2.8, comet["head"], 1.35)
 
-    trail_steps = max(8, int(comet["length"]))
-    for step in range(1, trail_steps + 1):
-        offset = head_position - (step * direction)
-        ratio = step / trail_steps
-        trail_color = blend_colors(comet["head"], comet["trail"], min(1.0, ratio * 1.1))
-        add_frame_color(frame, int(round(offset)), scale_color(trail_color, 1.0 - ratio * 0.82))
+def death_show_background(out, start, stop, elapsed, base_gain):
+    index = np.arange(start, stop, dtype=np.float64)
+    ember_wave = 0.5 + 0.5 * np.sin(index * 0.11 + elapsed * 2.2)
+    ember_ripple = 0.5 + 0.5 * np.sin(index * 0.037 - elapsed * 4.6)
+    red = 6 + ((18 * ember_wave) + (28 * ember_ripple)) * base_gain
+    green = 1 + red * (0.12 + 0.04 * ember_wave)
+    blue = 1 + max(0.0, elapsed - 21.0) * 0.8 * (0.3 + 0.7 * ember_ripple)
+    out[:] = np.clip(np.floor(np.stack((red, green, blue * 0.18), axis=1)), 0, 255)
 
 
+@partition_safe("ranges")
 def death_show_step(strip):
     st = death_show_state
     now = time.monotonic()
@@ -597,32 +622,23 @@ def death_show_step(strip):
     elapsed = now - st["start_time"]
     dt = min(0.05, max(0.0, now - st["last_time"]))
     st["last_time"] = now
-    frame = [[0, 0, 0] for _ in range(num_leds)]
 
     base_gain = 0.2 + 0.4 * (elapsed / DEATH_SHOW_DURATION)
-    for index in range(num_leds):
-        ember_wave = 0.5 + 0.5 * math.sin(index * 0.11 + elapsed * 2.2)
-        ember_ripple = 0.5 + 0.5 * math.sin(index * 0.037 - elapsed * 4.6)
-        red = 6 + ((18 * ember_wave) + (28 * ember_ripple)) * base_gain
-        green = 1 + red * (0.12 + 0.04 * ember_wave)
-        blue = 1 + max(0.0, elapsed - 21.0) * 0.8 * (0.3 + 0.7 * ember_ripple)
-        frame[index][0] = clamp(red)
-        frame[index][1] = clamp(green)
-        frame[index][2] = clamp(blue * 0.18)
+    render_ranges(strip, death_show_background, elapsed, base_gain)
+    pixels = strip.pixels
 
     center = (num_leds - 1) / 2.0
     scanner_primary = ((math.sin(elapsed * 1.25) + 1.0) * 0.5) * (num_leds - 1)
-    draw_frame_glow(frame, scanner_primary, 13.0, (180, 24, 18), 1.8)
+    add_glows(pixels, [scanner_primary], 13.0, (180, 24, 18), 1.8)
 
     if elapsed > 8.0:
         scanner_secondary = ((math.sin(elapsed * 2.05 + 1.3) + 1.0) * 0.5) * (num_leds - 1)
-        draw_frame_glow(frame, scanner_secondary, 10.0, (255, 145, 30), 2.0)
+        add_glows(pixels, [scanner_secondary], 10.0, (255, 145, 30), 2.0)
 
     if elapsed > 24.0:
         chase_strength = min(1.0, (elapsed - 24.0) / 4.5)
         chase_offset = int(elapsed * 15.0) % 3
-        for index in range(chase_offset, num_leds, 3):
-            add_frame_color(frame, index, scale_color((160, 70, 18), chase_strength))
+        pixels[chase_offset::3] += scale_color((160, 70, 18), chase_strength)
 
     if elapsed < 10.0:
         wave_interval = 0.95 - (elapsed * 0.03)
@@ -670,77 +686,52 @@ def death_show_step(strip):
             spawn_death_wave(center, 64.0, 4.6, (255, 255, 235), 1.25)
             st["finale_flash"] = True
 
-    active_waves = []
-    max_distance = num_leds + 8.0
-    for wave in st["waves"]:
-        wave["radius"] += wave["speed"] * dt
-        wave["strength"] *= 0.994
-        if wave["radius"] - wave["width"] <= max_distance and wave["strength"] > 0.03:
-            draw_death_wave(frame, wave)
-            active_waves.append(wave)
-    st["waves"] = active_waves
-
-    active_bursts = []
-    for burst in st["bursts"]:
-        burst["age"] += dt
-        if burst["age"] <= burst["duration"]:
-            draw_death_burst(frame, burst)
-            active_bursts.append(burst)
-    st["bursts"] = active_bursts
-
-    active_embers = []
-    for ember in st["embers"]:
-        ember["age"] += dt
-        ember["pos"] += ember["vel"] * dt
-        ember["vel"] *= 0.989
-        if 0.0 <= ember["pos"] < num_leds and ember["age"] <= ember["life"]:
-            draw_death_ember(frame, ember)
-            active_embers.append(ember)
-    st["embers"] = active_embers
-
-    active_comets = []
-    for comet in st["comets"]:
-        comet["pos"] += comet["speed"] * dt
-        if -comet["length"] <= comet["pos"] <= (num_leds - 1 + comet["length"]):
-            draw_death_comet(frame, comet)
-            active_comets.append(comet)
-    st["comets"] = active_comets
+    update_death_particles(st, dt, num_leds)
+    draw_death_particles(pixels, st)
 
     if elapsed > 27.0:
         full_strip_flash = max(0.0, (elapsed - 27.0) / 3.0)
         pulse = 0.5 + 0.5 * math.sin(elapsed * 18.0)
-        flash_color = scale_color((150, 50, 10), full_strip_flash * pulse * 0.6)
-        for index in range(num_leds):
-            add_frame_color(frame, index, flash_color)
+        pixels += scale_color((150, 50, 10), full_strip_flash * pulse * 0.6)
 
-    for index, color in enumerate(frame):
-        set_pixel(strip, index, color[0], color[1], color[2])
+    np.minimum(pixels, 255.0, out=pixels)
 
 
 def initialize_bouncing_balls(strip, ball_count, colors):
     now = time.monotonic()
     st = bouncing_balls_state
-    st["ball_count"] = ball_count
-    st["positions"] = []
-    st["velocities"] = []
-    st["launch_times"] = []
-    st["colors"] = []
-    st["restitution"] = []
-    for i in range(ball_count):
-        add_bouncing_ball(st, colors[i % len(colors)], now + (i * 0.18))
+    st["ball_count"] = 0
+    st["positions"] = np.zeros(0)
+    st["velocities"] = np.zeros(0)
+    st["launch_times"] = np.zeros(0)
+    st["colors"] = np.zeros((0, 3))
+    st["restitution"] = np.zeros(0)
+    add_bouncing_balls(st, ball_count, colors, now, 0.18)
     st["last_time"] = now
     st["settled_since"] = None
     st["init"] = True
 
 
-def add_bouncing_ball(st, color, launch_time):
-    ball_index = len(st["positions"])
-    st["positions"].append(0.0)
-    st["velocities"].append(0.0)
-    st["launch_times"].append(launch_time)
-    st["colors"].append(color)
-    restitution = 0.48 + (0.08 * (ball_index % 5)) + random.uniform(-0.02, 0.02)
-    st["restitution"].append(max(0.42, min(0.84, restitution)))
+# Launches of one batch of balls are spread over at most this many seconds, so large
+# counts go up together instead of trickling out for most of a minute
+BALL_LAUNCH_WINDOW = 2.0
+
+
+def add_bouncing_balls(st, count, colors, start_time, spacing):
+    """Append ``count`` balls, launched ``spacing`` seconds apart from ``start_time``
+    (closer together when that would take longer than BALL_LAUNCH_WINDOW)."""
+    spacing = min(spacing, BALL_LAUNCH_WINDOW / max(1, count))
+    first = st["ball_count"]
+    ball_index = np.arange(first, first + count)
+    jitter = np.array([random.uniform(-0.02, 0.02) for _ in range(count)])
+    restitution = np.clip(0.48 + (0.08 * (ball_index % 5)) + jitter, 0.42, 0.84)
+    palette = np.array(colors, dtype=np.float64)
+    st["positions"] = np.concatenate((st["positions"], np.zeros(count)))
+    st["velocities"] = np.concatenate((st["velocities"], np.zeros(count)))
+    st["launch_times"] = np.concatenate((st["launch_times"], start_time + np.arange(count) * spacing))
+    st["colors"] = np.concatenate((st["colors"], palette[ball_index % len(palette)]))
+    st["restitution"] = np.concatenate((st["restitution"], restitution))
+    st["ball_count"] = first + count
 
 
 def sync_bouncing_ball_count(ball_count, colors):
@@ -748,24 +739,19 @@ def sync_bouncing_ball_count(ball_count, colors):
     if ball_count == st["ball_count"]:
         return
 
-    now = time.monotonic()
     if ball_count > st["ball_count"]:
-        for i in range(st["ball_count"], ball_count):
-            add_bouncing_ball(st, colors[i % len(colors)], now + ((i - st["ball_count"]) * 0.16))
+        add_bouncing_balls(st, ball_count - st["ball_count"], colors, time.monotonic(), 0.16)
     else:
-        st["positions"] = st["positions"][:ball_count]
-        st["velocities"] = st["velocities"][:ball_count]
-        st["launch_times"] = st["launch_times"][:ball_count]
-        st["colors"] = st["colors"][:ball_count]
-        st["restitution"] = st["restitution"][:ball_count]
-
-    st["ball_count"] = ball_count
+        for key in ("positions", "velocities", "launch_times", "colors", "restitution"):
+            st[key] = st[key][:ball_count]
+        st["ball_count"] = ball_count
     st["settled_since"] = None
 
 
 def bouncing_colored_balls_step(strip, ball_count, colors, continuous):
     st = bouncing_balls_state
-    num_leds = strip.numPixels()
+    pixels = strip.pixels
+    num_leds = len(pixels)
     floor_position = max(1.0, num_leds - 1.0)
 
     if not st["init"]:
@@ -776,32 +762,27 @@ def bouncing_colored_balls_step(strip, ball_count, colors, continuous):
     now = time.monotonic()
     dt = min(0.05, max(0.0, now - st["last_time"]))
     st["last_time"] = now
-    fill_all(strip, 0, 0, 0)
-
-    all_settled = True
-    for i in range(ball_count):
-        if now < st["launch_times"][i]:
-            all_settled = False
-            continue
-
-        st["velocities"][i] += st["gravity"] * dt
-        st["positions"][i] += st["velocities"][i] * dt
-
-        if st["positions"][i] >= floor_position:
-            st["positions"][i] = floor_position
-            if abs(st["velocities"][i]) > 35:
-                st["velocities"][i] = -st["velocities"][i] * st["restitution"][i]
-                all_settled = False
-            else:
-                st["velocities"][i] = 0.0
-        else:
-            all_settled = False
-
-        position = int(round(st["positions"][i]))
-        color = st["colors"][i]
-        set_pixel(strip, position, *color)
-        if position > 0:
-            set_pixel(strip, position - 1, *scale_color(color, 0.45))
+    pixels.fill(0.0)
+
+    positions = st["positions"]
+    velocities = st["velocities"]
+    launched = now >= st["launch_times"]
+    velocities += np.where(launched, st["gravity"] * dt, 0.0)
+    positions += np.where(launched, velocities * dt, 0.0)
+
+    landed = launched & (positions >= floor_position)
+    positions[landed] = floor_position
+    bounced = landed & (np.abs(velocities) > 35)
+    velocities[bounced] *= -st["restitution"][bounced]
+    velocities[landed & ~bounced] = 0.0
+    all_settled = bool(landed.all()) and not bounced.any()
+
+    # Heads and their dimmer tails add up where balls overlap
+    heads = np.rint(positions[launched]).astype(np.intp)
+    ball_colors = st["colors"][launched]
+    add_points(pixels, heads, ball_colors)
+    add_points(pixels, heads - 1, scale_colors(ball_colors, 0.45), heads > 0)
+    np.minimum(pixels, 255.0, out=pixels)
 
     if all_settled:
         if st["settled_since"] is None:
@@ -0,0 +1,157 @@
+"""Per-effect render benchmark.
+
+Drives every step function in server.EFFECT_DEFINITIONS against a headless
+frame at several strip sizes and reports how much of the 20 ms frame budget
+each one uses. Randomness is seeded and time.monotonic() is replaced by a
+clock that advances exactly one frame per step, so two runs of the same tree
+render the same frames and their numbers can be diffed.
+
+With --workers, effects marked partition_safe are run a second time on a
+RenderPool of that many processes and the speedup is reported next to them.
+
+    python3 benchmark_effects.py [--frames 200] [--sizes 300 1000 3000]
+                                 [--effects pacifica fire] [--json out.json]
+                                 [--baseline previous.json] [--workers 4]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from unittest import mock
+
+os.environ.setdefault("LED_BACKEND", "virtual")
+
+import numpy as np
+
+import server
+from fastled_math import begin_frame
+from framebuffer import FrameBuffer
+from parallel_render import RenderPool, set_render_pool
+
+FRAME_BUDGET_MS = 20.0
+DEFAULT_SIZES = (300, 1000, 3000)
+
+
+class FrameClock:
+    """Stand-in for time.monotonic() that moves forward one frame per tick."""
+
+    def __init__(self, frame_seconds, start=1000.0):
+        self.now = start
+        self.frame_seconds = frame_seconds
+
+    def __call__(self):
+        return self.now
+
+    def tick(self):
+        self.now += self.frame_seconds
+
+
+def benchmark_effect(effect, size, frames, seed, pool=None):
+    clock = FrameClock(FRAME_BUDGET_MS / 1000.0)
+    if pool is not None:
+        pool.frame_pixels.fill(0.0)
+        frame = FrameBuffer(size, pixels=pool.frame_pixels)
+    else:
+        frame = FrameBuffer(size)
+    step = effect["step"]
+    args = effect.get("args", ())
+    timings = np.empty(frames, dtype=np.float64)
+
+    random.seed(seed)
+    np.random.seed(seed)
+    set_render_pool(pool)
+    try:
+        with mock.patch.object(time, "monotonic", clock):
+            server.reset_effect_state(step)
+            for index in range(frames):
+                clock.tick()
+                begin_frame()
+                start = time.perf_counter()
+                step(frame, *args)
+                timings[index] = (time.perf_counter() - start) * 1000.0
+    finally:
+        set_render_pool(None)
+
+    return {
+        "mean_ms": float(timings.mean()),
+        "p95_ms": float(np.percentile(timings, 95)),
+        "p99_ms": float(np.percentile(timings, 99)),
+        "max_ms": float(timings.max()),
+        "budget_pct": float(timings.mean() / FRAME_BUDGET_MS * 100.0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=200, help="frames rendered per effect and size")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="LED counts to test")
+    parser.add_argument("--effects", nargs="+", help="effect keys to run (default: all)")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--json", help="write results to this file ('-' for stdout)")
+    parser.add_argument("--baseline", help="earlier --json output to compare mean frame times against")
+    parser.add_argument("--workers", type=int, default=0, help="also run partition-safe effects on this many processes")
+    args = parser.parse_args()
+
+    effects = server.EFFECT_DEFINITIONS
+    if args.effects:
+        effects = [effect for effect in effects if effect["key"] in args.effects]
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+
+    report = sys.stderr if args.json == "-" else sys.stdout
+    print(f"{'effect':<24}{'LEDs':>6}{'mean ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'budget':>9}", file=report)
+    results = {}
+    pools = {}
+    for effect in effects:
+        results[effect["key"]] = {}
+        for size in args.sizes:
+            stats = benchmark_effect(effect, size, args.frames, args.seed)
+            results[effect["key"]][str(size)] = stats
+            line = (
+                f"{effect['key']:<24}{size:>6}{stats['mean_ms']:>10.3f}{stats['p95_ms']:>10.3f}"
+                f"{stats['p99_ms']:>10.3f}{stats['budget_pct']:>8.1f}%"
+            )
+            previous = baseline.get(effect["key"], {}).get(str(size))
+            if previous:
+                line += f"  ({previous['mean_ms'] / stats['mean_ms']:.2f}x vs baseline)"
+            print(line, file=report)
+
+            if args.workers and getattr(effect["step"], "partition_mode", None):
+                if size not in pools:
+                    pools[size] = RenderPool(args.workers, size)
+                parallel = benchmark_effect(effect, size, args.frames, args.seed, pools[size])
+                parallel["workers"] = args.workers
+                parallel["speedup"] = stats["mean_ms"] / parallel["mean_ms"]
+                stats["parallel"] = parallel
+                print(
+                    f"{'  ' + str(args.workers) + ' workers':<24}{size:>6}{parallel['mean_ms']:>10.3f}"
+                    f"{parallel['p95_ms']:>10.3f}{parallel['p99_ms']:>10.3f}{parallel['budget_pct']:>8.1f}%"
+                    f"  ({parallel['speedup']:.2f}x)",
+                    file=report,
+                )
+
+    for pool in pools.values():
+        pool.close()
+
+    output = {
+        "frames": args.frames,
+        "seed": args.seed,
+        "budget_ms": FRAME_BUDGET_MS,
+        "results": results,
+    }
+    if args.json == "-":
+        json.dump(output, sys.stdout, indent=2)
+        print()
+    elif args.json:
+        with open(args.json, "w") as f:
+            json.dump(output, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Micro-benchmark for pushing one frame to the strip.
+
+Compares the old per-pixel setPixelColor loop against the bulk path in
+strip_output for several strip sizes. Runs anywhere: the strip is a stand-in
+that mimics the rpi_ws281x call shape and keeps its LEDs in a ctypes array,
+like the ws2811 channel buffer on the Pi.
+
+    python3 benchmark_push.py [--frames 200]
+"""
+
+import argparse
+import ctypes
+import time
+
+import numpy as np
+
+from framebuffer import FrameBuffer
+from strip_output import push_words
+
+SIZES = (300, 1000, 5000)
+
+
+class StandInStrip:
+    """Per-pixel only strip, shaped like rpi_ws281x.PixelStrip."""
+
+    def __init__(self, num):
+        self.size = num
+        self.leds = (ctypes.c_uint32 * num)()
+
+    def __setitem__(self, pos, value):
+        if isinstance(pos, slice):
+            for n in range(*pos.indices(self.size)):
+                self.leds[n] = value
+        else:
+            self.leds[pos] = value
+
+    def numPixels(self):
+        return self.size
+
+    def setPixelColor(self, n, color):
+        self[n] = color
+
+
+class BulkStandInStrip(StandInStrip):
+    """Stand-in that also accepts a whole frame, copied in with one memmove."""
+
+    def set_pixel_data(self, words):
+        data = np.ascontiguousarray(words[:self.size], dtype=np.uint32)
+        ctypes.memmove(ctypes.addressof(self.leds), data.ctypes.data, data.nbytes)
+
+
+def time_push(strip, frame, frames):
+    start = time.perf_counter()
+    for _ in range(frames):
+        push_words(strip, frame.to_words())
+    return (time.perf_counter() - start) / frames * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=200, help="frames pushed per measurement")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'LEDs':>6}  {'per-pixel ms':>12}  {'bulk ms':>9}  {'speedup':>8}")
+    for size in SIZES:
+        frame = FrameBuffer(size)
+        frame.pixels[:] = rng.integers(0, 256, size=(size, 3))
+        per_pixel = time_push(StandInStrip(size), frame, args.frames)
+        bulk_strip = BulkStandInStrip(size)
+        bulk = time_push(bulk_strip, frame, args.frames)
+        assert list(bulk_strip.leds) == frame.to_words().tolist()
+        print(f"{size:>6}  {per_pixel:>12.3f}  {bulk:>9.3f}  {per_pixel / bulk:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import numpy as np
+
+from effect_instance import EffectInstance
+from framebuffer import FrameBuffer
+
+BLEND_MODES = ("add", "screen", "multiply", "alpha", "max")
+
+
+def blend(base, layer, mode="add", opacity=1.0):
+    """Blend ``layer`` onto ``base`` in place; both are (N, 3) arrays in 0-255.
+
+    ``layer`` may also be a single (3,) color, which numpy broadcasts over
+    the strip. Each mode is a handful of whole-array operations.
+    """
+    if mode == "add":
+        if opacity >= 1.0:
+            base += layer
+        else:
+            base += np.multiply(layer, opacity, dtype=np.float32)
+        np.minimum(base, 255.0, out=base)
+        return base
+
+    if mode == "screen":
+        target = 255.0 - (255.0 - base) * (255.0 - np.asarray(layer, dtype=np.float32)) / 255.0
+    elif mode == "multiply":
+        target = base * layer / 255.0
+    elif mode == "max":
+        target = np.maximum(base, layer)
+    elif mode == "alpha":
+        target = layer
+    else:
+        raise ValueError(f"Unknown blend mode: {mode!r}")
+
+    if opacity >= 1.0:
+        base[:] = target
+    else:
+        base += (target - base) * opacity
+    return base
+
+
+class SolidFill:
+    def __init__(self, red, green, blue):
+        self.color = np.array((red, green, blue), dtype=np.float32)
+
+    def render(self, num_pixels):
+        return self.color
+
+
+class GradientFill:
+    """Linear gradient from ``start`` to ``end`` across the strip, built once per strip length."""
+
+    def __init__(self, start, end):
+        self.start = np.array(start, dtype=np.float32)
+        self.end = np.array(end, dtype=np.float32)
+        self._pixels = None
+
+    def render(self, num_pixels):
+        if self._pixels is None or len(self._pixels) != num_pixels:
+            ramp = np.linspace(0.0, 1.0, num_pixels, dtype=np.float32)[:, None]
+            self._pixels = self.start + (self.end - self.start) * ramp
+        return self._pixels
+
+
+class _EffectSource:
+    """An effect definition rendering into a private frame that persists between frames."""
+
+    def __init__(self, effect):
+        self.instance = EffectInstance(effect)
+        self.frame = None
+
+    def render(self, num_pixels):
+        if self.frame is None or self.frame.numPixels() != num_pixels:
+            self.frame = FrameBuffer(num_pixels)
+        self.instance.render(self.frame)
+        return self.frame.pixels
+
+
+class Layer:
+    """One entry of a Compositor stack.
+
+    ``source`` is an effect definition (any dict with "step" and optionally
+    "args"/"state", as in EFFECT_DEFINITIONS) or a SolidFill/GradientFill.
+    """
+
+    def __init__(self, source, mode="add", opacity=1.0):
+        if mode not in BLEND_MODES:
+            raise ValueError(f"Unknown blend mode: {mode!r}")
+        self.source = source
+        self.mode = mode
+        self.opacity = opacity
+
+
+class Compositor:
+    """Ordered stack of layers blended bottom to top into the frame each step.
+
+    render() is an effect step, so a Compositor can go into
+    EFFECT_DEFINITIONS or a zone like any other effect. The running layer
+    sources live in ``state`` (registered with effect_state), so every
+    EffectInstance of the compositor builds its own on first render.
+    """
+
+    def __init__(self, layers):
+        self.layers = layers
+        self.state = {"sources": None}
+
+    def reset(self):
+        self.state["sources"] = None
+
+    def render(self, strip):
+        st = self.state
+        if st["sources"] is None:
+            st["sources"] = [
+                _EffectSource(layer.source) if isinstance(layer.source, dict) else layer.source
+                for layer in self.layers
+            ]
+        num_leds = strip.numPixels()
+        pixels = strip.pixels
+        pixels.fill(0.0)
+        for layer, source in zip(self.layers, st["sources"]):
+            blend(pixels, source.render(num_leds), layer.mode, layer.opacity)
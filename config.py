@@ -1,3 +1,5 @@
+import os
+
 LED_COUNT = 300
 LED_GPIO_PIN = 18
 LED_FREQ_HZ = 800000
@@ -5,3 +7,33 @@ LED_DMA = 10
 LED_BRIGHTNESS = 255
 LED_INVERT = False
 LED_CHANNEL = 0
+# Split the strip across both PWM channels so the two runs go out in parallel.
+# LED_COUNT stays the total; the last LED_COUNT_CHANNEL_1 LEDs move to channel 1.
+LED_COUNT_CHANNEL_1 = 0
+LED_GPIO_PIN_CHANNEL_1 = 13
+
+# Default frame rate; effects can override it with an "fps" entry in EFFECT_DEFINITIONS
+TARGET_FPS = 50
+
+# "ws281x" drives the strip on the Pi, "virtual" runs headless on any machine
+LED_BACKEND = os.environ.get("LED_BACKEND", "ws281x")
+# Virtual strip only: make show() wait for the real WS2812 wire time
+LED_VIRTUAL_TIMING = os.environ.get("LED_VIRTUAL_TIMING", "1") != "0"
+# Worker processes for effects marked partition_safe; 0 renders on the effect thread
+RENDER_WORKERS = int(os.environ.get("RENDER_WORKERS", "0"))
+# Seed for the sparkle/twinkle generators, so their frames can be replayed; unset draws a fresh seed
+SPARKLE_SEED = int(os.environ["LED_SPARKLE_SEED"]) if "LED_SPARKLE_SEED" in os.environ else None
+
+# Effect changes blend over this many seconds ("crossfade", "wipe" or "dissolve"); 0 switches instantly
+TRANSITION_KIND = "crossfade"
+TRANSITION_SECONDS = 0.8
+
+# Output stage: per-channel (R, G, B) gamma applied before the push (1.0 = linear, 2.2-2.8 suits WS2812),
+# and temporal dithering of the sub-8-bit remainder
+LED_GAMMA = (1.0, 1.0, 1.0)
+LED_DITHER = True
+
+# Periodic effects replay one recorded cycle instead of re-rendering it; longer cycles aren't cached.
+# LED_FRAME_CACHE_DIR (e.g. /tmp) keeps the cycles in memory-mapped files there instead of the heap.
+FRAME_CACHE_MAX_FRAMES = 1024
+FRAME_CACHE_DIR = os.environ.get("LED_FRAME_CACHE_DIR") or None
@@ -0,0 +1,62 @@
+import copy
+
+
+def effect_state(*state_dicts):
+    """Pair each module-level state dict an effect mutates with a copy of its defaults.
+
+    Goes in the "state" entry of an effect definition. Call it at import time,
+    before anything has run, so the copies hold the effect's starting state.
+    """
+    return tuple((state, copy.deepcopy(state)) for state in state_dicts)
+
+
+class EffectInstance:
+    """One running copy of an effect definition with private state.
+
+    Effects keep their state in module-level dicts. render() swaps this
+    instance's contents into those dicts around the step call and swaps them
+    back out afterwards, so any number of instances of the same effect can
+    take turns in one render loop. Only top-level keys move on a swap; the
+    values are the instance's own deep copies.
+    """
+
+    def __init__(self, effect):
+        self.effect = effect
+        self.step = effect["step"]
+        self.args = effect.get("args", ())
+        self.states = [(live, copy.deepcopy(defaults)) for live, defaults in effect.get("state", ())]
+        # Optional hook for state that must be fresh when the instance starts (timestamps)
+        self._reset = effect.get("reset")
+
+    def adopt(self):
+        """Move this instance's state into the module dicts and return a plain step.
+
+        For an instance that becomes the only copy running: from then on it
+        renders straight from the module state like a normally started effect.
+        """
+        for live, own in self.states:
+            live.clear()
+            live.update(own)
+        if self._reset is not None:
+            self._reset()
+            self._reset = None
+        step, args = self.step, self.args
+        return lambda frame: step(frame, *args)
+
+    def render(self, frame):
+        outside = []
+        for live, own in self.states:
+            outside.append(dict(live))
+            live.clear()
+            live.update(own)
+        try:
+            if self._reset is not None:
+                self._reset()
+                self._reset = None
+            self.step(frame, *self.args)
+        finally:
+            for (live, own), saved in zip(self.states, outside):
+                own.clear()
+                own.update(live)
+                live.clear()
+                live.update(saved)
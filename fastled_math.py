@@ -0,0 +1,107 @@
+"""FastLED-style integer math shared by effects and the AI sandbox.
+
+Sines come from tables built once at import, so every call is an index
+instead of math.sin. Each function takes plain ints or numpy integer arrays
+and returns the same kind. The beat functions read a timestamp that the
+render loop captures once per frame with begin_frame(), so every layer and
+effect rendered in one frame sees the same time. The timestamp belongs to
+the thread that began the frame; other threads, and the render thread
+between end_frame() and the next begin_frame(), read the live clock.
+"""
+
+import math
+import threading
+import time
+
+import numpy as np
+
+_frame = threading.local()
+
+
+def millis():
+    return int(time.monotonic() * 1000)
+
+
+def begin_frame(ms=None):
+    """Capture the timestamp this thread's beat functions use until end_frame()."""
+    _frame.ms = millis() if ms is None else ms
+    return _frame.ms
+
+
+def end_frame():
+    """Drop the frame timestamp, so frame_millis() follows the live clock again."""
+    _frame.ms = None
+
+
+def frame_millis():
+    """Timestamp of the current frame, or the live clock outside one."""
+    ms = getattr(_frame, "ms", None)
+    return ms if ms is not None else millis()
+
+
+_SIN16 = [int(math.sin(x * (2 * math.pi) / 65536.0) * 32767) for x in range(65536)]
+_SIN8 = [int(math.sin(x * (2 * math.pi) / 256.0) * 127) + 128 for x in range(256)]
+SIN16_TABLE = np.array(_SIN16, dtype=np.int64)
+SIN8_TABLE = np.array(_SIN8, dtype=np.int64)
+
+
+def sin16(x):
+    """-32767..32767 over one period of 65536."""
+    if isinstance(x, np.ndarray):
+        return SIN16_TABLE[x & 0xFFFF]
+    return _SIN16[x & 0xFFFF]
+
+
+def cos16(x):
+    return sin16(x + 16384)
+
+
+def sin8(x):
+    """1..255 centred on 128 over one period of 256."""
+    if isinstance(x, np.ndarray):
+        return SIN8_TABLE[x & 0xFF]
+    return _SIN8[x & 0xFF]
+
+
+def cos8(x):
+    return sin8(x + 64)
+
+
+def scale8(value, scale):
+    return (value * scale) >> 8
+
+
+def qadd8(a, b):
+    if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+        return np.minimum(a + b, 255)
+    return min(a + b, 255)
+
+
+def qsub8(a, b):
+    if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+        return np.maximum(a - b, 0)
+    return max(a - b, 0)
+
+
+def beat8(bpm, time_base=0, ms=None):
+    if ms is None:
+        ms = frame_millis()
+    return ((ms - time_base) * bpm * 256 // 60000) % 256
+
+
+def beat16(bpm, time_base=0, ms=None):
+    if ms is None:
+        ms = frame_millis()
+    return ((ms - time_base) * bpm * 65536 // 60000) % 65536
+
+
+def beatsin8(bpm, minimum=0, maximum=255, time_base=0, phase_offset=0, ms=None):
+    beat = (beat8(bpm, time_base, ms) + phase_offset) % 256
+    amplitude = (maximum - minimum) // 2
+    return minimum + amplitude + ((sin8(beat) - 128) * amplitude) // 127
+
+
+def beatsin16(bpm, minimum=0, maximum=65535, time_base=0, phase_offset=0, ms=None):
+    beat = (beat16(bpm, time_base, ms) + phase_offset) & 0xFFFF
+    amplitude = (maximum - minimum) // 2
+    return minimum + amplitude + ((sin16(beat) * amplitude) >> 15)
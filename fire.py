@@ -1,6 +1,6 @@
 import random
 
-from led_operations import set_pixel
+import numpy as np
 
 COOLING = 24
 SPARKING = 200
@@ -39,29 +39,32 @@ PALETTE = [
 ]
 
 
+# Heat (0-255) straight to a color, so mapping the strip is a single lookup
+HEAT_LUT = np.array(
+    [PALETTE[(heat * (len(PALETTE) - 1)) // 255] for heat in range(256)], dtype=np.float32
+)
+
+
 def fire_step(strip, cooling=COOLING, sparking=SPARKING, speed_delay=5):
     num_leds = strip.numPixels()
     virtual_leds = max(32, int(num_leds * FIRE_HEIGHT_RATIO))
 
     if fire_state["heat"] is None or fire_state["virtual_leds"] != virtual_leds:
-        fire_state["heat"] = [0] * virtual_leds
+        fire_state["heat"] = np.zeros(virtual_leds, dtype=np.int16)
         fire_state["virtual_leds"] = virtual_leds
 
     heat = fire_state["heat"]
 
-    for i in range(virtual_leds):
-        cooldown = random.randint(0, ((cooling * 10) // virtual_leds) + 2)
-        heat[i] = max(0, heat[i] - cooldown)
+    cooldown = np.random.randint(0, ((cooling * 10) // virtual_leds) + 3, size=virtual_leds)
+    np.maximum(heat - cooldown, 0, out=heat, casting="unsafe")
 
-    for k in range(virtual_leds - 1, 1, -1):
-        heat[k] = (heat[k - 1] + heat[k - 2] + heat[k - 2]) // 3
+    # The old top-down loop only ever read cells below the one it wrote, all
+    # still holding last frame's values, so one shifted expression is exact
+    heat[2:] = (heat[1:-1] + 2 * heat[:-2]) // 3
 
     if random.randint(0, 255) < sparking:
         spark_index = random.randint(0, min(12, virtual_leds - 1))
         heat[spark_index] = min(255, heat[spark_index] + random.randint(180, 255))
 
-    for j in range(num_leds):
-        source_index = (j * (virtual_leds - 1)) // max(1, num_leds - 1)
-        color_index = (heat[source_index] * (len(PALETTE) - 1)) // 255
-        red, green, blue = PALETTE[color_index]
-        set_pixel(strip, j, red, green, blue)
+    source_index = (np.arange(num_leds) * (virtual_leds - 1)) // max(1, num_leds - 1)
+    strip.pixels[:] = HEAT_LUT[heat[source_index]]
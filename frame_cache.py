@@ -0,0 +1,175 @@
+import tempfile
+
+import numpy as np
+
+from config import FRAME_CACHE_DIR, FRAME_CACHE_MAX_FRAMES
+
+
+def _empty_state():
+    return {
+        "key": None,
+        "period": None,
+        "ring": None,
+        "hashes": [],
+        "seen": {},
+        "frames": 0,
+        "cycle": None,
+        "position": 0,
+        "effect_position": 0,
+        "played": 0,
+        "checked": 0,
+        "disabled": False,
+    }
+
+
+class FrameCache:
+    """Effect step that records one cycle of a periodic effect and replays it.
+
+    With a declared ``period`` the first ``period`` frames are recorded and
+    then played back in a loop; a callable ``period`` is given the step's
+    args and returns it, for effects whose cycle length is an argument. Without one, every rendered frame is hashed
+    and the cache locks on once the last ``max(P, min_repeat)`` frames have
+    repeated with some period P. A detected cycle is not proof that the
+    effect is periodic (it may follow the clock), so at least ``recheck``
+    frames apart the real effect renders one frame and the cache is dropped
+    if it disagrees; the effect then renders normally from that frame on.
+
+    Cycles are stored as uint8 in one contiguous (P, N, 3) block, in a
+    memory-mapped temporary file under ``directory`` if given. Effects that
+    produce fractional levels can't be stored exactly and are passed through.
+    ``key`` is called each frame; when its value changes (a color setting,
+    say) the cycle is recorded again. The running cycle lives in ``state``
+    (registered with effect_state), so each EffectInstance keeps its own.
+    """
+
+    def __init__(
+        self,
+        step,
+        period=None,
+        key=None,
+        max_frames=FRAME_CACHE_MAX_FRAMES,
+        min_repeat=120,
+        recheck=60,
+        directory=FRAME_CACHE_DIR,
+    ):
+        self.step = step
+        self.period = period
+        self.key = key
+        self.max_frames = max_frames
+        self.min_repeat = min_repeat
+        self.recheck = recheck
+        self.directory = directory
+        self.state = _empty_state()
+
+    def reset(self):
+        self.state.clear()
+        self.state.update(_empty_state())
+
+    def render(self, strip, *args):
+        st = self.state
+        key = (strip.numPixels(), args, self.key() if self.key is not None else None)
+        if key != st["key"]:
+            self.reset()
+            st["key"] = key
+            st["period"] = self.period(*args) if callable(self.period) else self.period
+            if st["period"] is not None and st["period"] > self.max_frames:
+                st["disabled"] = True
+
+        if st["disabled"]:
+            self.step(strip, *args)
+        elif st["cycle"] is None:
+            self.step(strip, *args)
+            self._record(strip.pixels)
+        else:
+            self._play(strip, args)
+
+    def _play(self, strip, args):
+        st = self.state
+        cycle = st["cycle"]
+        period = len(cycle)
+        # The effect is stopped where recording ended. Once playback comes back round to
+        # that point the strip holds what the effect last drew, so it can render its next
+        # frame for real and be compared with the recording.
+        if (
+            st["period"] is None
+            and st["position"] == st["effect_position"]
+            and st["played"] - st["checked"] >= self.recheck
+        ):
+            st["checked"] = st["played"]
+            self.step(strip, *args)
+            if not np.array_equal(strip.pixels, cycle[st["position"]]):
+                st["cycle"] = None
+                st["disabled"] = True
+                return
+            st["effect_position"] = (st["effect_position"] + 1) % period
+        strip.pixels[:] = cycle[st["position"]]
+        st["position"] = (st["position"] + 1) % period
+        st["played"] += 1
+
+    def _record(self, pixels):
+        st = self.state
+        levels = pixels.astype(np.uint8)
+        if not np.array_equal(levels, pixels):
+            st["disabled"] = True
+            return
+        if st["ring"] is None:
+            frames = st["period"] if st["period"] is not None else self.max_frames
+            st["ring"] = np.empty((frames,) + pixels.shape, dtype=np.uint8)
+        ring = st["ring"]
+        t = st["frames"]
+        ring[t % len(ring)] = levels
+        st["frames"] = t + 1
+
+        if st["period"] is not None:
+            if st["frames"] == st["period"]:
+                self._lock(st["period"])
+            return
+
+        period = self._detect(hash(levels.tobytes()))
+        if period:
+            self._lock(period)
+        elif st["frames"] >= 4 * self.max_frames + self.min_repeat:
+            # Nothing repeated; stop paying for the hashes
+            st["disabled"] = True
+            st["ring"] = None
+            st["hashes"] = []
+            st["seen"] = {}
+
+    def _detect(self, latest):
+        """Shortest period P for which the last max(P, min_repeat) frames repeat, if any."""
+        st = self.state
+        hashes = st["hashes"]
+        now = len(hashes)
+        hashes.append(latest)
+        earlier = st["seen"].setdefault(latest, [])
+        found = None
+        for previous in reversed(earlier):
+            period = now - previous
+            span = max(period, self.min_repeat)
+            if period > self.max_frames or span + period > len(hashes):
+                break
+            if hashes[-span:] == hashes[-span - period : -period]:
+                found = period
+                break
+        earlier.append(now)
+        return found
+
+    def _lock(self, period):
+        """Copy the last ``period`` recorded frames, oldest first, into one contiguous block."""
+        st = self.state
+        ring = st["ring"]
+        t = st["frames"]
+        order = np.arange(t - period, t) % len(ring)
+        shape = (period,) + ring.shape[1:]
+        if self.directory:
+            backing = tempfile.TemporaryFile(dir=self.directory, prefix="led-cycle-")
+            cycle = np.memmap(backing, dtype=np.uint8, mode="w+", shape=shape)
+        else:
+            cycle = np.empty(shape, dtype=np.uint8)
+        cycle[:] = ring[order]
+        st["cycle"] = cycle
+        st["ring"] = None
+        st["hashes"] = []
+        st["seen"] = {}
+        st["position"] = 0
+        st["effect_position"] = 0
@@ -0,0 +1,77 @@
+import time
+
+from config import TARGET_FPS
+
+
+class FrameScheduler:
+    """Paces a render loop against absolute frame deadlines on the monotonic clock.
+
+    Deadlines sit on a fixed grid (start + n * period), so a slow frame never
+    pushes every later frame back the way sleep(frame_time - elapsed) does.
+    A frame that finishes late by less than one period is caught up by starting
+    the next one immediately. A frame that overruns whole periods drops those
+    slots instead of bursting through them, and the loop re-joins the grid.
+    """
+
+    def __init__(self, fps=TARGET_FPS, clock=time.monotonic, sleep=time.sleep, fps_window=1.0):
+        self.fps = fps
+        self.period = 1.0 / fps
+        self.clock = clock
+        self.sleep = sleep
+        self.fps_window = fps_window
+        self.frames = 0
+        self.frames_late = 0
+        self.frames_dropped = 0
+        self.achieved_fps = 0.0
+        self.next_deadline = None
+        self._window_start = None
+        self._window_frames = 0
+
+    def start(self):
+        now = self.clock()
+        self.next_deadline = now + self.period
+        self._window_start = now
+        self._window_frames = 0
+
+    def wait(self):
+        """Call once a frame has been pushed. Sleeps until the next deadline.
+
+        Returns the slack in seconds: time left before the deadline, negative
+        when the frame ran late.
+        """
+        if self.next_deadline is None:
+            self.start()
+
+        now = self.clock()
+        self.frames += 1
+        self._update_fps(now)
+        slack = self.next_deadline - now
+
+        if slack > 0:
+            self.sleep(slack)
+            self.next_deadline += self.period
+            return slack
+
+        self.frames_late += 1
+        missed = int(-slack // self.period)
+        if missed:
+            self.frames_dropped += missed
+        self.next_deadline += (missed + 1) * self.period
+        return slack
+
+    def _update_fps(self, now):
+        self._window_frames += 1
+        elapsed = now - self._window_start
+        if elapsed >= self.fps_window:
+            self.achieved_fps = self._window_frames / elapsed
+            self._window_start = now
+            self._window_frames = 0
+
+    def snapshot(self):
+        return {
+            "target_fps": self.fps,
+            "achieved_fps": round(self.achieved_fps, 1),
+            "frames": self.frames,
+            "frames_late": self.frames_late,
+            "frames_dropped": self.frames_dropped,
+        }
@@ -0,0 +1,58 @@
+import numpy as np
+
+from strip_output import pack_rgb, push_words
+
+
+class FrameBuffer:
+    """RGB frame that effects render into before it is pushed to the strip.
+
+    Pixels live in an (N, 3) float32 array so effects can work on the whole
+    strip with array operations instead of one set_pixel call per LED.
+    The object also speaks the small part of the PixelStrip interface that
+    effects use (numPixels, setPixelColor, getPixelColor), so older per-pixel
+    code and AI animations keep working when handed a frame instead of a strip.
+    """
+
+    def __init__(self, num_pixels, pixels=None):
+        if pixels is None:
+            pixels = np.zeros((num_pixels, 3), dtype=np.float32)
+        self.pixels = pixels
+
+    def numPixels(self):
+        return len(self.pixels)
+
+    def setPixelColor(self, n, color):
+        if 0 <= n < len(self.pixels):
+            self.pixels[n] = ((color >> 16) & 0xFF, (color >> 8) & 0xFF, color & 0xFF)
+
+    def getPixelColor(self, n):
+        if 0 <= n < len(self.pixels):
+            r, g, b = self.pixels[n]
+            return (int(r) << 16) | (int(g) << 8) | int(b)
+        return 0
+
+    def show(self):
+        # Frames are flushed by the render loop; effects never push themselves.
+        pass
+
+    def clear(self):
+        self.pixels.fill(0.0)
+
+    def fill(self, red, green, blue):
+        self.pixels[:] = (red, green, blue)
+
+    def fade_to_black(self, fade_value):
+        np.subtract(self.pixels, fade_value, out=self.pixels)
+        np.maximum(self.pixels, 0.0, out=self.pixels)
+
+    def view(self, start, end):
+        """FrameBuffer over pixels start..end-1 that writes straight into this frame."""
+        return FrameBuffer(end - start, pixels=self.pixels[start:end])
+
+    def to_words(self):
+        """Pack the frame into 0x00RRGGBB words, clamping each channel to 0-255."""
+        return pack_rgb(self.pixels)
+
+    def flush(self, strip):
+        """Copy the frame into ``strip``. The caller still calls strip.show()."""
+        push_words(strip, self.to_words())
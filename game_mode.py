@@ -3,17 +3,44 @@ import random
 import time
 from threading import Lock
 
-from led_operations import fill_all, set_pixel
+import numpy as np
+
+from sprites import SpriteLayer, blit
 
 
 def clamp(value, minimum=0, maximum=255):
     return max(minimum, min(maximum, int(value)))
 
 
+EXPLOSION_LIFE = 0.35
+# Explosion halos by radius (1-3): dimmer further from the center, whose pixel the core covers
+EXPLOSION_HALOS = [[1.0 - abs(offset) / (radius + 0.5) for offset in range(-radius, radius + 1)] for radius in (1, 2, 3)]
+EXPLOSION_CORE = len(EXPLOSION_HALOS)
+PLAYER = [(70, 70, 70), (255, 255, 255), (70, 70, 70)]
+
+
 class ZombieGameMode:
     def __init__(self, led_count):
         self.led_count = led_count
         self.lock = Lock()
+        # A zombie is its body color with a dimmer glow either side
+        self.zombies = SpriteLayer(
+            [[(0.3, 0.18, 0.0), (1.0, 1.0, 1.0), (0.3, 0.18, 0.0)]],
+            anchors=[1],
+            rounding="round",
+            anchored=True,
+            dir=1,
+            speed=1,
+        )
+        # Bullet head with a trail one pixel behind it (step = -dir)
+        self.bullets = SpriteLayer([[(255, 255, 220), (80, 80, 60)]], rounding="round", anchored=True, dir=1, speed=1)
+        # Each explosion is a halo actor followed by its core actor, so the core lands on top
+        self.explosions = SpriteLayer(
+            [[(ratio,) * 3 for ratio in halo] for halo in EXPLOSION_HALOS] + [[(1.0, 1.0, 1.0)]],
+            anchors=[len(halo) // 2 for halo in EXPLOSION_HALOS] + [0],
+            rounding="round",
+            age=1,
+        )
         self.reset()
 
     def reset(self):
@@ -22,9 +49,9 @@ class ZombieGameMode:
 
     def _reset_locked(self):
         self.player_pos = self.led_count // 2
-        self.bullets = []
-        self.zombies = []
-        self.explosions = []
+        self.bullets.clear()
+        self.zombies.clear()
+        self.explosions.clear()
         self.score = 0
         self.wave = 1
         self.elapsed = 0.0
@@ -72,13 +99,8 @@ class ZombieGameMode:
 
             start_position = float(self.player_pos + direction)
             if 0 <= start_position < self.led_count:
-                self.bullets.append(
-                    {
-                        "pos": start_position,
-                        "dir": direction,
-                        "speed": 115.0 + random.uniform(-10.0, 12.0),
-                    }
-                )
+                speed = 115.0 + random.uniform(-10.0, 12.0)
+                self.bullets.spawn(pos=start_position, step=-direction, dir=direction, speed=speed)
                 self.shot_cooldown = 0.11
 
     def step(self, strip):
@@ -108,12 +130,12 @@ class ZombieGameMode:
                 if random.random() < overflow_chance:
                     self._spawn_zombie_locked()
 
-            for bullet in self.bullets:
-                bullet["pos"] += bullet["dir"] * bullet["speed"] * dt
-            self.bullets = [bullet for bullet in self.bullets if 0 <= bullet["pos"] < self.led_count]
+            bullets = self.bullets
+            bullets["pos"] += bullets["dir"] * bullets["speed"] * dt
+            bullets.cull((bullets["pos"] >= 0) & (bullets["pos"] < self.led_count))
 
-            for zombie in self.zombies:
-                zombie["pos"] += zombie["dir"] * zombie["speed"] * dt
+            zombies = self.zombies
+            zombies["pos"] += zombies["dir"] * zombies["speed"] * dt
 
             self._resolve_hits_locked()
             self._update_explosions_locked(dt)
@@ -125,152 +147,88 @@ class ZombieGameMode:
         direction = 1 if from_left else -1
         position = 0.0 if from_left else float(self.led_count - 1)
         speed = random.uniform(7.0, 16.0) + min(14.0, self.elapsed * 0.16)
-        self.zombies.append(
-            {
-                "pos": position,
-                "dir": direction,
-                "speed": speed,
-                "tone": random.uniform(0.0, 1.0),
-            }
+        tone = random.uniform(0.0, 1.0)
+        speed_ratio = min(1.0, max(0.0, (speed - 7.0) / 20.0))
+        body_color = (
+            clamp(165 + 70 * speed_ratio),
+            clamp(12 + 30 * tone),
+            clamp(8 + 10 * tone),
         )
+        self.zombies.spawn(pos=position, tint=body_color, dir=direction, speed=speed)
+
+    def _spawn_explosion_locked(self, position):
+        self.explosions.spawn(pos=position)
+        self.explosions.spawn(pos=position, shape=EXPLOSION_CORE)
 
     def _resolve_hits_locked(self):
-        if not self.bullets or not self.zombies:
+        if not len(self.bullets) or not len(self.zombies):
             return
 
-        remaining_bullets = []
-        hit_indices = set()
-
-        for bullet in self.bullets:
-            hit_index = None
-            for zombie_index, zombie in enumerate(self.zombies):
-                if zombie_index in hit_indices:
-                    continue
-                if abs(bullet["pos"] - zombie["pos"]) <= 1.15:
-                    hit_index = zombie_index
-                    break
+        bullet_pos = self.bullets["pos"]
+        zombie_pos = self.zombies["pos"]
+        hit_bullets = np.zeros(len(self.bullets), dtype=bool)
+        hit_zombies = np.zeros(len(self.zombies), dtype=bool)
 
-            if hit_index is None:
-                remaining_bullets.append(bullet)
+        # Each bullet takes the first zombie in reach that no earlier bullet has hit
+        for bullet_index, zombie_index in zip(*self.zombies.within(bullet_pos, 1.15)):
+            if hit_bullets[bullet_index] or hit_zombies[zombie_index]:
                 continue
-
-            zombie = self.zombies[hit_index]
-            hit_indices.add(hit_index)
+            hit_bullets[bullet_index] = True
+            hit_zombies[zombie_index] = True
             self.score += 1
-            self.explosions.append(
-                {
-                    "pos": (bullet["pos"] + zombie["pos"]) / 2.0,
-                    "age": 0.0,
-                }
-            )
+            self._spawn_explosion_locked((bullet_pos[bullet_index] + zombie_pos[zombie_index]) / 2.0)
 
-        self.bullets = remaining_bullets
-        if hit_indices:
-            self.zombies = [zombie for index, zombie in enumerate(self.zombies) if index not in hit_indices]
+        self.bullets.cull(~hit_bullets)
+        self.zombies.cull(~hit_zombies)
 
     def _update_explosions_locked(self, dt):
-        for explosion in self.explosions:
-            explosion["age"] += dt
-        self.explosions = [explosion for explosion in self.explosions if explosion["age"] < 0.35]
+        explosions = self.explosions
+        explosions["age"] += dt
+        explosions.cull(explosions["age"] < EXPLOSION_LIFE)
 
     def _check_player_collision_locked(self):
         if self.game_over:
             return
 
-        for zombie in self.zombies:
-            if abs(zombie["pos"] - self.player_pos) <= 0.8:
-                self.game_over = True
-                self.game_over_timer = 0.0
-                self.game_over_origin = float(self.player_pos)
-                self.bullets = []
-                self.explosions.append({"pos": float(self.player_pos), "age": 0.0})
-                return
-
-    def _draw_zombie(self, strip, position, speed, tone):
-        center = int(round(position))
-        if not (0 <= center < self.led_count):
-            return
-
-        speed_ratio = min(1.0, max(0.0, (speed - 7.0) / 20.0))
-        body_color = (
-            clamp(165 + 70 * speed_ratio),
-            clamp(12 + 30 * tone),
-            clamp(8 + 10 * tone),
-        )
-        glow_color = (
-            clamp(body_color[0] * 0.3),
-            clamp(body_color[1] * 0.18),
-            0,
-        )
-
-        set_pixel(strip, center, *body_color)
-        if center > 0:
-            set_pixel(strip, center - 1, *glow_color)
-        if center < self.led_count - 1:
-            set_pixel(strip, center + 1, *glow_color)
-
-    def _draw_bullet(self, strip, bullet):
-        position = int(round(bullet["pos"]))
-        if not (0 <= position < self.led_count):
+        touching, _ = self.zombies.within(self.player_pos, 0.8)
+        if len(touching):
+            self.game_over = True
+            self.game_over_timer = 0.0
+            self.game_over_origin = float(self.player_pos)
+            self.bullets.clear()
+            self._spawn_explosion_locked(float(self.player_pos))
+
+    def _draw_explosions(self, pixels):
+        explosions = self.explosions
+        if not len(explosions):
             return
-
-        set_pixel(strip, position, 255, 255, 220)
-        trail_position = position - bullet["dir"]
-        if 0 <= trail_position < self.led_count:
-            set_pixel(strip, trail_position, 80, 80, 60)
-
-    def _draw_explosion(self, strip, explosion):
-        center = int(round(explosion["pos"]))
-        age_ratio = min(1.0, max(0.0, explosion["age"] / 0.35))
-        radius = 1 + int(age_ratio * 2.5)
-        core = (
-            clamp(255),
-            clamp(220 - 80 * age_ratio),
-            clamp(80 - 60 * age_ratio),
-        )
-        halo = (
-            clamp(160 - 90 * age_ratio),
-            clamp(70 - 50 * age_ratio),
-            0,
-        )
-
-        for offset in range(-radius, radius + 1):
-            pixel = center + offset
-            if not (0 <= pixel < self.led_count):
-                continue
-            if offset == 0:
-                set_pixel(strip, pixel, *core)
-            else:
-                distance_ratio = 1.0 - (abs(offset) / (radius + 0.5))
-                set_pixel(
-                    strip,
-                    pixel,
-                    clamp(halo[0] * distance_ratio),
-                    clamp(halo[1] * distance_ratio),
-                    0,
-                )
+        age_ratio = np.clip(explosions["age"] / EXPLOSION_LIFE, 0.0, 1.0)
+        core = explosions["shape"] == EXPLOSION_CORE
+        halo = ~core
+        explosions["shape"][halo] = (age_ratio[halo] * 2.5).astype(np.intp)
+        tints = np.zeros((len(explosions), 3))
+        tints[core, 0] = 255
+        tints[core, 1] = 220 - 80 * age_ratio[core]
+        tints[core, 2] = 80 - 60 * age_ratio[core]
+        tints[halo, 0] = 160 - 90 * age_ratio[halo]
+        tints[halo, 1] = 70 - 50 * age_ratio[halo]
+        # Whole colors, like clamp(), before the halo falloff scales them
+        explosions["tint"] = np.clip(np.trunc(tints), 0, 255)
+        explosions.draw(pixels)
 
     def _render_playfield(self, strip):
-        fill_all(strip, 0, 0, 0)
-
-        for zombie in self.zombies:
-            self._draw_zombie(strip, zombie["pos"], zombie["speed"], zombie["tone"])
-
-        for bullet in self.bullets:
-            self._draw_bullet(strip, bullet)
+        pixels = strip.pixels
+        pixels.fill(0)
 
-        for explosion in self.explosions:
-            self._draw_explosion(strip, explosion)
+        self.zombies.draw(pixels)
+        self.bullets.draw(pixels)
+        self._draw_explosions(pixels)
 
         player_pos = self.player_pos
-        set_pixel(strip, player_pos, 255, 255, 255)
-        if player_pos > 0:
-            set_pixel(strip, player_pos - 1, 70, 70, 70)
-        if player_pos < self.led_count - 1:
-            set_pixel(strip, player_pos + 1, 70, 70, 70)
+        blit(pixels, player_pos - 1, PLAYER)
 
     def _render_game_over(self, strip):
-        fill_all(strip, 0, 0, 0)
+        pixels = strip.pixels
 
         pulse = 0.55 + 0.45 * math.sin(self.game_over_timer * 14.0)
         ring_radius = min(self.led_count / 2.0, self.game_over_timer * 58.0)
@@ -278,21 +236,18 @@ class ZombieGameMode:
         if self.game_over_timer > 1.15:
             fade = max(0.0, 1.0 - ((self.game_over_timer - 1.15) / 0.75))
 
-        for index in range(self.led_count):
-            distance = abs(index - self.game_over_origin)
-            ring_strength = max(0.0, 1.0 - abs(distance - ring_radius) / 2.6)
-            ember_strength = max(0.0, 1.0 - distance / (ring_radius + 9.0))
+        distance = np.abs(np.arange(self.led_count) - self.game_over_origin)
+        ring_strength = np.maximum(0.0, 1.0 - np.abs(distance - ring_radius) / 2.6)
+        ember_strength = np.maximum(0.0, 1.0 - distance / (ring_radius + 9.0))
 
-            red = clamp((35 + 210 * max(ember_strength * 0.45, ring_strength * pulse)) * fade)
-            green = clamp((8 + 90 * ring_strength * pulse) * fade)
-            blue = clamp((20 * ring_strength * 0.3) * fade)
-            if red or green or blue:
-                set_pixel(strip, index, red, green, blue)
+        red = (35 + 210 * np.maximum(ember_strength * 0.45, ring_strength * pulse)) * fade
+        green = (8 + 90 * ring_strength * pulse) * fade
+        blue = (20 * ring_strength * 0.3) * fade
+        pixels[:] = np.clip(np.trunc(np.stack((red, green, blue), axis=1)), 0, 255)
 
         center = int(round(self.game_over_origin))
         if 0 <= center < self.led_count:
             flash = clamp(255 * fade)
-            set_pixel(strip, center, flash, clamp(220 * fade), clamp(170 * fade))
+            pixels[center] = (flash, clamp(220 * fade), clamp(170 * fade))
 
-        for explosion in self.explosions:
-            self._draw_explosion(strip, explosion)
+        self._draw_explosions(pixels)
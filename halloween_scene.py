@@ -1,6 +1,15 @@
 import random
 import math
-from led_operations import fill_all, set_pixel
+from functools import lru_cache
+
+import numpy as np
+
+from sprites import SpriteLayer, blit
+
+def new_treats():
+    """Treats are solid 1-3 pixel runs in their own color (shape index = length - 1).
+    They are drawn from their position in the direction they move, kept in the ``step`` column."""
+    return SpriteLayer([[(1,1,1)]*length for length in (1,2,3)], base_speed=1, panic_timer=1, special=1)
 
 # Global state for the Halloween scene
 halloween_scene_state = {
@@ -18,7 +27,7 @@ halloween_scene_state = {
     'pumpkin_speed': 0.05,
     'pumpkin_accel': 0.0,
     'next_direction_change': 0,
-    'treats': [],
+    'treats': new_treats(),
     'last_treat_spawn': 0,
     'treats_eaten': 0,
     'pumpkin_width': 20,
@@ -44,7 +53,7 @@ def reset_halloween_scene_state():
         'pumpkin_speed': 0.05,
         'pumpkin_accel': 0.0,
         'next_direction_change': 0,
-        'treats': [],
+        'treats': new_treats(),
         'last_treat_spawn': 0,
         'treats_eaten': 0,
         'pumpkin_width': 20,
@@ -57,13 +66,14 @@ def reset_halloween_scene_state():
 
 def halloween_scene_step(strip):
     st = halloween_scene_state
-    num_leds = strip.numPixels()
+    pixels = strip.pixels
+    num_leds = len(pixels)
     if not st['initialized']:
         st['initialized'] = True
         # Start pumpkin roughly in the middle
         st['pumpkin_position'] = num_leds // 2
         # Clear strip initially
-        fill_all(strip, 0, 0, 0)
+        pixels.fill(0)
 
     st['frame_count'] += 1
     st['background_offset'] += 1
@@ -76,13 +86,15 @@ def halloween_scene_step(strip):
     # Max pumpkin speed
     max_pumpkin_speed = 0.7
 
+    treats = st['treats']
+
     # Spawn treats occasionally (only if less than 5 total)
-    if len(st['treats']) < 5:
+    if len(treats) < 5:
         if (st['frame_count'] - st['last_treat_spawn'] > 50) and (random.random() > 0.95):
             pumpkin_pos = st['pumpkin_position']
             group_size = random.randint(1,3)
             # Ensure we don't exceed 5 treats total
-            remaining_slots = 5 - len(st['treats'])
+            remaining_slots = 5 - len(treats)
             group_size = min(group_size, remaining_slots)
 
             for _ in range(group_size):
@@ -107,17 +119,8 @@ def halloween_scene_step(strip):
                 g = random.randint(100,255)
                 b = random.randint(100,255)
 
-                st['treats'].append({
-                    'pos': float(pos),
-                    'dir': direction,
-                    'r': r,
-                    'g': g,
-                    'b': b,
-                    'panic_timer': 0,
-                    'length': length,
-                    'base_speed': base_speed,
-                    'special': is_special
-                })
+                treats.spawn(pos=pos, step=direction, shape=length-1, tint=(r,g,b), base_speed=base_speed,
+                             special=is_special)
             st['last_treat_spawn'] = st['frame_count']
 
     # Smooth color transitions for pumpkin:
@@ -129,24 +132,21 @@ def halloween_scene_step(strip):
     v = 0.8 + 0.2 * sine_factor  # brightness between 0.8 and 1.0
     pumpkin_r, pumpkin_g, pumpkin_b = hsv_to_rgb((st['pumpkin_color_phase'] / 360.0), 1.0, v)
 
-    # Background
-    for i in range(num_leds):
-        base_r, base_g, base_b = background_color(i + st['background_offset'])
-        set_pixel(strip, i, base_r, base_g, base_b)
+    # Background: one slice of the scrolling hue ramp
+    offset = st['background_offset'] % BACKGROUND_PERIOD
+    pixels[:] = background_ring(num_leds)[offset:offset + num_leds]
 
-    # Treat interactions (bounce off each other)
-    for i in range(len(st['treats'])):
-        for j in range(i+1, len(st['treats'])):
-            if abs(st['treats'][i]['pos'] - st['treats'][j]['pos']) < 2:
-                st['treats'][i]['dir'] *= -1
-                st['treats'][j]['dir'] *= -1
+    # Treat interactions (bounce off each other): every close pair flips both treats
+    first, second = treats.pairs(2, inclusive=False)
+    flips = np.bincount(first, minlength=len(treats)) + np.bincount(second, minlength=len(treats))
+    treats['step'][flips % 2 == 1] *= -1
 
     pumpkin_pos = st['pumpkin_position']
 
     # Chasing logic: chase from further away
-    if st['treats']:
-        closest_treat = min(st['treats'], key=lambda t: abs(t['pos'] - pumpkin_pos))
-        dist = closest_treat['pos'] - pumpkin_pos
+    if len(treats):
+        closest_treat = np.argmin(np.abs(treats['pos'] - pumpkin_pos))
+        dist = treats['pos'][closest_treat] - pumpkin_pos
         st['pumpkin_direction'] = 1 if dist > 0 else -1
         distance_abs = abs(dist)
         base_speed = 0.3
@@ -189,45 +189,32 @@ def halloween_scene_step(strip):
     # Side colors
     side_r, side_g, side_b = hsv_to_rgb((st['pumpkin_side_color_phase']/360.0), 1.0, v)
 
-    # Move & draw treats
-    new_treats = []
-    for t in st['treats']:
-        dist_from_pumpkin = abs(t['pos'] - pumpkin_pos)
-        if dist_from_pumpkin > 40:
-            treat_speed = t['base_speed'] * 0.1
-        elif dist_from_pumpkin > 20:
-            treat_speed = t['base_speed'] * 0.5
-        else:
-            treat_speed = t['base_speed'] * 1.2
-            if t['panic_timer'] == 0 and random.random() > 0.9:
-                t['dir'] *= -1
-                t['panic_timer'] = 20
-
-        if t['panic_timer'] > 0:
-            t['panic_timer'] -= 1
+    # Move & draw treats; they hurry the closer the pumpkin is
+    dist_from_pumpkin = np.abs(treats['pos'] - pumpkin_pos)
+    close = dist_from_pumpkin <= 20
+    treat_speed = treats['base_speed'] * np.where(dist_from_pumpkin > 40, 0.1, np.where(close, 1.2, 0.5))
+    direction = treats['step']
+    panic_timer = treats['panic_timer']
+    tint = treats['tint']
+    for i in range(len(treats)):
+        if close[i] and panic_timer[i] == 0 and random.random() > 0.9:
+            direction[i] *= -1
+            panic_timer[i] = 20
 
         if random.random() > 0.995:
-            t['dir'] = -t['dir']
+            direction[i] = -direction[i]
 
-        t['pos'] += t['dir'] * treat_speed
-
-        if t['special']:
-            t['r'], t['g'], t['b'] = hsv_random_bright_color()
+        if treats['special'][i]:
+            tint[i] = hsv_random_bright_color()
         else:
             # slight flicker
             if random.random() > 0.95:
-                t['r'] = min(255, max(100, t['r'] + random.randint(-20,20)))
-                t['g'] = min(255, max(100, t['g'] + random.randint(-20,20)))
-                t['b'] = min(255, max(100, t['b'] + random.randint(-20,20)))
-
-        if 0 <= t['pos'] < num_leds:
-            start_pos = int(t['pos'])
-            for l_i in range(t['length']):
-                treat_pixel = start_pos + (l_i * t['dir'])
-                if 0 <= treat_pixel < num_leds:
-                    set_pixel(strip, treat_pixel, t['r'], t['g'], t['b'])
-            new_treats.append(t)
-    st['treats'] = new_treats
+                tint[i] = [min(255, max(100, c + random.randint(-20,20))) for c in tint[i]]
+    panic_timer[panic_timer > 0] -= 1
+
+    treats['pos'] += direction * treat_speed
+    treats.cull((treats['pos'] >= 0) & (treats['pos'] < num_leds))
+    treats.draw(pixels)
 
     pumpkin_center = int(st['pumpkin_position'])
     pumpkin_start = pumpkin_center - st['pumpkin_width'] // 2
@@ -237,24 +224,18 @@ def halloween_scene_step(strip):
     if st['side_flicker_timer'] > 0:
         st['side_flicker_timer'] -= 1
 
-    # Draw pumpkin body
-    for i in range(pumpkin_start, pumpkin_end):
-        if 0 <= i < num_leds:
-            edge_dist = min(i - pumpkin_start, pumpkin_end - i - 1)
-            if edge_dist < 3:
-                blend_factor = (3 - edge_dist)/3.0
-                pr = pumpkin_r*(1-blend_factor) + side_r*blend_factor
-                pg = pumpkin_g*(1-blend_factor) + side_g*blend_factor
-                pb = pumpkin_b*(1-blend_factor) + side_b*blend_factor
-            else:
-                pr,pg,pb = pumpkin_r, pumpkin_g, pumpkin_b
-
-            if st['eat_inner_flash_timer'] > 0:
-                # slight flash inside
-                if random.random() < 0.1:
-                    pr, pg, pb = 255, 255, 255
-
-            set_pixel(strip, i, int(pr), int(pg), int(pb))
+    # Draw pumpkin body, blending to the side color over the 3 pixels at each edge
+    body = np.arange(max(0, pumpkin_start), min(num_leds, pumpkin_end))
+    edge_dist = np.minimum(body - pumpkin_start, pumpkin_end - body - 1)
+    blend_factor = np.where(edge_dist < 3, (3 - edge_dist) / 3.0, 0.0)
+    body_colors = np.floor(
+        np.multiply.outer(1 - blend_factor, (pumpkin_r, pumpkin_g, pumpkin_b))
+        + np.multiply.outer(blend_factor, (side_r, side_g, side_b))
+    )
+    if st['eat_inner_flash_timer'] > 0:
+        # slight flash inside
+        body_colors[[random.random() < 0.1 for _ in body]] = 255
+    pixels[body] = body_colors
 
     # Eye blinking logic
     if st['eyes_blink_timer'] == 0:
@@ -263,7 +244,7 @@ def halloween_scene_step(strip):
             st['eyes_blink_timer'] = 5
 
     # Draw eyes (red/orange), blinking if needed
-    draw_eyes(strip, pumpkin_center, st['pumpkin_width'], st['eyes_blink_timer'])
+    draw_eyes(pixels, pumpkin_center, st['pumpkin_width'], st['eyes_blink_timer'])
 
     if st['eyes_blink_timer'] > 0:
         st['eyes_blink_timer'] -= 1
@@ -279,28 +260,19 @@ def halloween_scene_step(strip):
     if st['teeth_flash_timer'] > 0:
         st['teeth_flash_timer'] -= 1
 
-    if st['teeth_flash_state']:
-        for tpos in teeth_positions:
-            if 0 <= tpos < num_leds:
-                set_pixel(strip, tpos, 255,255,255)
-    else:
-        for tpos in teeth_positions:
-            if 0 <= tpos < num_leds:
-                set_pixel(strip, tpos, 200,200,150)
-
-    # Check if treats are eaten
-    eaten_count = 0
-    special_eaten = 0
-    remaining_treats = []
-    for t in st['treats']:
-        treat_positions = [int(t['pos'] + i*t['dir']) for i in range(t['length'])]
-        if any(pumpkin_start <= p <= pumpkin_end for p in treat_positions):
-            eaten_count += 1
-            if t['special']:
-                special_eaten += 1
-        else:
-            remaining_treats.append(t)
-    st['treats'] = remaining_treats
+    teeth_lo = max(0, teeth_positions.start)
+    teeth_hi = min(num_leds, teeth_positions.stop)
+    if teeth_hi > teeth_lo:
+        pixels[teeth_lo:teeth_hi] = (255,255,255) if st['teeth_flash_state'] else (200,200,150)
+
+    # Check if treats are eaten: any of their pixels inside the pumpkin
+    cells = np.trunc(treats['pos'][:, None] + np.arange(3) * treats['step'][:, None])
+    lengths = treats['shape'][:, None] + 1
+    inside = (cells >= pumpkin_start) & (cells <= pumpkin_end) & (np.arange(3) < lengths)
+    eaten = inside.any(axis=1)
+    eaten_count = int(np.count_nonzero(eaten))
+    special_eaten = int(np.count_nonzero(eaten & (treats['special'] > 0)))
+    treats.cull(~eaten)
 
     if eaten_count > 0:
         st['treats_eaten'] += eaten_count
@@ -321,16 +293,13 @@ def halloween_scene_step(strip):
     if st['eat_inner_flash_timer'] > 0:
         st['eat_inner_flash_timer'] -= 1
 
-def draw_eyes(strip, center, width, blink_timer):
-    num_leds = strip.numPixels()
-
+def draw_eyes(pixels, center, width, blink_timer):
     # If blinking, eyes closed (draw black)
     if blink_timer > 0:
         # Overwrite a small region around the center with black
         # based on the largest eye size (4 pixels)
-        for pos in range(center-2, center+3):
-            if 0 <= pos < num_leds:
-                set_pixel(strip, pos, 0,0,0)
+        if center+3 > 0:
+            pixels[max(0, center-2):center+3] = 0
         return
 
     # Colors for eyes: we will use orange and red
@@ -338,6 +307,7 @@ def draw_eyes(strip, center, width, blink_timer):
     # Red: (255,0,0)
     orange = (255,150,0)
     dim_orange = (180,100,0)
+    red = (255,0,0)
 
     # Eye patterns depending on size:
     # Small (<30): 2 pixels
@@ -354,27 +324,11 @@ def draw_eyes(strip, center, width, blink_timer):
     #   (center+1): orange
 
     if width < 30:
-        eye_pixels = [
-            (center-1, orange),
-            (center,   (255,0,0)) # red
-        ]
+        blit(pixels, center-1, [orange, red])
     elif width < 50:
-        eye_pixels = [
-            (center-1, orange),
-            (center,   (255,0,0)), # red
-            (center+1, orange)
-        ]
+        blit(pixels, center-1, [orange, red, orange])
     else:
-        eye_pixels = [
-            (center-2, dim_orange),
-            (center-1, orange),
-            (center,   (255,0,0)), # red pupil
-            (center+1, orange)
-        ]
-
-    for pos, color in eye_pixels:
-        if 0 <= pos < num_leds:
-            set_pixel(strip, pos, color[0], color[1], color[2])
+        blit(pixels, center-2, [dim_orange, orange, red, orange])
 
 def hsv_random_bright_color():
     h = random.random()
@@ -410,3 +364,11 @@ def hsv_to_rgb(h, s, v):
     elif i == 5:
         r,g,b = v,p,q
     return (r*255,g*255,b*255)
+
+BACKGROUND_PERIOD = 600
+BACKGROUND_RAMP = np.array([background_color(p) for p in range(BACKGROUND_PERIOD)], dtype=np.float32)
+
+@lru_cache(maxsize=8)
+def background_ring(num_leds):
+    """The ramp repeated out to BACKGROUND_PERIOD + num_leds entries, so every scroll offset is one slice."""
+    return BACKGROUND_RAMP[np.arange(BACKGROUND_PERIOD + num_leds) % BACKGROUND_PERIOD]
@@ -1,31 +1,37 @@
-from rpi_ws281x import Color
+import numpy as np
+
+from framebuffer import FrameBuffer
+from led_strip import Color
+
+
+def _channel(value):
+    return max(0, min(255, int(value)))
+
 
 def set_pixel(strip, pixel, red, green, blue):
-    strip.setPixelColor(
-        pixel,
-        Color(
-            max(0, min(255, int(red))),
-            max(0, min(255, int(green))),
-            max(0, min(255, int(blue))),
-        ),
-    )
+    if isinstance(strip, FrameBuffer):
+        if 0 <= pixel < len(strip.pixels):
+            strip.pixels[pixel] = (_channel(red), _channel(green), _channel(blue))
+        return
+    strip.setPixelColor(pixel, Color(_channel(red), _channel(green), _channel(blue)))
 
 def fill_all(strip, red, green, blue):
+    if isinstance(strip, FrameBuffer):
+        strip.fill(_channel(red), _channel(green), _channel(blue))
+        return
+    color = Color(_channel(red), _channel(green), _channel(blue))
     for i in range(strip.numPixels()):
-        strip.setPixelColor(
-            i,
-            Color(
-                max(0, min(255, int(red))),
-                max(0, min(255, int(green))),
-                max(0, min(255, int(blue))),
-            ),
-        )
+        strip.setPixelColor(i, color)
 
 def set_all(strip, red, green, blue):
     fill_all(strip, red, green, blue)
     strip.show()
 
 def fade_to_black(strip, led_no, fade_value):
+    if isinstance(strip, FrameBuffer):
+        if 0 <= led_no < len(strip.pixels):
+            strip.pixels[led_no] = np.maximum(strip.pixels[led_no] - fade_value, 0.0)
+        return
     color = strip.getPixelColor(led_no)
     r = (color >> 16) & 0xFF
     g = (color >> 8) & 0xFF
@@ -36,6 +42,9 @@ def fade_to_black(strip, led_no, fade_value):
     strip.setPixelColor(led_no, Color(r, g, b))
 
 def get_pixel(strip, led_no):
+    if isinstance(strip, FrameBuffer):
+        r, g, b = strip.pixels[led_no]
+        return (int(r), int(g), int(b))
     color = strip.getPixelColor(led_no)
     r = (color >> 16) & 0xFF
     g = (color >> 8) & 0xFF
@@ -0,0 +1,183 @@
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+
+from config import (
+    LED_BACKEND,
+    LED_BRIGHTNESS,
+    LED_CHANNEL,
+    LED_COUNT,
+    LED_COUNT_CHANNEL_1,
+    LED_DMA,
+    LED_FREQ_HZ,
+    LED_GPIO_PIN,
+    LED_GPIO_PIN_CHANNEL_1,
+    LED_INVERT,
+    LED_VIRTUAL_TIMING,
+)
+from strip_output import push_words
+from virtual_strip import VirtualStrip
+
+try:
+    import _rpi_ws281x as ws
+    from rpi_ws281x import Color, PixelStrip
+except ImportError:
+    ws = None
+    PixelStrip = None
+
+    def Color(red, green, blue, white=0):
+        return (white << 24) | (red << 16) | (green << 8) | blue
+
+
+class SegmentedStrip:
+    """Several physical strips presented to effects as one numPixels() space.
+
+    A frame handed to set_pixel_data() is pushed to each segment when show()
+    is called, and every segment's push and show run in parallel on a
+    persistent thread per segment, so doubling the LED count across two
+    outputs doesn't halve the frame rate. ``render`` replaces the per-segment
+    show when one call drives every segment at once (both ws281x channels
+    share a single DMA transfer).
+    """
+
+    def __init__(self, segments, render=None):
+        self.segments = segments
+        self.offsets = []
+        total = 0
+        for segment in segments:
+            self.offsets.append(total)
+            total += segment.numPixels()
+        self.size = total
+        self._render = render
+        self._pending = None
+        self._pool = None
+        if render is None and len(segments) > 1:
+            self._pool = ThreadPoolExecutor(max_workers=len(segments), thread_name_prefix="segment")
+
+    def _locate(self, n):
+        index = bisect_right(self.offsets, n) - 1
+        return self.segments[index], n - self.offsets[index]
+
+    def begin(self):
+        for segment in self.segments:
+            segment.begin()
+
+    def _cleanup(self):
+        for segment in self.segments:
+            segment._cleanup()
+
+    def numPixels(self):
+        return self.size
+
+    def setPixelColor(self, n, color):
+        if 0 <= n < self.size:
+            segment, local = self._locate(n)
+            segment.setPixelColor(local, color)
+
+    def getPixelColor(self, n):
+        if 0 <= n < self.size:
+            segment, local = self._locate(n)
+            return segment.getPixelColor(local)
+        return 0
+
+    def set_pixel_data(self, words):
+        # Pushed per segment in show(); the caller keeps ``words`` alive until then
+        self._pending = words
+
+    def getBrightness(self):
+        return self.segments[0].getBrightness()
+
+    def setBrightness(self, brightness):
+        for segment in self.segments:
+            segment.setBrightness(brightness)
+
+    def _push(self, index):
+        if self._pending is not None:
+            start = self.offsets[index]
+            segment = self.segments[index]
+            push_words(segment, self._pending[start:start + segment.numPixels()])
+
+    def _push_and_show(self, index):
+        self._push(index)
+        self.segments[index].show()
+
+    def show(self):
+        if self._render is not None:
+            for index in range(len(self.segments)):
+                self._push(index)
+            self._render()
+        elif self._pool is not None:
+            for future in [self._pool.submit(self._push_and_show, i) for i in range(len(self.segments))]:
+                future.result()
+        else:
+            self._push_and_show(0)
+        self._pending = None
+
+
+class _Ws281xChannel:
+    """Second PWM channel of a PixelStrip, addressed like a strip of its own."""
+
+    def __init__(self, leds, channel, num):
+        self._leds = leds
+        self._channel = channel
+        self.size = num
+
+    def begin(self):
+        pass
+
+    def _cleanup(self):
+        pass
+
+    def numPixels(self):
+        return self.size
+
+    def setPixelColor(self, n, color):
+        ws.ws2811_led_set(self._channel, n, color)
+
+    def getPixelColor(self, n):
+        return ws.ws2811_led_get(self._channel, n)
+
+    def getBrightness(self):
+        return ws.ws2811_channel_t_brightness_get(self._channel)
+
+    def setBrightness(self, brightness):
+        ws.ws2811_channel_t_brightness_set(self._channel, brightness)
+
+
+def _create_dual_channel_strip(count_0, count_1):
+    strip = PixelStrip(count_0, LED_GPIO_PIN, LED_FREQ_HZ, LED_DMA, LED_INVERT, LED_BRIGHTNESS, 0)
+    # PixelStrip only sets up the channel it was given; configure channel 1 on
+    # the same ws2811_t so one ws2811_render() clocks out both in parallel
+    channel = ws.ws2811_channel_get(strip._leds, 1)
+    ws.ws2811_channel_t_gamma_set(channel, list(range(256)))
+    ws.ws2811_channel_t_count_set(channel, count_1)
+    ws.ws2811_channel_t_gpionum_set(channel, LED_GPIO_PIN_CHANNEL_1)
+    ws.ws2811_channel_t_invert_set(channel, 1 if LED_INVERT else 0)
+    ws.ws2811_channel_t_brightness_set(channel, LED_BRIGHTNESS)
+    ws.ws2811_channel_t_strip_type_set(channel, ws.WS2811_STRIP_GRB)
+    second = _Ws281xChannel(strip._leds, channel, count_1)
+    return SegmentedStrip([strip, second], render=strip.show)
+
+
+def create_strip(backend=LED_BACKEND):
+    """Build and begin() the strip selected by LED_BACKEND ("ws281x" or "virtual")."""
+    count_1 = LED_COUNT_CHANNEL_1
+    count_0 = LED_COUNT - count_1
+    if backend == "virtual":
+        if count_1:
+            strip = SegmentedStrip([
+                VirtualStrip(count, LED_FREQ_HZ, LED_BRIGHTNESS, simulate_timing=LED_VIRTUAL_TIMING)
+                for count in (count_0, count_1)
+            ])
+        else:
+            strip = VirtualStrip(LED_COUNT, LED_FREQ_HZ, LED_BRIGHTNESS, simulate_timing=LED_VIRTUAL_TIMING)
+    elif backend == "ws281x":
+        if PixelStrip is None:
+            raise RuntimeError("rpi_ws281x not installed. Set LED_BACKEND=virtual to run without a strip.")
+        if count_1:
+            strip = _create_dual_channel_strip(count_0, count_1)
+        else:
+            strip = PixelStrip(LED_COUNT, LED_GPIO_PIN, LED_FREQ_HZ, LED_DMA, LED_INVERT, LED_BRIGHTNESS, LED_CHANNEL)
+    else:
+        raise ValueError(f"Unknown LED_BACKEND: {backend!r}")
+    strip.begin()
+    return strip
@@ -3,18 +3,29 @@ import random
 import ctypes
 from threading import Thread, Event
 from gpiozero import Button
-from rpi_ws281x import PixelStrip, Color
 import evdev
 
 from pacifica import pacifica_step
 from animations import *
+from patterns import (
+    cylon_bounce_step,
+    rainbow_cycle_step,
+    running_lights_step,
+    theater_chase_rainbow_step,
+    theater_chase_step,
+    wheel_step,
+)
 from static_mode import StaticMode
 from fire import fire_step
 from color_bounce import color_bounce_step
+from fastled_math import begin_frame
+from frame_scheduler import FrameScheduler
+from framebuffer import FrameBuffer
 from led_operations import set_all
+from led_strip import create_strip
 from halloween_scene import halloween_scene_step, reset_halloween_scene_state
 from xmas_scene import xmas_scene_step, reset_xmas_scene_state  # Import Christmas animation
-from config import LED_COUNT, LED_GPIO_PIN, LED_FREQ_HZ, LED_DMA, LED_BRIGHTNESS, LED_INVERT, LED_CHANNEL
+from config import LED_COUNT, LED_BRIGHTNESS
 
 effect_stop_event = Event()
 
@@ -24,8 +35,10 @@ current_command = 0
 current_effect_thread = None
 
 # Set up the LED strip
-strip = PixelStrip(LED_COUNT, LED_GPIO_PIN, LED_FREQ_HZ, LED_DMA, LED_INVERT, LED_BRIGHTNESS, LED_CHANNEL)
-strip.begin()
+strip = create_strip()
+
+# Effects render into this frame, which is flushed to the strip once per frame
+frame = FrameBuffer(LED_COUNT)
 
 # Track brightness globally
 current_brightness = LED_BRIGHTNESS
@@ -64,16 +77,16 @@ def handle_ir():
 def run_animation(effect_function, *args, **kwargs):
     """
     Run a given effect function in a loop until effect_stop_event is set.
-    Use a stable frame rate delay for smoother animations.
+    Frames are paced against fixed deadlines so slow frames don't cause drift.
     """
-    frame_time = 0.02  # ~50 FPS
+    scheduler = FrameScheduler()
+    scheduler.start()
     while not effect_stop_event.is_set():
-        start = time.time()
-        effect_function(strip, *args, **kwargs)
+        begin_frame()
+        effect_function(frame, *args, **kwargs)
+        frame.flush(strip)
         strip.show()
-        elapsed = time.time() - start
-        if elapsed < frame_time:
-            time.sleep(frame_time - elapsed)
+        scheduler.wait()
 
 def reset_states():
     # Reset all states to their initial values
@@ -100,6 +113,7 @@ def start_effect(effect_function, *args, **kwargs):
         current_effect_thread.join()
 
     # Clear strip and reset states before starting new animation
+    frame.clear()
     set_all(strip, 0, 0, 0)
     strip.show()
     reset_states()
@@ -122,18 +136,6 @@ def start_effect(effect_function, *args, **kwargs):
 def no_op(strip, *args, **kwargs):
     pass
 
-def wheel_step(strip, c1=(255,0,0), c2=(0,255,0), step=500):
-    st = wheel_step_state
-    num_leds = strip.numPixels()
-    pos = st['pos']
-    for i in range(num_leds):
-        ratio = ((i + pos) % step) / step
-        r = int(c1[0] * (1 - ratio) + c2[0] * ratio)
-        g = int(c1[1] * (1 - ratio) + c2[1] * ratio)
-        b = int(c1[2] * (1 - ratio) + c2[2] * ratio)
-        set_pixel(strip, i, r, g, b)
-    st['pos'] += 1
-
 effects = {
     0: lambda: start_effect(fade_in_out_step, 255, 0, 0),
     1: lambda: start_effect(pacifica_step),
@@ -0,0 +1,45 @@
+import numpy as np
+
+from strip_output import pack_rgb
+
+# LUT entries per 8-bit input level, so fractional frame values keep their precision
+LUT_STEPS = 16
+LUT_SIZE = 255 * LUT_STEPS + 1
+
+
+class OutputStage:
+    """Turns a float frame into the 8-bit words sent to the strip.
+
+    One vectorized pass per frame: a per-channel gamma LUT, software
+    brightness, then temporal dithering. The part of each value that doesn't
+    fit in 8 bits is carried to the same pixel's next frame, so a level of
+    2.3 goes out as 2, 2, 2, 3, ... and averages 2.3 instead of banding at 2.
+    Doing brightness here rather than with strip.setBrightness() keeps that
+    precision at low brightness too.
+    """
+
+    def __init__(self, num_pixels, gamma=(1.0, 1.0, 1.0), brightness=255, dither=True):
+        self.brightness = brightness
+        self.dither = dither
+        self._error = np.zeros((num_pixels, 3), dtype=np.float32)
+        self._channel_offsets = np.arange(3, dtype=np.intp) * LUT_SIZE
+        self.set_gamma(gamma)
+
+    def set_gamma(self, gamma):
+        levels = np.linspace(0.0, 1.0, LUT_SIZE)
+        self._lut = np.concatenate([255.0 * levels ** exponent for exponent in gamma]).astype(np.float32)
+
+    def pack(self, pixels, out=None):
+        """Apply gamma, brightness and dithering to an (N, 3) frame and pack it into ``out``."""
+        index = np.clip(pixels * LUT_STEPS + 0.5, 0, LUT_SIZE - 1).astype(np.intp)
+        index += self._channel_offsets
+        values = self._lut[index]
+        if self.brightness < 255:
+            values *= self.brightness / 255.0
+        if self.dither:
+            values += self._error
+            levels = np.floor(values)
+            np.subtract(values, levels, out=self._error)
+        else:
+            levels = np.rint(values)
+        return pack_rgb(levels, out)
@@ -1,7 +1,9 @@
-import time
 import math
-from rpi_ws281x import Color
-from led_operations import set_pixel, get_pixel
+
+import numpy as np
+
+from compositor import blend
+from fastled_math import beat8, beat16, beatsin8, beatsin16, frame_millis, millis, qadd8, scale8, sin8, sin16
 
 pacifica_palette_1 = [
     (0x00, 0x05, 0x07), (0x00, 0x04, 0x09), (0x00, 0x03, 0x0B), (0x00, 0x03, 0x0D),
@@ -24,34 +26,6 @@ pacifica_palette_3 = [
     (0x00, 0x1C, 0x70), (0x00, 0x20, 0x80), (0x10, 0x40, 0xBF), (0x20, 0x60, 0xFF)
 ]
 
-def millis():
-    return int(time.monotonic() * 1000)
-
-def sin16(x):
-    angle = x * (2 * math.pi) / 65536.0
-    return int(math.sin(angle) * 32767)
-
-def sin8(x):
-    angle = x * (2 * math.pi) / 256.0
-    return int(math.sin(angle) * 127) + 128
-
-def beatsin8(bpm, minimum=0, maximum=255, time_base=0, phase_offset=0):
-    beat = ((millis() - time_base) * bpm * 256 // 60000) % 256
-    beat = (beat + phase_offset) % 256
-    amplitude = (maximum - minimum) // 2
-    return minimum + amplitude + ((sin8(beat) - 128) * amplitude) // 127
-
-def beatsin16(bpm, minimum=0, maximum=65535, time_base=0, phase_offset=0):
-    beat = ((millis() - time_base) * bpm * 65536 // 60000) & 0xFFFF
-    beat = (beat + phase_offset) & 0xFFFF
-    sine = sin16(beat)
-    amplitude = (maximum - minimum) // 2
-    return minimum + amplitude + ((sine * amplitude) >> 15)
-
-def beat16(bpm, time_base=0):
-    ms = millis() - time_base
-    return (ms * bpm * 65536) // 60000 % 65536
-
 def color_from_palette(palette, index, brightness, blending=True):
     palette_size = len(palette)
     index = index * (palette_size - 1) / 255.0
@@ -71,59 +45,51 @@ def color_from_palette(palette, index, brightness, blending=True):
     b = (b * brightness) // 255
     return (r, g, b)
 
-def scale8(value, scale):
-    return (value * scale) >> 8
+_palette_luts = {}
 
-def qadd8(a, b):
-    return min(a + b, 255)
+def palette_lut(palette):
+    """color_from_palette at full brightness for all 256 indices, built once per palette."""
+    lut = _palette_luts.get(id(palette))
+    if lut is None:
+        lut = np.array([color_from_palette(palette, i, 255) for i in range(256)], dtype=np.int64)
+        _palette_luts[id(palette)] = lut
+    return lut
 
-def pacifica_one_layer(strip, palette, cistart, wavescale, bri, ioff):
-    num_leds = strip.numPixels()
-    ci = cistart
-    waveangle = ioff
+def pacifica_one_layer(out, palette, cistart, wavescale, bri, ioff):
+    """Render one wave layer into ``out`` with array operations over the whole strip."""
+    steps = np.arange(1, len(out) + 1, dtype=np.int64)
     wavescale_half = (wavescale // 2) + 20
-    for i in range(num_leds):
-        waveangle = (waveangle + 250) % 65536
-        s16 = sin16(waveangle) + 32768
-        cs = ((s16 * wavescale_half) >> 16) + wavescale_half
-        ci = (ci + cs) % 65536
-        sindex16 = sin16(ci) + 32768
-        sindex8 = sindex16 >> 8
-        c = color_from_palette(palette, sindex8, bri)
-        r1, g1, b1 = get_pixel(strip, i)
-        r2, g2, b2 = c
-        r = min(r1 + r2, 255)
-        g = min(g1 + g2, 255)
-        b = min(b1 + b2, 255)
-        set_pixel(strip, i, r, g, b)
+    waveangle = (ioff + 250 * steps) % 65536
+    s16 = sin16(waveangle) + 32768
+    cs = ((s16 * wavescale_half) >> 16) + wavescale_half
+    # ci advances by cs at every LED, so its value at each LED is a running sum
+    ci = (cistart + np.cumsum(cs)) % 65536
+    sindex8 = (sin16(ci) + 32768) >> 8
+    out[:] = (palette_lut(palette)[sindex8] * bri) // 255
 
 def pacifica_add_whitecaps(strip):
     num_leds = strip.numPixels()
     basethreshold = beatsin8(9, 55, 65)
-    wave = ((millis() * 7 * 256) // 60000) % 256
-    for i in range(num_leds):
-        threshold = scale8(sin8(wave), 20) + basethreshold
-        wave = (wave + 7) % 256
-        r, g, b = get_pixel(strip, i)
-        l = (r + g + b) // 3
-        if l > threshold:
-            overage = l - threshold
-            overage2 = qadd8(overage, overage)
-            r = min(r + overage, 255)
-            g = min(g + overage2, 255)
-            b = min(b + qadd8(overage2, overage2), 255)
-            set_pixel(strip, i, r, g, b)
+    wave = beat8(7)
+    waves = (wave + 7 * np.arange(num_leds)) % 256
+    threshold = scale8(sin8(waves), 20) + basethreshold
+    rgb = strip.pixels.astype(np.int64)
+    # Pixels at or below the threshold get an overage of 0, which leaves them unchanged
+    overage = np.maximum(rgb.sum(axis=1) // 3 - threshold, 0)
+    overage2 = qadd8(overage, overage)
+    rgb[:, 0] += overage
+    rgb[:, 1] += overage2
+    rgb[:, 2] += qadd8(overage2, overage2)
+    np.minimum(rgb, 255, out=rgb)
+    strip.pixels[:] = rgb
 
 def pacifica_deepen_colors(strip):
-    num_leds = strip.numPixels()
-    for i in range(num_leds):
-        r, g, b = get_pixel(strip, i)
-        b = scale8(b, 145)
-        g = scale8(g, 200)
-        r = min(r + 2, 255)
-        g = min(g + 5, 255)
-        b = min(b + 7, 255)
-        set_pixel(strip, i, r, g, b)
+    rgb = strip.pixels.astype(np.int64)
+    rgb[:, 2] = scale8(rgb[:, 2], 145)
+    rgb[:, 1] = scale8(rgb[:, 1], 200)
+    rgb += (2, 5, 7)
+    np.minimum(rgb, 255, out=rgb)
+    strip.pixels[:] = rgb
 
 # State variables for pacifica
 pacifica_state = {
@@ -134,9 +100,18 @@ pacifica_state = {
     'sLastms': millis()
 }
 
+def reset_pacifica_state():
+    pacifica_state.update({
+        'sCIStart1': 0,
+        'sCIStart2': 0,
+        'sCIStart3': 0,
+        'sCIStart4': 0,
+        'sLastms': millis()
+    })
+
 def pacifica_step(strip):
     num_leds = strip.numPixels()
-    ms = millis()
+    ms = frame_millis()
     deltams = ms - pacifica_state['sLastms']
     pacifica_state['sLastms'] = ms
 
@@ -155,21 +130,26 @@ def pacifica_step(strip):
     background_g = beatsin8(2, 6, 10)
     background_b = beatsin8(2, 8, 12)
 
-    for i in range(num_leds):
-        set_pixel(strip, i, background_r, background_g, background_b)
-
-    pacifica_one_layer(strip, pacifica_palette_1, pacifica_state['sCIStart1'],
-                       beatsin16(1, 11*256, 14*256), beatsin8(1, 70, 130),
-                       (0 - beat16(3)) % 65536)
-    pacifica_one_layer(strip, pacifica_palette_2, pacifica_state['sCIStart2'],
-                       beatsin16(1, 6*256, 9*256), beatsin8(1, 40, 80),
-                       beat16(4))
-    pacifica_one_layer(strip, pacifica_palette_3, pacifica_state['sCIStart3'],
-                       6*256, beatsin8(1, 10, 38),
-                       (0 - beat16(5)) % 65536)
-    pacifica_one_layer(strip, pacifica_palette_3, pacifica_state['sCIStart4'],
-                       5*256, beatsin8(1, 10, 28),
-                       beat16(6))
+    strip.fill(background_r, background_g, background_b)
+
+    layer_args = [
+        (pacifica_palette_1, pacifica_state['sCIStart1'],
+         beatsin16(1, 11*256, 14*256), beatsin8(1, 70, 130),
+         (0 - beat16(3)) % 65536),
+        (pacifica_palette_2, pacifica_state['sCIStart2'],
+         beatsin16(1, 6*256, 9*256), beatsin8(1, 40, 80),
+         beat16(4)),
+        (pacifica_palette_3, pacifica_state['sCIStart3'],
+         6*256, beatsin8(1, 10, 38),
+         (0 - beat16(5)) % 65536),
+        (pacifica_palette_3, pacifica_state['sCIStart4'],
+         5*256, beatsin8(1, 10, 28),
+         beat16(6)),
+    ]
+    layer = np.empty((num_leds, 3), dtype=np.float32)
+    for args in layer_args:
+        pacifica_one_layer(layer, *args)
+        blend(strip.pixels, layer, "add")
 
     pacifica_add_whitecaps(strip)
     pacifica_deepen_colors(strip)
@@ -0,0 +1,122 @@
+import multiprocessing
+from multiprocessing import shared_memory
+
+import numpy as np
+
+MAX_LAYERS = 4
+
+# Pool used by render_layers/render_ranges; None renders everything in-process
+_active_pool = None
+
+# Per-worker views onto the pool's shared memory, set up by _attach_worker
+_worker_frame = None
+_worker_layers = None
+_worker_memory = None
+
+
+def partition_safe(mode):
+    """Mark an effect step whose heavy work can be split across the render pool.
+
+    ``mode`` is "layers" when the effect renders independent full-strip layers
+    (render_layers) or "ranges" when pixels can be computed per LED range
+    (render_ranges). Kernels must be module-level functions that read only
+    their arguments, since each worker holds its own copy of module state.
+    Effects without this marker (including AI animations, which share
+    ai_state between frames) always render on the effect thread.
+    """
+    def decorate(step):
+        step.partition_mode = mode
+        return step
+    return decorate
+
+
+def _shared_views(buffer, num_pixels, max_layers):
+    frame = np.ndarray((num_pixels, 3), dtype=np.float32, buffer=buffer)
+    layers = np.ndarray(
+        (max_layers, num_pixels, 3), dtype=np.float32, buffer=buffer, offset=frame.nbytes
+    )
+    return frame, layers
+
+
+def _attach_worker(name, num_pixels, max_layers):
+    global _worker_frame, _worker_layers, _worker_memory
+    _worker_memory = shared_memory.SharedMemory(name=name)
+    _worker_frame, _worker_layers = _shared_views(_worker_memory.buf, num_pixels, max_layers)
+
+
+def _run_layer(kernel, slot, args):
+    kernel(_worker_layers[slot], *args)
+
+
+def _run_range(kernel, start, stop, args):
+    kernel(_worker_frame[start:stop], start, stop, *args)
+
+
+class RenderPool:
+    """Persistent worker processes sharing one framebuffer through shared memory.
+
+    ``frame_pixels`` is the shared (N, 3) frame: build the render loop's
+    FrameBuffer on it and range kernels write straight into the pixels the
+    output stage packs, with no copy back. Layer kernels write into separate
+    shared slots that the effect then combines.
+    """
+
+    def __init__(self, workers, num_pixels, max_layers=MAX_LAYERS):
+        self.workers = workers
+        self.num_pixels = num_pixels
+        self.max_layers = max_layers
+        size = (1 + max_layers) * num_pixels * 3 * np.dtype(np.float32).itemsize
+        self.memory = shared_memory.SharedMemory(create=True, size=size)
+        self.frame_pixels, self.layers = _shared_views(self.memory.buf, num_pixels, max_layers)
+        self.frame_pixels.fill(0.0)
+        # Fork now, before the server starts its own threads
+        self.pool = multiprocessing.get_context("fork").Pool(
+            workers, initializer=_attach_worker, initargs=(self.memory.name, num_pixels, max_layers)
+        )
+
+    def owns(self, pixels):
+        return pixels is self.frame_pixels
+
+    def map_layers(self, kernel, layer_args):
+        tasks = [(kernel, slot, args) for slot, args in enumerate(layer_args)]
+        self.pool.starmap(_run_layer, tasks)
+        return [self.layers[slot] for slot in range(len(tasks))]
+
+    def map_ranges(self, kernel, args):
+        bounds = np.linspace(0, self.num_pixels, self.workers + 1).astype(int)
+        tasks = [(kernel, int(start), int(stop), args) for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+        self.pool.starmap(_run_range, tasks)
+
+    def close(self):
+        self.pool.terminate()
+        self.pool.join()
+        del self.frame_pixels, self.layers
+        self.memory.close()
+        self.memory.unlink()
+
+
+def set_render_pool(pool):
+    global _active_pool
+    _active_pool = pool
+
+
+def render_layers(kernel, layer_args, num_pixels):
+    """Render one (num_pixels, 3) layer per entry of ``layer_args`` with kernel(out, *args)."""
+    pool = _active_pool
+    if pool is not None and pool.num_pixels == num_pixels and len(layer_args) <= pool.max_layers:
+        return pool.map_layers(kernel, layer_args)
+    layers = []
+    for args in layer_args:
+        layer = np.zeros((num_pixels, 3), dtype=np.float32)
+        kernel(layer, *args)
+        layers.append(layer)
+    return layers
+
+
+def render_ranges(frame, kernel, *args):
+    """Fill frame.pixels with kernel(out, start, stop, *args), split by LED range across the pool."""
+    pool = _active_pool
+    if pool is not None and pool.owns(frame.pixels):
+        pool.map_ranges(kernel, args)
+    else:
+        kernel(frame.pixels, 0, len(frame.pixels), *args)
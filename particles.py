@@ -0,0 +1,142 @@
+"""Struct-of-arrays particle storage and vectorized rasterizers.
+
+A ParticlePool keeps one preallocated numpy array per field, with the live
+particles packed at the front. Effects spawn with one call per batch, move
+every particle with whole-array arithmetic, and cull with a boolean mask.
+The rasterizers add glows, rings and single points for all particles of a
+kind at once.
+
+Rasterizers add into an (N, 3) float frame and never clamp. Each particle's
+contribution is truncated to a whole 0-255 color first, like scale_color(),
+and all of them are non-negative, so clamping the frame once at the end gives
+the same result as clamping after every addition.
+"""
+
+import numpy as np
+
+
+class ParticlePool:
+    """Fixed-width columns for one kind of particle.
+
+    ``fields`` maps a name to its width: 1 for a scalar per particle, 3 for a
+    color. Arrays start at ``capacity`` rows and double when a spawn does not
+    fit, so a steady stream of particles never reallocates.
+    """
+
+    def __init__(self, capacity=32, **fields):
+        self.count = 0
+        self.widths = fields
+        self._arrays = {name: self._column(capacity, width) for name, width in fields.items()}
+
+    @staticmethod
+    def _column(rows, width):
+        return np.zeros((rows,) if width == 1 else (rows, width), dtype=np.float64)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, name):
+        """View of the live particles' ``name`` column; writes go into the pool."""
+        return self._arrays[name][: self.count]
+
+    def __setitem__(self, name, values):
+        self._arrays[name][: self.count] = values
+
+    def _reserve(self, needed):
+        capacity = len(next(iter(self._arrays.values())))
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name, array in self._arrays.items():
+            grown = self._column(capacity, self.widths[name])
+            grown[: self.count] = array[: self.count]
+            self._arrays[name] = grown
+
+    def spawn(self, count=1, **values):
+        """Append ``count`` particles. Values may be scalars, colors or per-particle arrays;
+        fields that are not given start at zero."""
+        start = self.count
+        self._reserve(start + count)
+        for name, array in self._arrays.items():
+            array[start : start + count] = values.get(name, 0.0)
+        self.count = start + count
+
+    def cull(self, keep):
+        """Keep only the live particles where the boolean ``keep`` is true, in order."""
+        kept = int(np.count_nonzero(keep))
+        if kept == self.count:
+            return
+        for array in self._arrays.values():
+            array[:kept] = array[: self.count][keep]
+        self.count = kept
+
+    def clear(self):
+        self.count = 0
+
+
+def scale_colors(colors, factors):
+    """scale_color() for many colors at once: ``colors * factors`` truncated to 0-255."""
+    return np.clip(np.floor(colors * np.asarray(factors)[..., None]), 0.0, 255.0)
+
+
+def _windows(num_pixels, centers, extents):
+    """Pixel indices within ``extents`` (+1) of each center, one row per particle."""
+    starts = np.maximum(0, np.floor(centers - extents - 1)).astype(np.intp)
+    ends = np.minimum(num_pixels - 1, np.ceil(centers + extents + 1)).astype(np.intp)
+    width = max(0, int((ends - starts).max()) + 1)
+    index = starts[:, None] + np.arange(width)
+    return index, index <= ends[:, None]
+
+
+def _deposit(pixels, index, mask, contributions):
+    index = index[mask]
+    if not len(index):
+        return
+    amounts = np.clip(np.floor(contributions[mask]), 0.0, 255.0)
+    num_pixels = len(pixels)
+    for channel in range(3):
+        pixels[:, channel] += np.bincount(index, weights=amounts[:, channel], minlength=num_pixels)
+
+
+def add_glows(pixels, centers, radii, colors, falloff=1.7):
+    """Add a soft glow per particle: ``color * (1 - distance / radius) ** falloff``."""
+    centers = np.asarray(centers, dtype=np.float64)
+    if not len(centers):
+        return
+    radii = np.broadcast_to(np.asarray(radii, dtype=np.float64), centers.shape)
+    falloff = np.broadcast_to(np.asarray(falloff, dtype=np.float64), centers.shape)
+    safe_radii = np.maximum(0.001, radii)[:, None]
+    index, mask = _windows(len(pixels), centers, radii)
+    distance = np.abs(index - centers[:, None])
+    mask &= distance <= safe_radii
+    distance = np.where(mask, distance, safe_radii)
+    strength = (1.0 - distance / safe_radii) ** falloff[:, None]
+    colors = np.broadcast_to(np.asarray(colors, dtype=np.float64), centers.shape + (3,))
+    _deposit(pixels, index, mask, colors[:, None, :] * strength[..., None])
+
+
+def add_rings(pixels, centers, radii, widths, colors, strengths=1.0):
+    """Add a ring per particle: pixels ``radius`` away from the center, fading over ``width``."""
+    centers = np.asarray(centers, dtype=np.float64)
+    if not len(centers):
+        return
+    radii = np.broadcast_to(np.asarray(radii, dtype=np.float64), centers.shape)
+    widths = np.broadcast_to(np.asarray(widths, dtype=np.float64), centers.shape)[:, None]
+    strengths = np.broadcast_to(np.asarray(strengths, dtype=np.float64), centers.shape)[:, None]
+    index, mask = _windows(len(pixels), centers, radii + widths[:, 0])
+    ring_distance = np.abs(np.abs(index - centers[:, None]) - radii[:, None])
+    mask &= ring_distance <= widths
+    strength = (1.0 - ring_distance / np.maximum(0.001, widths)) * strengths
+    colors = np.broadcast_to(np.asarray(colors, dtype=np.float64), centers.shape + (3,))
+    _deposit(pixels, index, mask, colors[:, None, :] * strength[..., None])
+
+
+def add_points(pixels, indices, colors, mask=None):
+    """Add ``colors`` at integer pixel ``indices`` (any shape); off-strip points are skipped."""
+    indices = np.asarray(indices, dtype=np.intp)
+    inside = (indices >= 0) & (indices < len(pixels))
+    if mask is not None:
+        inside &= mask
+    colors = np.broadcast_to(np.asarray(colors, dtype=np.float64), indices.shape + (3,))
+    _deposit(pixels, indices, inside, colors)
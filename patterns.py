@@ -0,0 +1,117 @@
+"""Table-driven versions of the pattern effects in animations.py.
+
+Each of these is a closed-form function of (LED index, step), so a frame is
+a lookup into a precomputed table at shifted indices plus a couple of slice
+assignments. They share the state dicts of the originals in animations.py,
+which stay as the per-pixel reference: both produce the same frames.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from animations import (
+    cylon_state,
+    rainbow_cycle_state,
+    running_lights_state,
+    theater_chase_rainbow_state,
+    theater_chase_state,
+    wheel_step_state,
+)
+
+
+def _wheel_lut():
+    pos = np.arange(256)
+    rising = np.where(pos < 85, pos, np.where(pos < 170, pos - 85, pos - 170)) * 3
+    falling = 255 - rising
+    zero = np.zeros(256, dtype=np.int64)
+    red = np.select([pos < 85, pos < 170], [rising, falling], zero)
+    green = np.select([pos < 85, pos < 170], [falling, zero], rising)
+    blue = np.select([pos < 85, pos < 170], [zero, rising], falling)
+    return np.stack((red, green, blue), axis=1).astype(np.float32)
+
+
+# The classic 0-255 color wheel: red -> green -> blue -> red
+WHEEL_LUT = _wheel_lut()
+
+
+def _clamped(*channels):
+    return np.clip(np.floor(np.array(channels, dtype=np.float64)), 0, 255)
+
+
+@lru_cache(maxsize=8)
+def _rainbow_offsets(num_leds):
+    return np.arange(num_leds) * 256 // num_leds
+
+
+@lru_cache(maxsize=8)
+def _gradient_lut(c1, c2, step):
+    ratio = np.arange(step) / step
+    lut = np.array(c1, dtype=np.float64) * (1 - ratio)[:, None] + np.array(c2, dtype=np.float64) * ratio[:, None]
+    return np.clip(np.floor(lut), 0, 255).astype(np.float32)
+
+
+def rainbow_cycle_step(strip):
+    st = rainbow_cycle_state
+    strip.pixels[:] = WHEEL_LUT[(_rainbow_offsets(strip.numPixels()) + st["step"]) & 255]
+    st["step"] += 1
+
+
+def theater_chase_step(strip, red, green, blue):
+    st = theater_chase_state
+    pixels = strip.pixels
+    pixels.fill(0.0)
+    pixels[st["index"] :: 3] = _clamped(red, green, blue)
+    st["index"] = (st["index"] + 1) % 3
+
+
+def theater_chase_rainbow_step(strip):
+    st = theater_chase_rainbow_state
+    pixels = strip.pixels
+    offset = st["index"]
+    pixels.fill(0.0)
+    pixels[offset::3] = WHEEL_LUT[(np.arange(offset, len(pixels), 3) + st["step"]) & 255]
+
+    st["index"] = (st["index"] + 1) % 3
+    if st["index"] == 0:
+        st["step"] += 1
+
+
+def running_lights_step(strip, red, green, blue):
+    st = running_lights_state
+    phase = np.arange(st["position"], st["position"] + strip.numPixels()) / 10.0
+    ratio = ((np.sin(phase) + 1) * 127.5) / 255.0
+    strip.pixels[:] = np.clip(np.floor(np.multiply.outer(ratio, (red, green, blue))), 0, 255)
+    st["position"] += 1
+
+
+def wheel_step(strip, c1=(255, 0, 0), c2=(0, 255, 0), step=500):
+    st = wheel_step_state
+    lut = _gradient_lut(tuple(c1), tuple(c2), step)
+    strip.pixels[:] = np.take(lut, np.arange(st["pos"], st["pos"] + strip.numPixels()), axis=0, mode="wrap")
+    st["pos"] += 1
+
+
+def cylon_bounce_step(strip, red, green, blue, eye_size, speed_delay, return_delay):
+    st = cylon_state
+    pixels = strip.pixels
+    num_leds = len(pixels)
+    pos = st["pos"]
+    pixels.fill(0.0)
+    dim = _clamped(red // 10, green // 10, blue // 10)
+    if 0 <= pos < num_leds:
+        pixels[pos] = dim
+    pixels[max(0, pos + 1) : pos + eye_size + 1] = _clamped(red, green, blue)
+    if 0 <= pos + eye_size + 1 < num_leds:
+        pixels[pos + eye_size + 1] = dim
+
+    if st["forward"]:
+        if pos < num_leds - eye_size - 2:
+            st["pos"] += 1
+        else:
+            st["forward"] = False
+    else:
+        if pos > 0:
+            st["pos"] -= 1
+        else:
+            st["forward"] = True
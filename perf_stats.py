@@ -0,0 +1,71 @@
+import numpy as np
+
+PERF_FIELDS = ("render", "show", "lock_wait", "slack")
+# Histogram bucket edges in ms; the last bucket collects everything slower
+HISTOGRAM_EDGES_MS = (0.0, 1.0, 2.0, 4.0, 6.0, 8.0, 10.0, 12.0, 15.0, 20.0, 25.0, 30.0, 40.0, 50.0)
+DEFAULT_CAPACITY = 500
+
+
+class FrameTimings:
+    """Fixed-size ring buffer of per-frame timings for one effect.
+
+    Storage is allocated once up front, so record() only writes four floats
+    into preallocated arrays and never grows anything while the strip runs.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.samples = {field: np.zeros(capacity, dtype=np.float64) for field in PERF_FIELDS}
+        self.count = 0
+        self.index = 0
+
+    def record(self, render, show, lock_wait, slack):
+        i = self.index
+        samples = self.samples
+        samples["render"][i] = render
+        samples["show"][i] = show
+        samples["lock_wait"][i] = lock_wait
+        samples["slack"][i] = slack
+        self.index = (i + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def summary(self):
+        """Percentiles and histograms (all in ms) over the frames currently in the buffer."""
+        result = {"frames": self.count, "histogram_edges_ms": list(HISTOGRAM_EDGES_MS)}
+        if not self.count:
+            return result
+        edges = np.array(HISTOGRAM_EDGES_MS + (np.inf,))
+        for field in PERF_FIELDS:
+            values = self.samples[field][:self.count] * 1000.0
+            p50, p95, p99 = np.percentile(values, (50, 95, 99))
+            stats = {
+                "mean": round(float(values.mean()), 3),
+                "p50": round(float(p50), 3),
+                "p95": round(float(p95), 3),
+                "p99": round(float(p99), 3),
+                "max": round(float(values.max()), 3),
+            }
+            if field != "slack":
+                stats["histogram"] = np.histogram(values, bins=edges)[0].tolist()
+            result[field] = stats
+        return result
+
+
+class PerfRegistry:
+    """FrameTimings per effect key, created the first time an effect runs."""
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self.timings = {}
+
+    def timings_for(self, key):
+        if key not in self.timings:
+            self.timings[key] = FrameTimings(self.capacity)
+        return self.timings[key]
+
+    def summary(self, key=None):
+        if key is not None:
+            timings = self.timings.get(key)
+            return {key: timings.summary()} if timings else {}
+        return {name: timings.summary() for name, timings in list(self.timings.items())}
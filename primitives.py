@@ -0,0 +1,107 @@
+"""Soft shapes drawn onto a strip with one array operation each.
+
+Every primitive works out the weight of the shape on each pixel it touches,
+then combines ``color * weight`` with the pixels under it in one slice:
+
+    "add"   add, saturating at 255 (light on light, the default)
+    "max"   keep the brighter of the two
+    "over"  blend toward the color by the weight (coverage)
+    "set"   replace the covered pixels
+
+Positions are fractional and pixel i sits at coordinate i, so a shape
+between two pixels lights both in proportion and moves smoothly at any
+speed. Levels are left fractional; the output stage dithers them.
+``color`` is an (r, g, b) tuple, or one color per pixel of the window.
+These take the strip (or frame) an effect is handed, so AI animations can
+use them as well; particles.py has the batched equivalents for effects
+that draw many shapes of a kind at once.
+"""
+
+import math
+
+import numpy as np
+
+BLEND_MODES = ("add", "max", "over", "set")
+
+
+def _window(num_pixels, lo, hi):
+    """Integer pixel range [start, stop) covering coordinates lo..hi, clipped to the strip."""
+    return max(0, math.floor(lo)), min(num_pixels, math.ceil(hi) + 1)
+
+
+def apply_weights(strip, start, weights, color, mode="add"):
+    """Combine ``color * weights`` with the pixels from ``start`` on; the building block of the shapes below."""
+    if mode not in BLEND_MODES:
+        raise ValueError(f"Unknown blend mode {mode!r}; expected one of {', '.join(BLEND_MODES)}")
+    weights = np.asarray(weights, dtype=np.float32)
+    segment = strip.pixels[start : start + len(weights)]
+    weights = weights[: len(segment), None]
+    color = np.asarray(color, dtype=np.float32)
+    if color.ndim == 2:
+        color = color[: len(segment)]
+    layer = color * weights
+    if mode == "add":
+        np.minimum(segment + layer, 255.0, out=segment)
+    elif mode == "max":
+        np.maximum(segment, layer, out=segment)
+    elif mode == "over":
+        segment += (color - segment) * weights
+    else:
+        covered = weights[:, 0] > 0
+        segment[covered] = np.broadcast_to(layer, segment.shape)[covered]
+
+
+def draw_glow(strip, center, radius, color, falloff=1.0, mode="add"):
+    """A soft blob: ``(1 - distance / radius) ** falloff``. Radius 1 is a single anti-aliased dot."""
+    radius = max(float(radius), 1e-6)
+    start, stop = _window(strip.numPixels(), center - radius, center + radius)
+    if stop <= start:
+        return
+    distance = np.abs(np.arange(start, stop) - center)
+    weights = np.clip(1.0 - distance / radius, 0.0, 1.0) ** falloff
+    apply_weights(strip, start, weights, color, mode)
+
+
+def draw_ring(strip, center, radius, width, color, mode="add"):
+    """Both edges of a circle around ``center``: pixels ``radius`` away, fading out over ``width``."""
+    width = max(float(width), 1e-6)
+    start, stop = _window(strip.numPixels(), center - radius - width, center + radius + width)
+    if stop <= start:
+        return
+    ring_distance = np.abs(np.abs(np.arange(start, stop) - center) - radius)
+    weights = np.clip(1.0 - ring_distance / width, 0.0, 1.0)
+    apply_weights(strip, start, weights, color, mode)
+
+
+def draw_trail(strip, head, length, color, direction=1, falloff=2.0, mode="add"):
+    """A comet moving in ``direction`` (+1/-1): full color at ``head`` fading over ``length`` pixels
+    behind it, with the leading edge anti-aliased onto the next pixel."""
+    length = max(float(length), 1e-6)
+    tail = head - direction * length
+    start, stop = _window(strip.numPixels(), min(head, tail) - 1, max(head, tail) + 1)
+    if stop <= start:
+        return
+    behind = (head - np.arange(start, stop)) * direction
+    weights = np.where(
+        behind >= 0,
+        np.clip(1.0 - behind / length, 0.0, 1.0) ** falloff,
+        np.clip(1.0 + behind, 0.0, 1.0),
+    )
+    apply_weights(strip, start, weights, color, mode)
+
+
+def draw_gradient(strip, start, end, color_a, color_b, mode="over"):
+    """A span from ``start`` to ``end`` shading from ``color_a`` to ``color_b``; pixels the
+    ends only partly cover are weighted by how much of them lies inside."""
+    if end < start:
+        start, end = end, start
+        color_a, color_b = color_b, color_a
+    first, stop = _window(strip.numPixels(), start - 0.5, end + 0.5)
+    if stop <= first:
+        return
+    index = np.arange(first, stop)
+    coverage = np.clip(np.minimum(index + 0.5, end) - np.maximum(index - 0.5, start), 0.0, 1.0)
+    ratio = np.clip((index - start) / (end - start), 0.0, 1.0) if end > start else np.zeros(len(index))
+    color_a = np.asarray(color_a, dtype=np.float32)
+    colors = color_a + np.multiply.outer(ratio, np.asarray(color_b, dtype=np.float32) - color_a)
+    apply_weights(strip, first, coverage, colors, mode)
@@ -0,0 +1,102 @@
+import time
+from collections import deque
+from threading import Condition, Lock, Thread
+
+import numpy as np
+
+from framebuffer import FrameBuffer
+from strip_output import pack_rgb, push_words
+
+
+class OutputPipeline:
+    """Two-stage render/output pipeline.
+
+    The render thread packs each finished frame into one of two word buffers
+    and hands over its index; an output thread pushes that buffer and calls
+    strip.show() while the next frame renders. Packing is the only copy the
+    pipeline makes, and the handoff itself just moves a buffer index. When
+    both buffers are busy, submit() blocks until the older one is on the wire.
+    With an OutputStage, packing also applies its gamma, brightness and dither.
+    submit() also keeps a copy of the finished frame's logical colors for
+    previews, since the render target itself is redrawn while they read.
+    """
+
+    def __init__(self, strip, strip_lock, num_pixels, stage=None):
+        self.strip = strip
+        self.strip_lock = strip_lock
+        self.stage = stage
+        self.buffers = [np.zeros(num_pixels, dtype=np.uint32) for _ in range(2)]
+        self.last_show_seconds = 0.0
+        self.last_lock_wait_seconds = 0.0
+        self._last_frame = np.zeros((num_pixels, 3), dtype=np.float32)
+        self._last_frame_lock = Lock()
+        self._free = [0, 1]
+        self._pending = deque()
+        self._cond = Condition()
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, frame):
+        """Queue ``frame`` for output. Returns the seconds spent waiting for a free buffer."""
+        start = time.monotonic()
+        with self._cond:
+            while not self._free:
+                self._cond.wait()
+            index = self._free.pop()
+        waited = time.monotonic() - start
+
+        with self._last_frame_lock:
+            self._last_frame[:] = frame.pixels
+        if self.stage is not None:
+            self.stage.pack(frame.pixels, out=self.buffers[index])
+        else:
+            pack_rgb(frame.pixels, out=self.buffers[index])
+        with self._cond:
+            self._pending.append(index)
+            self._cond.notify_all()
+        return waited
+
+    def last_frame(self):
+        """Copy of the most recently submitted frame, before the output stage."""
+        with self._last_frame_lock:
+            return self._last_frame.copy()
+
+    def drain(self):
+        """Block until every submitted frame has been shown."""
+        with self._cond:
+            while len(self._free) < len(self.buffers):
+                self._cond.wait()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                index = self._pending.popleft()
+
+            start = time.monotonic()
+            with self.strip_lock:
+                locked = time.monotonic()
+                push_words(self.strip, self.buffers[index])
+                self.strip.show()
+            self.last_lock_wait_seconds = locked - start
+            self.last_show_seconds = time.monotonic() - locked
+
+            with self._cond:
+                self._free.append(index)
+                self._cond.notify_all()
+
+
+class PipelineFrame(FrameBuffer):
+    """FrameBuffer whose show() submits it to an OutputPipeline.
+
+    For code that draws and shows by itself outside a render loop (static
+    mode), so its frames still go through the pipeline's output stage.
+    """
+
+    def __init__(self, num_pixels, pipeline):
+        super().__init__(num_pixels)
+        self.pipeline = pipeline
+
+    def show(self):
+        self.pipeline.submit(self)
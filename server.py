@@ -1,12 +1,11 @@
 import asyncio
 import functools
+import inspect
 import json
 import logging
 import time
 from threading import Event, Lock, Thread
 
-from rpi_ws281x import PixelStrip
-
 from ai_animations import (
     generate_animation,
     edit_animation,
@@ -20,14 +19,44 @@ from ai_animations import (
     validate_code,
 )
 from animations import *
-from fire import fire_step
+from compositor import Compositor, Layer
+from fastled_math import begin_frame, end_frame
+from effect_instance import EffectInstance, effect_state
+from fire import fire_state, fire_step
+from frame_scheduler import FrameScheduler
+from frame_cache import FrameCache
+from framebuffer import FrameBuffer
 from game_mode import ZombieGameMode
-from halloween_scene import halloween_scene_step, reset_halloween_scene_state
-from led_operations import fill_all, get_pixel, set_pixel
-from pacifica import pacifica_step
+from halloween_scene import halloween_scene_state, halloween_scene_step, reset_halloween_scene_state
+from led_operations import fill_all, set_pixel
+from led_strip import create_strip
+from pacifica import pacifica_state, pacifica_step, reset_pacifica_state
+from parallel_render import RenderPool, set_render_pool
+from patterns import (
+    rainbow_cycle_step,
+    running_lights_step,
+    theater_chase_rainbow_step,
+    theater_chase_step,
+    wheel_step,
+)
+from perf_stats import PerfRegistry
+from output_stage import OutputStage
+from render_pipeline import OutputPipeline, PipelineFrame
 from static_mode import StaticMode
-from xmas_scene import reset_xmas_scene_state, xmas_scene_step
-from config import LED_COUNT, LED_GPIO_PIN, LED_FREQ_HZ, LED_DMA, LED_BRIGHTNESS, LED_INVERT, LED_CHANNEL
+from transitions import TRANSITION_KINDS, Transition
+from xmas_scene import reset_xmas_scene_state, xmas_scene_state, xmas_scene_step
+from zones import ZoneEngine
+from config import (
+    LED_BACKEND,
+    LED_BRIGHTNESS,
+    LED_COUNT,
+    LED_DITHER,
+    LED_GAMMA,
+    RENDER_WORKERS,
+    TARGET_FPS,
+    TRANSITION_KIND,
+    TRANSITION_SECONDS,
+)
 
 try:
     import websockets
@@ -45,7 +74,9 @@ log = logging.getLogger("smart-led")
 
 
 BALL_COUNT_MIN = 1
-BALL_COUNT_MAX = 12
+BALL_COUNT_MAX = 256
+METEOR_COUNT_MIN = 1
+METEOR_COUNT_MAX = 8
 
 effect_stop_event = Event()
 strip_lock = Lock()
@@ -54,16 +85,39 @@ server_loop = None
 selected_effect = -1
 current_mode = "animation"
 current_effect_thread = None
+frame_scheduler = FrameScheduler(TARGET_FPS)
+perf_registry = PerfRegistry()
+current_perf_key = None
 animations_enabled = True
 current_brightness = LED_BRIGHTNESS
+transition_config = {"kind": TRANSITION_KIND, "seconds": TRANSITION_SECONDS}
+# Effect definition the running render loop should transition to next
+pending_switch = None
+switch_lock = Lock()
 
-# Set up the LED strip
-strip = PixelStrip(LED_COUNT, LED_GPIO_PIN, LED_FREQ_HZ, LED_DMA, LED_INVERT, LED_BRIGHTNESS, LED_CHANNEL)
-strip.begin()
+# Render workers fork first, before the strip and any threads exist
+render_pool = None
+if RENDER_WORKERS > 0:
+    render_pool = RenderPool(RENDER_WORKERS, LED_COUNT)
+    set_render_pool(render_pool)
 
-# Initialize static mode handler
-static_mode = StaticMode(strip)
+# Set up the LED strip
+strip = create_strip()
+
+# Effects render into this frame; run_animation hands it to the output pipeline once per frame.
+# With render workers it lives in shared memory so they can write into it directly.
+frame = FrameBuffer(LED_COUNT, pixels=render_pool.frame_pixels if render_pool else None)
+# Gamma, brightness and dithering happen in software as frames are packed, so the
+# hardware brightness stays at full scale
+output_stage = OutputStage(LED_COUNT, gamma=LED_GAMMA, brightness=LED_BRIGHTNESS, dither=LED_DITHER)
+strip.setBrightness(255)
+output_pipeline = OutputPipeline(strip, strip_lock, LED_COUNT, stage=output_stage)
+
+# Initialize static mode handler; it draws into its own frame and shows it through the pipeline
+static_frame = PipelineFrame(LED_COUNT, output_pipeline)
+static_mode = StaticMode(static_frame)
 zombie_game = ZombieGameMode(LED_COUNT)
+zone_engine = ZoneEngine(LED_COUNT)
 
 # Connected WebSocket clients
 connected_clients = set()
@@ -74,6 +128,7 @@ animation_config = {
     "color_wipe": {"color": (0, 255, 0)},
     "theater_chase": {"color": (255, 0, 0)},
     "bouncing_balls": {"count": 3},
+    "meteor_rain": {"count": 1},
 }
 
 # AI-generated animation state
@@ -106,112 +161,174 @@ def bouncing_balls_current_step(active_strip):
 
 
 def meteor_current_step(active_strip):
-    meteor_rain_step(active_strip, 255, 255, 255, 8, 60, False, 30)
+    meteor_rain_step(
+        active_strip, 255, 255, 255, 8, 60, False, 30, animation_config["meteor_rain"]["count"]
+    )
 
 
 def game_current_step(active_strip):
     zombie_game.step(active_strip)
 
 
+def wheel_period(*args):
+    """The gradient repeats every ``step`` frames, whether passed or left at its default."""
+    bound = inspect.signature(wheel_step).bind(None, *args)
+    bound.apply_defaults()
+    return bound.arguments["step"]
+
+
+# Periodic effects replay a recorded cycle instead of re-rendering it
+rainbow_cycle_loop = FrameCache(rainbow_cycle_step, period=256)
+color_wheel_loop = FrameCache(wheel_step, period=wheel_period)
+theater_chase_loop = FrameCache(
+    theater_chase_current_step,
+    period=3,
+    key=lambda: animation_config["theater_chase"]["color"],
+)
+theater_chase_rainbow_loop = FrameCache(theater_chase_rainbow_step, period=3 * 256)
+meteor_loop = FrameCache(meteor_current_step, key=lambda: animation_config["meteor_rain"]["count"])
+FRAME_CACHES = [rainbow_cycle_loop, color_wheel_loop, theater_chase_loop, theater_chase_rainbow_loop, meteor_loop]
+
+
+# Snow sparkles added over fire: one blend per layer instead of a per-pixel read-modify-write
+fire_snow = Compositor([
+    Layer({"step": fire_step, "state": effect_state(fire_state)}, "alpha"),
+    Layer({"step": snow_sparkle_step, "args": (0, 0, 0), "state": effect_state(snow_sparkle_state)}, "add"),
+])
+
+
 EFFECT_DEFINITIONS = [
     {
         "key": "fade_in_out",
         "name": "Fade In Out (Red)",
-        "runner": lambda: start_effect(fade_in_out_step, 255, 0, 0),
+        "step": fade_in_out_step,
+        "state": effect_state(fade_in_out_state),
+        "args": (255, 0, 0),
     },
     {
         "key": "pacifica",
         "name": "Pacifica",
-        "runner": lambda: start_effect(pacifica_step),
+        "step": pacifica_step,
+        "state": effect_state(pacifica_state),
+        "reset": reset_pacifica_state,
     },
     {
         "key": "color_wheel",
         "name": "Color Wheel",
-        "runner": lambda: start_effect(wheel_step, (255, 0, 0), (0, 255, 0), 500),
+        "step": color_wheel_loop.render,
+        "state": effect_state(wheel_step_state, color_wheel_loop.state),
+        "args": ((255, 0, 0), (0, 255, 0), 500),
     },
     {
         "key": "halloween_scene",
         "name": "Halloween Scene",
-        "runner": lambda: start_effect(halloween_scene_step),
+        "step": halloween_scene_step,
+        "state": effect_state(halloween_scene_state),
     },
     {
         "key": "split_cyclones",
         "name": "Split Cyclones",
-        "runner": lambda: start_effect(split_cyclones_step),
+        "step": split_cyclones_step,
+        "state": effect_state(split_cyclones_state),
     },
     {
         "key": "twinkle_red",
         "name": "Twinkle (Red)",
-        "runner": lambda: start_effect(twinkle_step, 255, 0, 0, 10, False),
+        "step": twinkle_step,
+        "state": effect_state(twinkle_state),
+        "args": (255, 0, 0, 10, False),
     },
     {
         "key": "twinkle_random",
         "name": "Twinkle Random",
-        "runner": lambda: start_effect(twinkle_random_step, 300, False),
+        "step": twinkle_random_step,
+        "state": effect_state(twinkle_random_state),
+        "args": (300, False),
     },
     {
         "key": "sparkle",
         "name": "Eiffel Sparkle",
-        "runner": lambda: start_effect(sparkle_step, 255, 255, 255),
+        "step": sparkle_step,
+        "state": effect_state(sparkle_state),
+        "args": (255, 255, 255),
     },
     {
         "key": "snow_sparkle",
         "name": "Snow Sparkle",
-        "runner": lambda: start_effect(snow_sparkle_step, 16, 16, 16),
+        "step": snow_sparkle_step,
+        "state": effect_state(snow_sparkle_state),
+        "args": (16, 16, 16),
     },
     {
         "key": "running_lights",
         "name": "Running Lights",
-        "runner": lambda: start_effect(running_lights_current_step),
+        "step": running_lights_current_step,
+        "state": effect_state(running_lights_state),
         "supports_color": True,
     },
     {
         "key": "color_wipe",
         "name": "Color Wipe",
-        "runner": lambda: start_effect(color_wipe_current_step),
+        "step": color_wipe_current_step,
+        "state": effect_state(color_wipe_state),
         "supports_color": True,
     },
     {
         "key": "rainbow_cycle",
         "name": "Rainbow Cycle",
-        "runner": lambda: start_effect(rainbow_cycle_step),
+        "step": rainbow_cycle_loop.render,
+        "state": effect_state(rainbow_cycle_state, rainbow_cycle_loop.state),
     },
     {
         "key": "theater_chase",
         "name": "Theater Chase",
-        "runner": lambda: start_effect(theater_chase_current_step),
+        "step": theater_chase_loop.render,
+        "state": effect_state(theater_chase_state, theater_chase_loop.state),
         "supports_color": True,
     },
     {
         "key": "theater_chase_rainbow",
         "name": "Theater Chase Rainbow",
-        "runner": lambda: start_effect(theater_chase_rainbow_step),
+        "step": theater_chase_rainbow_loop.render,
+        "state": effect_state(theater_chase_rainbow_state, theater_chase_rainbow_loop.state),
     },
     {
         "key": "fire",
         "name": "Fire",
-        "runner": lambda: start_effect(fire_step),
+        "step": fire_step,
+        "state": effect_state(fire_state),
     },
     {
         "key": "bouncing_balls",
         "name": "Bouncing Balls",
-        "runner": lambda: start_effect(bouncing_balls_current_step),
+        "step": bouncing_balls_current_step,
+        "state": effect_state(bouncing_balls_state),
         "supports_ball_count": True,
     },
     {
         "key": "meteor_rain",
         "name": "Meteor Rain",
-        "runner": lambda: start_effect(meteor_current_step),
+        "step": meteor_loop.render,
+        "state": effect_state(meteor_rain_state, meteor_loop.state),
+        "supports_meteor_count": True,
     },
     {
         "key": "death_show",
         "name": "Death Show",
-        "runner": lambda: start_effect(death_show_step),
+        "step": death_show_step,
+        "state": effect_state(death_show_state),
     },
     {
         "key": "christmas_scene",
         "name": "Christmas Scene",
-        "runner": lambda: start_effect(xmas_scene_step),
+        "step": xmas_scene_step,
+        "state": effect_state(xmas_scene_state),
+    },
+    {
+        "key": "fire_snow",
+        "name": "Fire + Snow",
+        "step": fire_snow.render,
+        "state": effect_state(fire_snow.state),
     },
 ]
 
@@ -232,6 +349,7 @@ def rebuild_effect_catalog():
             "name": effect["name"],
             "supports_color": bool(effect.get("supports_color")),
             "supports_ball_count": bool(effect.get("supports_ball_count")),
+            "supports_meteor_count": bool(effect.get("supports_meteor_count")),
             "is_ai_generated": bool(effect.get("is_ai_generated")),
             "ai_id": effect.get("ai_id"),
         }
@@ -246,13 +364,16 @@ def rebuild_ai_effects():
     AI_EFFECT_DEFINITIONS = []
     for anim in saved:
         try:
-            step_fn, _state = compile_ai_animation(anim["code"])
+            step_fn, ai_state = compile_ai_animation(anim["code"])
         except Exception:
             continue
+        # Most AI animations follow the clock; the cache only locks on if the frames really repeat
+        loop = FrameCache(step_fn)
         AI_EFFECT_DEFINITIONS.append({
             "key": f"ai_{anim['id']}",
             "name": f"AI: {anim['name']}",
-            "runner": lambda fn=step_fn: start_effect(fn),
+            "step": loop.render,
+            "state": effect_state(ai_state, loop.state),
             "supports_color": False,
             "supports_ball_count": False,
             "is_ai_generated": True,
@@ -271,10 +392,10 @@ def current_effect_definition():
 def reset_states():
     fade_in_out_state.update({"direction": 1, "brightness": 0})
     running_lights_state.update({"position": 0})
-    twinkle_state.update({"pixels": []})
-    twinkle_random_state.update({"used_indices": []})
-    sparkle_state.update({"initialized": False, "flash_levels": []})
-    snow_sparkle_state.update({"pixels": [], "timer": 0, "base_color": (16, 16, 16)})
+    twinkle_state.update({"pixels": [], "rng": None})
+    twinkle_random_state.update({"used_indices": [], "rng": None})
+    sparkle_state.update({"initialized": False, "flash_levels": [], "rng": None})
+    snow_sparkle_state.update({"pixels": [], "timer": 0, "base_color": (16, 16, 16), "rng": None})
     cylon_state.update({"pos": 0, "forward": True})
     split_cyclones_state.update({"depth": 0, "phase": 1, "progress": 0.0, "max_depth": 0})
     color_wipe_state.update({"index": 0, "done": False, "last_color": None})
@@ -297,43 +418,97 @@ def reset_states():
     )
     meteor_rain_state.update({"pos": 0.0, "speed": 2.2})
     wheel_step_state.update({"pos": 0})
+    fire_state.update({"heat": None, "virtual_leds": 0})
+    reset_pacifica_state()
     reset_death_show_state()
+    fire_snow.reset()
+    for loop in FRAME_CACHES:
+        loop.reset()
+
+
+def reset_effect_state(effect_function):
+    reset_states()
+    if effect_function == halloween_scene_step:
+        reset_halloween_scene_state()
+    if effect_function == xmas_scene_step:
+        reset_xmas_scene_state()
 
 
-def run_animation(effect_function, *args, **kwargs):
-    frame_time = 0.02  # ~50 FPS
+def run_animation(scheduler, timings, effect_function, *args, **kwargs):
+    global frame_scheduler, current_perf_key, pending_switch
+    step = lambda active_frame: effect_function(active_frame, *args, **kwargs)
+    transition = None
     last_state_push = 0.0
+    scheduler.start()
     while not effect_stop_event.is_set():
+        with switch_lock:
+            effect, pending_switch = pending_switch, None
+        if effect is not None:
+            fps = effect.get("fps", TARGET_FPS)
+            # The incoming effect runs on its own state copy while the outgoing one still renders
+            incoming = EffectInstance(effect)
+            transition = Transition(
+                step,
+                incoming.render,
+                frame,
+                kind=transition_config["kind"],
+                duration=transition_config["seconds"],
+                budget=1.0 / fps,
+            )
+            step = transition.render
+            current_perf_key = effect["key"]
+            timings = perf_registry.timings_for(current_perf_key)
+            if fps != scheduler.fps:
+                scheduler = frame_scheduler = FrameScheduler(fps)
+                scheduler.start()
+
         start = time.monotonic()
-        with strip_lock:
-            effect_function(strip, *args, **kwargs)
-            strip.show()
+        begin_frame(int(start * 1000))
+        step(frame)
+        end_frame()
+        rendered = time.monotonic()
+        if transition is not None and transition.done:
+            step = incoming.adopt()
+            transition = None
+        # Frame N goes on the wire on the output thread while frame N+1 renders here
+        buffer_wait = output_pipeline.submit(frame)
         if current_mode == "game" and server_loop and connected_clients and (start - last_state_push) >= 0.25:
             asyncio.run_coroutine_threadsafe(broadcast_state(), server_loop)
             last_state_push = start
-        elapsed = time.monotonic() - start
-        if elapsed < frame_time:
-            time.sleep(frame_time - elapsed)
+        slack = scheduler.wait()
+        timings.record(
+            rendered - start,
+            output_pipeline.last_show_seconds,
+            output_pipeline.last_lock_wait_seconds + buffer_wait,
+            slack,
+        )
+    output_pipeline.drain()
 
 
-def start_effect(effect_function, *args, **kwargs):
-    global current_effect_thread
+def start_effect(effect_function, *args, fps=TARGET_FPS, perf_key=None, **kwargs):
+    global current_effect_thread, frame_scheduler, current_perf_key, pending_switch
     effect_stop_event.set()
     if current_effect_thread and current_effect_thread.is_alive():
         current_effect_thread.join()
+    with switch_lock:
+        pending_switch = None
 
-    reset_states()
-    if effect_function == halloween_scene_step:
-        reset_halloween_scene_state()
-    if effect_function == xmas_scene_step:
-        reset_xmas_scene_state()
+    reset_effect_state(effect_function)
 
     with strip_lock:
-        fill_all(strip, 0, 0, 0)
+        frame.clear()
+        frame.flush(strip)
         strip.show()
 
     effect_stop_event.clear()
-    current_effect_thread = Thread(target=run_animation, args=(effect_function, *args), kwargs=kwargs)
+    frame_scheduler = FrameScheduler(fps)
+    current_perf_key = perf_key or effect_function.__name__
+    timings = perf_registry.timings_for(current_perf_key)
+    current_effect_thread = Thread(
+        target=run_animation,
+        args=(frame_scheduler, timings, effect_function, *args),
+        kwargs=kwargs,
+    )
     current_effect_thread.daemon = True
     current_effect_thread.start()
 
@@ -341,7 +516,27 @@ def start_effect(effect_function, *args, **kwargs):
 def run_effect(idx):
     effects = all_effects()
     if 0 <= idx < len(effects):
-        effects[idx]["runner"]()
+        effect = effects[idx]
+        start_effect(
+            effect["step"],
+            *effect.get("args", ()),
+            fps=effect.get("fps", TARGET_FPS),
+            perf_key=effect["key"],
+        )
+
+
+def switch_effect(idx):
+    """Blend into effect ``idx`` from the one already running, or start it fresh."""
+    global pending_switch
+    effects = all_effects()
+    if not 0 <= idx < len(effects):
+        return
+    running = current_effect_thread is not None and current_effect_thread.is_alive() and not effect_stop_event.is_set()
+    if running and transition_config["seconds"] > 0:
+        with switch_lock:
+            pending_switch = effects[idx]
+    else:
+        run_effect(idx)
 
 
 def set_effect_by_index(idx):
@@ -350,26 +545,48 @@ def set_effect_by_index(idx):
     if 0 <= idx < len(effects):
         selected_effect = idx
         if current_mode == "animation" and animations_enabled:
-            run_effect(selected_effect)
+            switch_effect(selected_effect)
         return True
     return False
 
 
 def start_game_mode():
     zombie_game.reset()
-    start_effect(game_current_step)
+    start_effect(game_current_step, perf_key="game")
+
+
+def start_zone_mode():
+    start_effect(zone_engine.render, perf_key="zones")
+
+
+def effect_by_index(data):
+    effects = all_effects()
+    try:
+        index = int(data.get("index", 0))
+    except (TypeError, ValueError):
+        raise ValueError("Effect index must be a number")
+    if not 0 <= index < len(effects):
+        raise ValueError(f"No effect with index {index}")
+    return effects[index]
+
+
+def zone_range(data):
+    try:
+        return int(data.get("start", 0)), int(data.get("end", LED_COUNT))
+    except (TypeError, ValueError):
+        raise ValueError("Zone start and end must be numbers")
 
 
 def next_effect():
     global selected_effect
     selected_effect = (selected_effect + 1) % len(all_effects())
-    run_effect(selected_effect)
+    switch_effect(selected_effect)
 
 
 def previous_effect():
     global selected_effect
     selected_effect = (selected_effect - 1) % len(all_effects())
-    run_effect(selected_effect)
+    switch_effect(selected_effect)
 
 
 def stop_animations():
@@ -381,6 +598,13 @@ def stop_animations():
         strip.show()
 
 
+def apply_brightness():
+    output_stage.brightness = current_brightness
+    # Running effects pick it up on their next frame; a static color has to be shown again
+    if current_mode == "static" and animations_enabled:
+        static_frame.show()
+
+
 def change_brightness(up=True):
     global current_brightness
     step = 20
@@ -388,9 +612,7 @@ def change_brightness(up=True):
         current_brightness = min(255, current_brightness + step)
     else:
         current_brightness = max(0, current_brightness - step)
-    with strip_lock:
-        strip.setBrightness(current_brightness)
-        strip.show()
+    apply_brightness()
 
 
 mode_commands = {
@@ -412,9 +634,22 @@ mode_commands = {
         "up": lambda: change_brightness(up=True),
         "down": lambda: change_brightness(up=False),
     },
+    "zones": {
+        "next": lambda: None,
+        "previous": lambda: None,
+        "up": lambda: change_brightness(up=True),
+        "down": lambda: change_brightness(up=False),
+    },
 }
 
 
+def get_strip_colors():
+    """The last complete frame sent to the strip, before gamma, brightness and dither."""
+    if not animations_enabled:
+        return [[0, 0, 0]] * LED_COUNT
+    return output_pipeline.last_frame().clip(0, 255).astype(int).tolist()
+
+
 def get_state_dict():
     state = {
         "type": "state",
@@ -432,11 +667,16 @@ def get_state_dict():
         "effect_key": None,
         "supports_animation_color": False,
         "supports_ball_count": False,
+        "supports_meteor_count": False,
         "animation_color": None,
         "ball_count": animation_config["bouncing_balls"]["count"],
+        "meteor_count": animation_config["meteor_rain"]["count"],
         "game_score": 0,
         "game_wave": 1,
         "game_over": False,
+        "frame_stats": frame_scheduler.snapshot(),
+        "zones": zone_engine.snapshot(),
+        "transition": dict(transition_config),
     }
 
     if current_mode == "animation":
@@ -446,16 +686,22 @@ def get_state_dict():
             state["effect_key"] = effect["key"]
             state["supports_animation_color"] = bool(effect.get("supports_color"))
             state["supports_ball_count"] = bool(effect.get("supports_ball_count"))
+            state["supports_meteor_count"] = bool(effect.get("supports_meteor_count"))
             if effect.get("supports_color"):
                 r, g, b = animation_config[effect["key"]]["color"]
                 state["animation_color"] = {"r": r, "g": g, "b": b}
             if effect.get("supports_ball_count"):
                 state["ball_count"] = animation_config["bouncing_balls"]["count"]
+            if effect.get("supports_meteor_count"):
+                state["meteor_count"] = animation_config["meteor_rain"]["count"]
         else:
             state["effect_name"] = "Unknown"
             state["effect_key"] = None
             state["supports_animation_color"] = False
             state["supports_ball_count"] = False
+            state["supports_meteor_count"] = False
+    elif current_mode == "zones":
+        state["effect_name"] = f"Zones ({len(state['zones'])})"
     elif current_mode == "static":
         r, g, b = static_mode.get_rgb()
         state["effect_name"] = f"Static (R{r} G{g} B{b})"
@@ -470,6 +716,15 @@ def get_state_dict():
     return state
 
 
+def get_perf_dict(key=None):
+    return {
+        "type": "perf",
+        "current_key": current_perf_key,
+        "frame_stats": frame_scheduler.snapshot(),
+        "effects": perf_registry.summary(key),
+    }
+
+
 async def broadcast_state():
     if connected_clients:
         msg = json.dumps(get_state_dict())
@@ -489,11 +744,21 @@ def update_animation_color(r, g, b):
             color_wipe_state.update({"index": 0, "done": False, "last_color": None})
 
 
-def adjust_ball_count(delta):
+def set_ball_count(count):
+    animation_config["bouncing_balls"]["count"] = max(BALL_COUNT_MIN, min(BALL_COUNT_MAX, count))
+
+
+def adjust_ball_count(direction):
+    # Steps grow with the count (about an eighth of it), so the whole range is a few dozen presses
     current_count = animation_config["bouncing_balls"]["count"]
-    animation_config["bouncing_balls"]["count"] = max(
-        BALL_COUNT_MIN,
-        min(BALL_COUNT_MAX, current_count + delta),
+    set_ball_count(current_count + direction * max(1, current_count // 8))
+
+
+def adjust_meteor_count(delta):
+    current_count = animation_config["meteor_rain"]["count"]
+    animation_config["meteor_rain"]["count"] = max(
+        METEOR_COUNT_MIN,
+        min(METEOR_COUNT_MAX, current_count + delta),
     )
 
 
@@ -712,6 +977,40 @@ async def handle_command(action, data, websocket=None):
             with strip_lock:
                 fill_all(strip, 0, 0, 0)
                 strip.show()
+    elif action == "mode_zones":
+        current_mode = "zones"
+        if animations_enabled:
+            start_zone_mode()
+        else:
+            with strip_lock:
+                fill_all(strip, 0, 0, 0)
+                strip.show()
+    elif action in ("zone_create", "zone_resize", "zone_assign", "zone_delete"):
+        name = str(data.get("name", "")).strip()
+        try:
+            if not name:
+                raise ValueError("Zone name is required")
+            if action == "zone_create":
+                zone_engine.create(name, *zone_range(data), effect_by_index(data))
+            elif action == "zone_resize":
+                zone_engine.resize(name, *zone_range(data))
+            elif action == "zone_assign":
+                zone_engine.assign(name, effect_by_index(data))
+            else:
+                zone_engine.delete(name)
+        except ValueError as exc:
+            should_broadcast = False
+            if websocket is not None:
+                try:
+                    await websocket.send(json.dumps({"type": "zone_result", "status": "error", "error": str(exc)}))
+                except Exception:
+                    pass
+        else:
+            # Any zone change switches the strip over to the zone renderer
+            if current_mode != "zones":
+                current_mode = "zones"
+                if animations_enabled:
+                    start_zone_mode()
     elif action in ("next", "previous", "up", "down"):
         mode_commands[current_mode][action]()
     elif action == "toggle":
@@ -723,20 +1022,19 @@ async def handle_command(action, data, websocket=None):
                 run_effect(selected_effect)
             elif current_mode == "game":
                 start_game_mode()
+            elif current_mode == "zones":
+                start_zone_mode()
             else:
-                with strip_lock:
-                    static_mode.show_color()
-                    strip.show()
+                static_mode.show_color()
     elif action == "set_color":
         r = max(0, min(255, int(data.get("r", 255))))
         g = max(0, min(255, int(data.get("g", 255))))
         b = max(0, min(255, int(data.get("b", 255))))
-        if current_mode in ("animation", "game"):
+        if current_mode in ("animation", "game", "zones"):
             stop_animations()
         current_mode = "static"
         animations_enabled = True
-        with strip_lock:
-            static_mode.set_rgb(r, g, b)
+        static_mode.set_rgb(r, g, b)
     elif action == "set_animation_color":
         r = max(0, min(255, int(data.get("r", 255))))
         g = max(0, min(255, int(data.get("g", 255))))
@@ -748,10 +1046,25 @@ async def handle_command(action, data, websocket=None):
         except (TypeError, ValueError):
             index = selected_effect
         set_effect_by_index(index)
+    elif action == "set_transition":
+        kind = str(data.get("kind", transition_config["kind"]))
+        if kind in TRANSITION_KINDS:
+            transition_config["kind"] = kind
+        try:
+            seconds = float(data.get("seconds", transition_config["seconds"]))
+        except (TypeError, ValueError):
+            seconds = transition_config["seconds"]
+        transition_config["seconds"] = max(0.0, min(10.0, seconds))
     elif action == "increase_ball_count":
         adjust_ball_count(1)
     elif action == "decrease_ball_count":
         adjust_ball_count(-1)
+    elif action == "set_ball_count":
+        set_ball_count(int(data.get("value", animation_config["bouncing_balls"]["count"])))
+    elif action == "increase_meteor_count":
+        adjust_meteor_count(1)
+    elif action == "decrease_meteor_count":
+        adjust_meteor_count(-1)
     elif action == "move_left":
         if current_mode == "game":
             zombie_game.move_left()
@@ -767,23 +1080,20 @@ async def handle_command(action, data, websocket=None):
     elif action == "set_brightness":
         value = max(0, min(255, int(data.get("value", current_brightness))))
         current_brightness = value
-        with strip_lock:
-            strip.setBrightness(current_brightness)
-            strip.show()
+        apply_brightness()
     elif action == "set_pixel_range":
         start = max(0, min(LED_COUNT - 1, int(data.get("start", 0))))
         end = max(0, min(LED_COUNT - 1, int(data.get("end", start))))
         r = max(0, min(255, int(data.get("r", 255))))
         g = max(0, min(255, int(data.get("g", 255))))
         b = max(0, min(255, int(data.get("b", 255))))
-        if current_mode in ("animation", "game"):
+        if current_mode in ("animation", "game", "zones"):
             stop_animations()
         current_mode = "static"
         animations_enabled = True
-        with strip_lock:
-            for i in range(start, end + 1):
-                set_pixel(strip, i, r, g, b)
-            strip.show()
+        for i in range(start, end + 1):
+            set_pixel(static_frame, i, r, g, b)
+        static_frame.show()
         should_broadcast = False
     elif action == "ai_generate":
         prompt = str(data.get("prompt", "")).strip()
@@ -874,6 +1184,8 @@ async def handle_command(action, data, websocket=None):
             should_broadcast = False
     elif action == "get_strip_colors":
         should_broadcast = False
+    elif action == "get_perf":
+        should_broadcast = False
     elif action == "get_state":
         pass
 
@@ -897,11 +1209,12 @@ async def handler(websocket):
             async with command_lock:
                 await handle_command(action, data, websocket)
                 if action == "get_strip_colors":
-                    with strip_lock:
-                        colors = [list(get_pixel(strip, i)) for i in range(LED_COUNT)]
+                    colors = get_strip_colors()
                     await websocket.send(json.dumps({"type": "strip_colors", "colors": colors}))
                 elif action == "get_state":
                     await websocket.send(json.dumps(get_state_dict()))
+                elif action == "get_perf":
+                    await websocket.send(json.dumps(get_perf_dict(data.get("key"))))
 
     except websockets.ConnectionClosed:
         pass
@@ -922,6 +1235,8 @@ async def main():
     log.info("Gemini key   : %s", key_display)
     log.info("Max tokens   : %d", _ai.GEMINI_MAX_OUTPUT_TOKENS)
     log.info("LED count    : %d", LED_COUNT)
+    log.info("LED backend  : %s", LED_BACKEND)
+    log.info("Render workers: %d", RENDER_WORKERS)
 
     rebuild_ai_effects()
     selected_effect = 0
@@ -939,3 +1254,5 @@ if __name__ == "__main__":
         stop_animations()
     finally:
         strip._cleanup()
+        if render_pool is not None:
+            render_pool.close()
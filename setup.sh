@@ -21,6 +21,8 @@ pip3 install rpi_ws281x --break-system-packages --quiet 2>/dev/null || \
     pip3 install rpi_ws281x --quiet
 pip3 install websockets --break-system-packages --quiet 2>/dev/null || \
     pip3 install websockets --quiet
+pip3 install numpy --break-system-packages --quiet 2>/dev/null || \
+    pip3 install numpy --quiet
 
 # GPIO 18 uses the Pi's PWM hardware, which conflicts with onboard audio and
 # can cause random LED flicker during continuous animation updates.
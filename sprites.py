@@ -0,0 +1,164 @@
+"""Multi-pixel actors drawn from precomputed color strips.
+
+A SpriteLayer holds the shapes its actors can take, packed into one atlas,
+and the actors themselves in a ParticlePool: a fractional position, the
+shape, a drawing direction and a per-channel tint, plus whatever fields the
+caller adds. draw() expands every actor into its cells, clips them to the
+strip and writes them with one index assignment. Where actors overlap the
+later one wins, exactly as if they had been drawn one after another.
+
+within() and pairs() answer "which actors are near this point" with a
+binary search over the actors sorted by position, so collision checks stay
+cheap with thousands of actors on a long strip.
+"""
+
+import numpy as np
+
+from particles import ParticlePool
+
+_ROUNDING = {"trunc": np.trunc, "floor": np.floor, "round": np.round}
+
+
+def blit(pixels, start, colors):
+    """Copy a run of colors to the strip starting at ``start``, clipped at both ends."""
+    lo = max(0, start)
+    hi = min(len(pixels), start + len(colors))
+    if hi > lo:
+        pixels[lo:hi] = colors[lo - start : hi - start]
+
+
+class SpriteLayer:
+    """A set of actors that share a list of shapes and are drawn together.
+
+    ``shapes`` is a sequence of color strips; actors refer to them by index.
+    ``anchors`` gives, per shape, which cell sits on the actor's position
+    (default the first). An actor's cell k is drawn at
+    ``rounded(pos) + (k - anchor) * step``, so a step of -1 mirrors the shape.
+    Cell colors are multiplied by the actor's ``tint`` and truncated, so a
+    shape of ones takes its color entirely from the tint and a shape of
+    fractions gives a dimmed copy of it.
+
+    ``rounding`` turns positions into pixels: "trunc" like int(), "floor", or
+    "round" like round(). With ``anchored`` an actor whose anchor pixel is off
+    the strip isn't drawn at all; otherwise each cell is clipped on its own.
+    Extra ``fields`` (name=width) are stored alongside, as in ParticlePool.
+    """
+
+    def __init__(self, shapes, anchors=None, rounding="trunc", anchored=False, capacity=32, **fields):
+        self.shapes = []
+        self._atlas = np.zeros((0, 3))
+        self._offsets = np.zeros(0, dtype=np.intp)
+        self._lengths = np.zeros(0, dtype=np.intp)
+        self._anchors = np.zeros(0, dtype=np.intp)
+        for index, colors in enumerate(shapes):
+            self.add_shape(colors, anchors[index] if anchors is not None else 0)
+        self.rounding = _ROUNDING[rounding]
+        self.anchored = anchored
+        self._latest = np.empty(0, dtype=np.intp)
+        self.actors = ParticlePool(capacity, pos=1, shape=1, step=1, tint=3, **fields)
+
+    def add_shape(self, colors, anchor=0):
+        """Register another color strip and return its shape index."""
+        colors = np.asarray(colors, dtype=np.float64).reshape(-1, 3)
+        self._offsets = np.append(self._offsets, len(self._atlas))
+        self._lengths = np.append(self._lengths, len(colors))
+        self._anchors = np.append(self._anchors, anchor)
+        self._atlas = np.concatenate((self._atlas, colors))
+        self.shapes.append(colors)
+        self._single = bool((self._lengths == 1).all())
+        return len(self.shapes) - 1
+
+    def __len__(self):
+        return len(self.actors)
+
+    def __getitem__(self, name):
+        return self.actors[name]
+
+    def __setitem__(self, name, values):
+        self.actors[name] = values
+
+    def spawn(self, count=1, shape=0, step=1, tint=1.0, **values):
+        """Append ``count`` actors; see ParticlePool.spawn()."""
+        self.actors.spawn(count, shape=shape, step=step, tint=tint, **values)
+
+    def cull(self, keep):
+        self.actors.cull(keep)
+
+    def clear(self):
+        self.actors.clear()
+
+    def pixel_positions(self):
+        """The pixel each actor's anchor cell lands on."""
+        return self.rounding(self.actors["pos"]).astype(np.intp)
+
+    def draw(self, pixels):
+        count = len(self.actors)
+        if not count:
+            return
+        shape = self.actors["shape"].astype(np.intp)
+        anchor = self.pixel_positions()
+        if self._single:
+            owner = np.arange(count)
+            index = anchor
+            atlas_rows = self._offsets[shape]
+        else:
+            lengths = self._lengths[shape]
+            owner = np.repeat(np.arange(count), lengths)
+            cell = np.arange(len(owner)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+            step = self.actors["step"].astype(np.intp)
+            index = anchor[owner] + (cell - self._anchors[shape][owner]) * step[owner]
+            atlas_rows = self._offsets[shape][owner] + cell
+
+        num_pixels = len(pixels)
+        inside = (index >= 0) & (index < num_pixels)
+        if self.anchored:
+            inside &= ((anchor >= 0) & (anchor < num_pixels))[owner]
+        index = index[inside]
+        if not len(index):
+            return
+        owner = owner[inside]
+        colors = self._atlas[atlas_rows[inside]] * self.actors["tint"][owner]
+
+        if len(index) > 1:
+            # Keep the last cell written to each pixel, as drawing the actors in order would
+            latest = self._latest
+            if len(latest) < num_pixels:
+                latest = self._latest = np.empty(num_pixels, dtype=np.intp)
+            order = np.arange(len(index))
+            latest[index] = -1
+            np.maximum.at(latest, index, order)
+            keep = latest[index] == order
+            index, colors = index[keep], colors[keep]
+        pixels[index] = np.clip(np.floor(colors), 0.0, 255.0)
+
+    def within(self, positions, reach, inclusive=True):
+        """Actors within ``reach`` of each query position, as (query, actor) index arrays.
+
+        Pairs are ordered by query, then by actor index. Distances are
+        compared with ``<=``, or ``<`` when ``inclusive`` is false.
+        """
+        positions = np.atleast_1d(np.asarray(positions, dtype=np.float64))
+        actor_pos = self.actors["pos"]
+        if not len(actor_pos) or not len(positions):
+            return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+        order = np.argsort(actor_pos, kind="stable")
+        ordered = actor_pos[order]
+        # Search a hair wider than reach, then apply the exact test to the candidates
+        margin = reach + 1e-9 * (1.0 + abs(reach))
+        lo = np.searchsorted(ordered, positions - margin, side="left")
+        hi = np.searchsorted(ordered, positions + margin, side="right")
+        counts = hi - lo
+        query = np.repeat(np.arange(len(positions)), counts)
+        slot = np.arange(len(query)) - np.repeat(np.cumsum(counts) - counts, counts) + np.repeat(lo, counts)
+        actor = order[slot]
+        distance = np.abs(actor_pos[actor] - positions[query])
+        close = distance <= reach if inclusive else distance < reach
+        query, actor = query[close], actor[close]
+        grouped = np.lexsort((actor, query))
+        return query[grouped], actor[grouped]
+
+    def pairs(self, reach, inclusive=True):
+        """Every pair of actors (i < j) within ``reach`` of each other, as two index arrays."""
+        first, second = self.within(self.actors["pos"], reach, inclusive)
+        ordered = first < second
+        return first[ordered], second[ordered]
@@ -1,4 +1,4 @@
-from rpi_ws281x import Color
+from led_strip import Color
 
 class StaticMode:
     def __init__(self, strip):
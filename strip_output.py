@@ -0,0 +1,54 @@
+import ctypes
+
+import numpy as np
+
+try:
+    import _rpi_ws281x as ws
+except ImportError:
+    ws = None
+
+
+def pack_rgb(pixels, out=None):
+    """Pack an (N, 3) array into 0x00RRGGBB words, clamping each channel to 0-255."""
+    rgb = np.clip(pixels, 0, 255).astype(np.uint32)
+    if out is None:
+        out = np.empty(len(rgb), dtype=np.uint32)
+    np.left_shift(rgb[:, 0], 16, out=out)
+    out |= rgb[:, 1] << 8
+    out |= rgb[:, 2]
+    return out
+
+
+def _channel_led_buffer(strip):
+    """Return (address, count) of the ws2811 channel LED array behind a PixelStrip, or None."""
+    channel = getattr(strip, "_channel", None)
+    if ws is None or channel is None:
+        return None
+    leds = ws.ws2811_channel_t_leds_get(channel)
+    if leds is None:
+        # The array is only allocated by ws2811_init (strip.begin())
+        return None
+    return int(leds), ws.ws2811_channel_t_count_get(channel)
+
+
+def push_words(strip, words):
+    """Copy a frame of packed words into ``strip`` using the fastest path it supports.
+
+    In order of preference: a ``set_pixel_data`` bulk setter on the strip, a
+    single memmove into the rpi_ws281x channel LED array, and finally one
+    setPixelColor call per LED. The caller still calls strip.show().
+    """
+    bulk_setter = getattr(strip, "set_pixel_data", None)
+    if bulk_setter is not None:
+        bulk_setter(words)
+        return
+
+    led_buffer = _channel_led_buffer(strip)
+    if led_buffer is not None:
+        address, count = led_buffer
+        data = np.ascontiguousarray(words[:count], dtype=np.uint32)
+        ctypes.memmove(address, data.ctypes.data, data.nbytes)
+        return
+
+    for index, color in enumerate(words.tolist()):
+        strip.setPixelColor(index, color)
@@ -0,0 +1,52 @@
+"""The table-driven effects in patterns.py must draw the same frames as the
+per-pixel originals in animations.py, which they share state with."""
+
+import copy
+
+import numpy as np
+import pytest
+
+import animations
+import patterns
+from framebuffer import FrameBuffer
+
+FRAMES = 1200
+
+CASES = [
+    ("rainbow_cycle_step", ("rainbow_cycle_state",), ()),
+    ("theater_chase_step", ("theater_chase_state",), (255, 0, 0)),
+    ("theater_chase_step", ("theater_chase_state",), (17, 200, 3)),
+    ("theater_chase_rainbow_step", ("theater_chase_rainbow_state",), ()),
+    ("running_lights_step", ("running_lights_state",), (255, 40, 0)),
+    ("wheel_step", ("wheel_step_state",), ()),
+    ("wheel_step", ("wheel_step_state",), ((10, 0, 200), (255, 255, 0), 37)),
+    ("cylon_bounce_step", ("cylon_state",), (255, 0, 0, 4, 10, 50)),
+    ("cylon_bounce_step", ("cylon_state",), (90, 30, 255, 1, 10, 50)),
+]
+
+
+def _render(step, states, args, num_leds, defaults):
+    for name in states:
+        state = getattr(animations, name)
+        state.clear()
+        state.update(copy.deepcopy(defaults[name]))
+    frame = FrameBuffer(num_leds)
+    frames = np.empty((FRAMES, num_leds, 3), dtype=np.float32)
+    for index in range(FRAMES):
+        step(frame, *args)
+        frames[index] = frame.pixels
+    return frames
+
+
+@pytest.mark.parametrize("num_leds", [1, 7, 300])
+@pytest.mark.parametrize("name, states, args", CASES)
+def test_matches_reference(name, states, args, num_leds):
+    defaults = {state: copy.deepcopy(getattr(animations, state)) for state in states}
+    try:
+        expected = _render(getattr(animations, name), states, args, num_leds, defaults)
+        actual = _render(getattr(patterns, name), states, args, num_leds, defaults)
+    finally:
+        for state in states:
+            getattr(animations, state).clear()
+            getattr(animations, state).update(defaults[state])
+    np.testing.assert_array_equal(actual, expected)
@@ -0,0 +1,88 @@
+"""Seeded runs of the holiday scenes and the zombie game must keep drawing the
+same frames. The digests were taken from the per-pixel versions these modules
+had before their actors moved to SpriteLayer, so any change to spawn order,
+random call order, rounding or draw order shows up here."""
+
+import hashlib
+import random
+
+import pytest
+
+import game_mode
+import halloween_scene
+import xmas_scene
+from framebuffer import FrameBuffer
+
+FRAMES = 3000
+
+# Busier than the defaults, so reindeer, santa, treats and twinkles all get drawn
+XMAS_CHANCES = {
+    "reindeer_spawn_chance": 0.02,
+    "santa_spawn_chance": 0.01,
+    "twinkle_chance": 0.2,
+    "treat_spawn_chance": 0.05,
+}
+
+SCENE_DIGESTS = {
+    ("xmas", 40): "007247cd493ec671",
+    ("xmas", 300): "d75c292c76518f44",
+    ("halloween", 40): "6cd122af6d59799e",
+    ("halloween", 300): "9d1fa0601f9c5068",
+}
+
+# num_leds: (digest, final score, final wave)
+GAME_DIGESTS = {
+    40: ("96cf1a081b81514e", 4, 1),
+    300: ("2bdbcd10ace3b97b", 170, 6),
+}
+
+
+def _digest(step, num_leds):
+    frame = FrameBuffer(num_leds)
+    digest = hashlib.sha256()
+    for _ in range(FRAMES):
+        step(frame)
+        digest.update(frame.pixels.tobytes())
+    return digest.hexdigest()[:16]
+
+
+@pytest.mark.parametrize("scene, num_leds", sorted(SCENE_DIGESTS))
+def test_scene_frames(scene, num_leds, monkeypatch):
+    module = {"xmas": xmas_scene, "halloween": halloween_scene}[scene]
+    state = getattr(module, f"{scene}_scene_state")
+    reset = getattr(module, f"reset_{scene}_scene_state")
+    reset()
+    if scene == "xmas":
+        for key, value in XMAS_CHANCES.items():
+            monkeypatch.setitem(state, key, value)
+    random.seed(11)
+    try:
+        digest = _digest(getattr(module, f"{scene}_scene_step"), num_leds)
+    finally:
+        reset()
+    assert digest == SCENE_DIGESTS[scene, num_leds]
+
+
+@pytest.mark.parametrize("num_leds", sorted(GAME_DIGESTS))
+def test_game_frames(num_leds, monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(game_mode.time, "monotonic", lambda: clock[0])
+    random.seed(5)
+    player = random.Random(9)
+    game = game_mode.ZombieGameMode(num_leds)
+
+    def step(frame):
+        clock[0] += 0.02
+        action = player.random()
+        if action < 0.25:
+            game.shoot_left()
+        elif action < 0.5:
+            game.shoot_right()
+        elif action < 0.55:
+            game.move_left()
+        elif action < 0.6:
+            game.move_right()
+        game.step(frame)
+
+    digest = _digest(step, num_leds)
+    assert (digest, game.score, game.wave) == GAME_DIGESTS[num_leds]
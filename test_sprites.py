@@ -0,0 +1,129 @@
+"""SpriteLayer must draw exactly what drawing its actors one cell at a time, in
+order, would; within() and pairs() must find what a brute-force scan finds,
+in the documented order."""
+
+import math
+
+import numpy as np
+import pytest
+
+from sprites import SpriteLayer, blit
+
+SHAPES = [
+    [(255, 0, 0)],
+    [(10, 20, 30), (40, 50, 60)],
+    [(1, 1, 1), (0.5, 0.5, 0.5), (0.25, 0.25, 0.25), (0.1, 0.1, 0.1)],
+]
+ANCHORS = [0, 1, 2]
+ROUND = {"trunc": int, "floor": math.floor, "round": round}
+
+
+def _random_layer(rng, count, rounding, anchored, num_leds):
+    layer = SpriteLayer(SHAPES, anchors=ANCHORS, rounding=rounding, anchored=anchored)
+    for _ in range(count):
+        layer.spawn(
+            pos=rng.uniform(-5, num_leds + 5),
+            shape=rng.integers(len(SHAPES)),
+            step=rng.choice([-1, 1]),
+            tint=rng.uniform(0, 300, 3),
+        )
+    return layer
+
+
+def _draw_one_by_one(layer, pixels, rounding, anchored):
+    num_leds = len(pixels)
+    for actor in range(len(layer)):
+        anchor = ROUND[rounding](float(layer["pos"][actor]))
+        if anchored and not 0 <= anchor < num_leds:
+            continue
+        shape = int(layer["shape"][actor])
+        step = int(layer["step"][actor])
+        for cell, color in enumerate(SHAPES[shape]):
+            index = anchor + (cell - ANCHORS[shape]) * step
+            if 0 <= index < num_leds:
+                pixels[index] = np.clip(np.floor(np.array(color) * layer["tint"][actor]), 0, 255)
+
+
+@pytest.mark.parametrize("rounding", sorted(ROUND))
+@pytest.mark.parametrize("anchored", [False, True])
+@pytest.mark.parametrize("count", [1, 5, 200])
+def test_draw_matches_drawing_in_order(rounding, anchored, count):
+    rng = np.random.default_rng(count)
+    num_leds = 30
+    layer = _random_layer(rng, count, rounding, anchored, num_leds)
+    expected = np.full((num_leds, 3), 7.0)
+    _draw_one_by_one(layer, expected, rounding, anchored)
+    actual = np.full((num_leds, 3), 7.0)
+    layer.draw(actual)
+    np.testing.assert_array_equal(actual, expected)
+
+
+def test_rounding_modes():
+    positions = [-0.5, -0.4, 1.5, 2.5, 3.7]
+    expected = {"trunc": [0, 0, 1, 2, 3], "floor": [-1, -1, 1, 2, 3], "round": [0, 0, 2, 2, 4]}
+    for rounding, pixels in expected.items():
+        layer = SpriteLayer(SHAPES, rounding=rounding)
+        layer.spawn(len(positions), pos=np.array(positions))
+        assert layer.pixel_positions().tolist() == pixels
+
+
+def test_anchored_drops_the_whole_actor():
+    pixels = np.zeros((5, 3))
+    layer = SpriteLayer(SHAPES, anchors=ANCHORS, anchored=True)
+    # Anchored on its third cell and mirrored, so cells 0 and 1 land on pixels 1 and 0
+    layer.spawn(shape=2, pos=-1, step=-1, tint=200)
+    layer.draw(pixels)
+    assert not pixels.any()
+    layer.anchored = False
+    layer.draw(pixels)
+    np.testing.assert_array_equal(pixels[:3], [[100, 100, 100], [200, 200, 200], [0, 0, 0]])
+
+
+def test_blit_clips_both_ends():
+    colors = np.arange(12.0).reshape(4, 3)
+    pixels = np.zeros((3, 3))
+    blit(pixels, -2, colors)
+    np.testing.assert_array_equal(pixels[:2], colors[2:])
+    assert not pixels[2].any()
+    pixels[:] = 0
+    blit(pixels, 2, colors)
+    np.testing.assert_array_equal(pixels[2], colors[0])
+    assert not pixels[:2].any()
+
+
+@pytest.mark.parametrize("inclusive", [True, False])
+def test_within_matches_brute_force(inclusive):
+    rng = np.random.default_rng(3)
+    layer = SpriteLayer(SHAPES)
+    # Whole-number positions put plenty of actors exactly on the edge of the reach
+    layer.spawn(300, pos=np.concatenate((rng.integers(0, 60, 150), rng.uniform(0, 60, 150))))
+    queries = np.concatenate((rng.integers(-3, 63, 40), rng.uniform(-3, 63, 40)))
+    reach = 2.0
+    query, actor = layer.within(queries, reach, inclusive)
+    distance = np.abs(queries[:, None] - layer["pos"][None, :])
+    close = distance <= reach if inclusive else distance < reach
+    expected_query, expected_actor = np.nonzero(close)
+    assert query.tolist() == expected_query.tolist()
+    assert actor.tolist() == expected_actor.tolist()
+
+
+def test_within_empty():
+    layer = SpriteLayer(SHAPES)
+    query, actor = layer.within([1.0, 2.0], 5)
+    assert len(query) == len(actor) == 0
+    layer.spawn(pos=1.0)
+    query, actor = layer.within([], 5)
+    assert len(query) == len(actor) == 0
+
+
+@pytest.mark.parametrize("inclusive", [True, False])
+def test_pairs_matches_brute_force(inclusive):
+    rng = np.random.default_rng(4)
+    layer = SpriteLayer(SHAPES)
+    layer.spawn(200, pos=np.round(rng.uniform(0, 80, 200), 1))
+    first, second = layer.pairs(1.0, inclusive)
+    distance = np.abs(layer["pos"][:, None] - layer["pos"][None, :])
+    close = distance <= 1.0 if inclusive else distance < 1.0
+    expected_first, expected_second = np.nonzero(np.triu(close, k=1))
+    assert first.tolist() == expected_first.tolist()
+    assert second.tolist() == expected_second.tolist()
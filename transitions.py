@@ -0,0 +1,73 @@
+import time
+
+import numpy as np
+
+from framebuffer import FrameBuffer
+
+TRANSITION_KINDS = ("crossfade", "wipe", "dissolve")
+
+
+class Transition:
+    """Effect step that blends an outgoing effect into an incoming one.
+
+    Both keep rendering, each into its own frame, and every frame is mixed
+    with one vectorized lerp using per-pixel weights for ``kind``. The
+    outgoing effect starts from a copy of the frame already on the strip so
+    it carries on without a jump. If rendering both effects overruns
+    ``budget`` seconds, the outgoing frame is frozen and only the incoming
+    effect keeps rendering until the transition ends.
+    """
+
+    def __init__(self, outgoing, incoming, current_frame, kind="crossfade", duration=1.0, budget=None):
+        if kind not in TRANSITION_KINDS:
+            raise ValueError(f"Unknown transition: {kind!r}")
+        num_pixels = current_frame.numPixels()
+        self.outgoing = outgoing
+        self.incoming = incoming
+        self.kind = kind
+        self.duration = duration
+        self.budget = budget
+        self.out_frame = FrameBuffer(num_pixels, pixels=current_frame.pixels.copy())
+        self.in_frame = FrameBuffer(num_pixels)
+        self.frozen = False
+        self.done = False
+        self._start = None
+        self._index = np.arange(num_pixels, dtype=np.float32)
+        self._weights = np.zeros((num_pixels, 1), dtype=np.float32)
+        if kind == "dissolve":
+            self._thresholds = np.random.random(num_pixels).astype(np.float32)
+
+    def _update_weights(self, progress):
+        if self.kind == "crossfade":
+            return progress
+        if self.kind == "wipe":
+            # Soft edge a few percent of the strip wide
+            edge = max(1.0, len(self._index) / 20.0)
+            head = progress * (len(self._index) + edge)
+            np.clip((head - self._index) / edge, 0.0, 1.0, out=self._weights[:, 0])
+        else:
+            np.less(self._thresholds, progress, out=self._weights[:, 0])
+        return self._weights
+
+    def render(self, strip):
+        now = time.monotonic()
+        if self._start is None:
+            self._start = now
+        progress = min(1.0, (now - self._start) / self.duration) if self.duration > 0 else 1.0
+
+        if not self.frozen:
+            self.outgoing(self.out_frame)
+        self.incoming(self.in_frame)
+
+        pixels = strip.pixels
+        if progress >= 1.0:
+            pixels[:] = self.in_frame.pixels
+            self.done = True
+        else:
+            weights = self._update_weights(progress)
+            np.subtract(self.in_frame.pixels, self.out_frame.pixels, out=pixels)
+            pixels *= weights
+            pixels += self.out_frame.pixels
+
+        if not self.frozen and self.budget is not None and time.monotonic() - now > self.budget:
+            self.frozen = True
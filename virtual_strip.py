@@ -0,0 +1,73 @@
+import time
+
+import numpy as np
+
+from config import LED_BRIGHTNESS, LED_FREQ_HZ
+
+WS2812_BITS_PER_LED = 24
+# rpi_ws281x waits this long after each transfer so the strip latches (LED_RESET_WAIT_TIME)
+WS2812_RESET_SECONDS = 300e-6
+
+
+class VirtualStrip:
+    """Headless stand-in for rpi_ws281x.PixelStrip.
+
+    Keeps the frame in a uint32 array of 0x00RRGGBB words. With
+    ``simulate_timing`` on, show() follows the rpi_ws281x render model: it
+    returns once the transfer has started, but blocks first until the previous
+    frame has finished on the wire (24 bits per LED at ``freq_hz``, roughly
+    30 us per LED at 800 kHz, plus the latch time). That gives honest frame
+    budgets when the server is load-tested or benchmarked off the Pi.
+    """
+
+    def __init__(self, num, freq_hz=LED_FREQ_HZ, brightness=LED_BRIGHTNESS, simulate_timing=True):
+        self.size = num
+        self.simulate_timing = simulate_timing
+        self.wire_time = num * WS2812_BITS_PER_LED / float(freq_hz) + WS2812_RESET_SECONDS
+        self.frames_shown = 0
+        self._leds = np.zeros(num, dtype=np.uint32)
+        self._shown = np.zeros(num, dtype=np.uint32)
+        self._brightness = brightness
+        self._wire_free_at = 0.0
+
+    def begin(self):
+        pass
+
+    def _cleanup(self):
+        pass
+
+    def numPixels(self):
+        return self.size
+
+    def setPixelColor(self, n, color):
+        if 0 <= n < self.size:
+            self._leds[n] = color & 0xFFFFFF
+
+    def getPixelColor(self, n):
+        if 0 <= n < self.size:
+            return int(self._leds[n])
+        return 0
+
+    def set_pixel_data(self, words):
+        count = min(self.size, len(words))
+        self._leds[:count] = words[:count]
+
+    def getBrightness(self):
+        return self._brightness
+
+    def setBrightness(self, brightness):
+        self._brightness = brightness
+
+    def show(self):
+        if self.simulate_timing:
+            wait = self._wire_free_at - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            self._wire_free_at = time.monotonic() + self.wire_time
+        np.copyto(self._shown, self._leds)
+        self.frames_shown += 1
+
+    def shown_pixels(self):
+        """Return the last frame sent to the wire as an (N, 3) uint8 array, brightness applied."""
+        rgb = np.stack(((self._shown >> 16) & 0xFF, (self._shown >> 8) & 0xFF, self._shown & 0xFF), axis=1)
+        return ((rgb * (self._brightness + 1)) >> 8).astype(np.uint8)
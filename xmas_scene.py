@@ -1,6 +1,33 @@
 import random
 import math
-from led_operations import fade_to_black, fill_all, set_pixel
+from functools import lru_cache
+
+import numpy as np
+
+from sprites import SpriteLayer
+
+WHITE = (255,255,255)
+RED = (255,0,0)
+
+# Reindeer: 8 pixels: 7 brown, 1 red nose at the front
+REINDEER = [(139,69,19)]*7 + [RED]
+REINDEER_WIDTH = len(REINDEER)
+# Santa: length=10, pattern of red, white, face, etc.
+SANTA = [RED, WHITE, (255,200,150), RED, (0,0,0), RED, WHITE, RED, RED, RED]
+SANTA_WIDTH = len(SANTA)
+# Treat shapes: a white + red candy cane, or one pixel in the treat's own color
+CANDY_CANE, BAUBLE = 0, 1
+
+def new_actors():
+    """Fresh sprite layers for every kind of actor in the scene."""
+    return {
+        'snowflakes': SpriteLayer([[WHITE]], speed=1),
+        'reindeers': SpriteLayer([REINDEER], direction=1, paused=1, pause_timer=1),
+        'santa': SpriteLayer([SANTA], capacity=1, direction=1),
+        'santa_trail': SpriteLayer([[(1,1,1)]], life=1),  # positions Santa left recently
+        'treats': SpriteLayer([[WHITE, RED], [(1,1,1)]], anchored=True, origin=1, direction=1, sway_timer=1),
+        'twinkles': SpriteLayer([[(1,1,1)]], life=1),  # short-lived sparkles
+    }
 
 # Global state for the Christmas scene
 xmas_scene_state = {
@@ -11,10 +38,7 @@ xmas_scene_state = {
     'hue_direction': 1,       # Direction for hue shifts
 
     # Elements
-    'snowflakes': [],
-    'reindeers': [],
-    'santa': None,
-    'treats': [],
+    **new_actors(),
 
     # Parameters
     'max_snowflakes': 20,
@@ -38,122 +62,8 @@ xmas_scene_state = {
 
     # Timers and effects
     'twinkle_chance': 0.002,
-    'twinkle_pixels': [],  # short-lived sparkles
 }
 
-class Snowflake:
-    def __init__(self, pos, speed):
-        self.pos = float(pos)
-        self.speed = speed
-        self.color = (255,255,255)  # white snowflake
-    
-    def update(self):
-        self.pos += self.speed
-
-class Treat:
-    def __init__(self, pos, color, kind):
-        self.pos = float(pos)
-        self.color = color
-        self.kind = kind
-        # Treats gently sway around their initial position
-        self.origin = self.pos
-        self.direction = random.choice([-1,1])
-        self.sway_timer = random.randint(50,150)
-    
-    def update(self, speed):
-        self.sway_timer -= 1
-        if self.sway_timer <= 0:
-            self.direction *= -1
-            self.sway_timer = random.randint(50,150)
-        self.pos += self.direction * speed
-        # keep treat close to origin
-        # clamp slightly so it doesn't wander too far
-        if abs(self.pos - self.origin) > 2:
-            # reverse direction to bring it back
-            self.direction *= -1
-
-class Reindeer:
-    # Reindeer: 8 pixels: 7 brown, 1 red nose at the front
-    def __init__(self, start_pos, direction):
-        self.pos = float(start_pos)
-        self.direction = direction
-        brown = (139,69,19)
-        red = (255,0,0)
-        self.colors = [brown]*7 + [red]
-        self.width = len(self.colors)
-        self.paused = False
-        self.pause_timer = 0
-    
-    def update(self, speed, treats):
-        # Simple AI: if treat ahead and close, slow down or pause
-        ahead_pos = self.pos + (self.width * self.direction)
-        close_treat = any(abs(t.pos - ahead_pos) < 5 for t in treats)
-        if close_treat and not self.paused:
-            # occasional pause
-            if random.random() < 0.3:
-                self.paused = True
-                self.pause_timer = random.randint(20,50)
-            else:
-                # slow down
-                speed *= 0.5
-        
-        if self.paused:
-            self.pause_timer -= 1
-            if self.pause_timer <= 0:
-                self.paused = False
-        else:
-            self.pos += speed * self.direction
-
-class Santa:
-    # Santa: length=10, pattern of red, white, face, etc.
-    def __init__(self, start_pos, direction):
-        self.pos = float(start_pos)
-        self.direction = direction
-        red = (255,0,0)
-        white = (255,255,255)
-        black = (0,0,0)
-        face = (255,200,150)
-        self.colors = [red, white, face, red, black, red, white, red, red, red]
-        self.width = len(self.colors)
-        self.sparkle_trail = []  # positions Santa left recently
-    
-    def update(self, speed, treats):
-        # Santa speeds up slightly if treat ahead
-        ahead_pos = self.pos + (self.width * self.direction)
-        close_treat = any(abs(t.pos - ahead_pos) < 10 for t in treats)
-        if close_treat:
-            speed *= 1.3  # Santa gets excited
-
-        old_pos = self.pos
-        self.pos += speed * self.direction
-        # leave sparkle trail
-        start_p = int(old_pos)
-        end_p = int(self.pos)
-        trail_positions = range(min(start_p,end_p), max(start_p,end_p)+1)
-        for p in trail_positions:
-            self.sparkle_trail.append((p,5)) # sparkle lasts 5 frames
-
-def hsv_to_rgb(h, s, v):
-    i = int(h*6)
-    f = h*6 - i
-    p = v*(1 - s)
-    q = v*(1 - f*s)
-    t = v*(1 - (1-f)*s)
-    i = i % 6
-    if i == 0:
-        r,g,b = v,t,p
-    elif i == 1:
-        r,g,b = q,v,p
-    elif i == 2:
-        r,g,b = p,v,t
-    elif i == 3:
-        r,g,b = p,q,v
-    elif i == 4:
-        r,g,b = t,p,v
-    elif i == 5:
-        r,g,b = v,p,q
-    return (int(r*255),int(g*255),int(b*255))
-
 def random_treat():
     kinds = ['candy_cane', 'bell', 'ornament']
     kind = random.choice(kinds)
@@ -171,143 +81,160 @@ def random_treat():
 
 def spawn_snowflake(strip, st):
     if len(st['snowflakes']) < st['max_snowflakes']:
-        pos = 0
         speed = random.uniform(st['snowflake_speed_min'], st['snowflake_speed_max'])
-        flake = Snowflake(pos, speed)
-        st['snowflakes'].append(flake)
+        st['snowflakes'].spawn(pos=0.0, speed=speed)
 
 def spawn_treat(strip, st):
     if len(st['treats']) < st['max_treats']:
         pos = random.randint(0, strip.numPixels()-1)
         color, kind = random_treat()
-        t = Treat(pos, color, kind)
-        st['treats'].append(t)
+        # Treats gently sway around their initial position
+        direction = random.choice([-1,1])
+        sway_timer = random.randint(50,150)
+        if kind == 'candy_cane':
+            st['treats'].spawn(pos=pos, shape=CANDY_CANE, origin=pos, direction=direction, sway_timer=sway_timer)
+        else:
+            st['treats'].spawn(pos=pos, shape=BAUBLE, tint=color, origin=pos, direction=direction,
+                               sway_timer=sway_timer)
 
 def spawn_reindeer(strip, st):
     if len(st['reindeers']) < st['max_reindeers']:
-        start_pos = random.randint(0, strip.numPixels()-10)
+        start_pos = random.randint(0, max(0, strip.numPixels()-10))
         direction = random.choice([-1,1])
-        r = Reindeer(start_pos, direction)
-        st['reindeers'].append(r)
+        st['reindeers'].spawn(pos=start_pos, direction=direction)
 
 def spawn_santa(strip, st):
-    if st['santa'] is None:
+    if not len(st['santa']):
         start_pos = 0 if random.random() > 0.5 else strip.numPixels()-11
         direction = 1 if start_pos == 0 else -1
-        st['santa'] = Santa(start_pos, direction)
+        st['santa'].spawn(pos=start_pos, direction=direction)
 
 def update_snowflakes(strip, st):
-    new_list = []
-    num_leds = strip.numPixels()
-    for s in st['snowflakes']:
-        s.update()
-        if s.pos < num_leds:
-            new_list.append(s)
-    st['snowflakes'] = new_list
+    flakes = st['snowflakes']
+    flakes['pos'] += flakes['speed']
+    flakes.cull(flakes['pos'] < strip.numPixels())
 
 def update_treats(strip, st):
-    for t in st['treats']:
-        t.update(st['treat_speed'])
+    treats = st['treats']
+    treats['sway_timer'] -= 1
+    expired = treats['sway_timer'] <= 0
+    treats['direction'][expired] *= -1
+    for i in np.flatnonzero(expired):
+        treats['sway_timer'][i] = random.randint(50,150)
+    treats['pos'] += treats['direction'] * st['treat_speed']
+    # keep treat close to origin: reverse direction to bring it back
+    treats['direction'][np.abs(treats['pos'] - treats['origin']) > 2] *= -1
 
 def update_reindeers(strip, st):
-    new_list = []
-    num_leds = strip.numPixels()
-    for r in st['reindeers']:
-        r.update(st['reindeer_speed'], st['treats'])
-        end_pos = int(r.pos) + r.width
-        if end_pos >= 0 and r.pos < num_leds:
-            new_list.append(r)
-    st['reindeers'] = new_list
+    reindeers = st['reindeers']
+    if not len(reindeers):
+        return
+    # Simple AI: if treat ahead and close, slow down or pause
+    ahead_pos = reindeers['pos'] + REINDEER_WIDTH * reindeers['direction']
+    close_treat = np.zeros(len(reindeers), dtype=bool)
+    close_treat[st['treats'].within(ahead_pos, 5, inclusive=False)[0]] = True
+    paused = reindeers['paused']
+    speed = np.full(len(reindeers), st['reindeer_speed'])
+    for i in np.flatnonzero(close_treat & (paused == 0)):
+        # occasional pause
+        if random.random() < 0.3:
+            paused[i] = 1
+            reindeers['pause_timer'][i] = random.randint(20,50)
+        else:
+            # slow down
+            speed[i] *= 0.5
+
+    moving = paused == 0
+    reindeers['pause_timer'][~moving] -= 1
+    paused[~moving & (reindeers['pause_timer'] <= 0)] = 0
+    reindeers['pos'][moving] += speed[moving] * reindeers['direction'][moving]
+
+    end_pos = np.trunc(reindeers['pos']) + REINDEER_WIDTH
+    reindeers.cull((end_pos >= 0) & (reindeers['pos'] < strip.numPixels()))
 
 def update_santa(strip, st):
-    if st['santa'] is not None:
-        s = st['santa']
-        s.update(st['santa_speed'], st['treats'])
-        num_leds = strip.numPixels()
-        end_pos = int(s.pos) + s.width
-        if end_pos < 0 or s.pos >= num_leds:
-            # Santa off-screen
-            st['santa'] = None
-        else:
-            # Update sparkle trail: decrement lifetime
-            new_trail = []
-            for pos, life in s.sparkle_trail:
-                if life > 1:
-                    new_trail.append((pos, life-1))
-            s.sparkle_trail = new_trail
-
-def background_color(i, st, num_leds):
-    # Slowly shift hue between 0 (red) and 0.333 (green)
-    # hue_base oscillates
-    h = st['hue_base']
-    # Subtle gradient along strip
-    # Let's make the hue vary slightly along the strip
-    # and also use a gentle brightness gradient
-    length = num_leds
-    ratio = i / length
-    # We'll shift hue slightly with position
-    hue = h + 0.1*math.sin(ratio*2*math.pi)
-    hue = hue % 1.0
-    # brightness breathing
-    v = 0.8 + 0.2*math.sin((st['frame_count']*0.01) + (ratio*2*math.pi))
+    santa = st['santa']
+    if not len(santa):
+        return
+    trail = st['santa_trail']
+    speed = st['santa_speed']
+    # Santa speeds up slightly if treat ahead
+    ahead_pos = santa['pos'] + SANTA_WIDTH * santa['direction']
+    if len(st['treats'].within(ahead_pos, 10, inclusive=False)[0]):
+        speed *= 1.3  # Santa gets excited
+
+    old_pos = float(santa['pos'][0])
+    santa['pos'] += speed * santa['direction']
+    new_pos = float(santa['pos'][0])
+    # leave sparkle trail, each spot lasts 5 frames
+    start_p = int(old_pos)
+    end_p = int(new_pos)
+    trail_positions = np.arange(min(start_p,end_p), max(start_p,end_p)+1)
+    trail.spawn(len(trail_positions), pos=trail_positions, life=5)
+
+    end_pos = int(new_pos) + SANTA_WIDTH
+    if end_pos < 0 or new_pos >= strip.numPixels():
+        # Santa off-screen
+        santa.clear()
+        trail.clear()
+    else:
+        # Update sparkle trail: decrement lifetime
+        trail.cull(trail['life'] > 1)
+        trail['life'] -= 1
+
+@lru_cache(maxsize=8)
+def background_profile(num_leds):
+    """Per-LED hue shift and breathing phase; they only depend on the position along the strip."""
+    phase = np.array([(i / num_leds)*2*math.pi for i in range(num_leds)])
+    hue_shift = np.array([0.1*math.sin(p) for p in phase])
+    return hue_shift, phase
+
+def draw_background(pixels, st):
+    """Fill the strip with the slowly shifting red/green background.
+
+    At ratio = i / num_leds each pixel gets, in HSV with full saturation,
+    hue = hue_base + 0.1*sin(2*pi*ratio) and
+    v = 0.8 + 0.2*sin(frame_count*0.01 + 2*pi*ratio),
+    so the hue varies a little along the strip while it breathes.
+    """
+    hue_shift, phase = background_profile(len(pixels))
+    hue = (st['hue_base'] + hue_shift) % 1.0
+    v = 0.8 + 0.2*np.sin((st['frame_count']*0.01) + phase)
     s = 1.0
-    return hsv_to_rgb(hue, s, v)
-
-def draw_snowflake(strip, pos, color):
-    p = int(pos)
-    if 0 <= p < strip.numPixels():
-        set_pixel(strip, p, *color)
-
-def draw_treat(strip, t):
-    p = int(t.pos)
-    if 0 <= p < strip.numPixels():
-        if t.kind == 'candy_cane':
-            # candy cane: 2 pixels if possible
-            set_pixel(strip, p, 255,255,255)
-            if p+1 < strip.numPixels():
-                set_pixel(strip, p+1, 255,0,0)
-        else:
-            # single pixel
-            set_pixel(strip, p, *t.color)
-
-def draw_reindeer(strip, r):
-    start = int(r.pos)
-    for i, c in enumerate(r.colors):
-        pos = start + i
-        if 0 <= pos < strip.numPixels():
-            set_pixel(strip, pos, *c)
-
-def draw_santa(strip, s):
-    start = int(s.pos)
-    for i, c in enumerate(s.colors):
-        pos = start + i
-        if 0 <= pos < strip.numPixels():
-            set_pixel(strip, pos, *c)
-    # draw sparkle trail
-    for pos, life in s.sparkle_trail:
-        if 0 <= pos < strip.numPixels():
-            # faint sparkle intensity
-            intensity = life / 5.0
-            r,g,b = 255*intensity,255*intensity,255*intensity
-            set_pixel(strip, pos, int(r),int(g),int(b))
-
-def draw_twinkles(strip, st):
+    i = np.floor(hue*6)
+    f = hue*6 - i
+    p = v*(1 - s)
+    q = v*(1 - f*s)
+    t = v*(1 - (1-f)*s)
+    sector = (i % 6).astype(np.intp)[:, None]
+    rgb = np.choose(sector, [
+        np.stack((v, t, p), axis=1),
+        np.stack((q, v, p), axis=1),
+        np.stack((p, v, t), axis=1),
+        np.stack((p, q, v), axis=1),
+        np.stack((t, p, v), axis=1),
+        np.stack((v, p, q), axis=1),
+    ])
+    pixels[:] = np.floor(rgb*255)
+
+def draw_santa(pixels, st):
+    st['santa'].draw(pixels)
+    # faint sparkle trail
+    trail = st['santa_trail']
+    trail['tint'] = (255*(trail['life'] / 5.0))[:, None]
+    trail.draw(pixels)
+
+def draw_twinkles(pixels, st):
     # Twinkles are momentary sparkles that fade quickly
-    # We'll handle them separately
     # Each frame, we have a small chance to add a twinkle
+    twinkles = st['twinkles']
     if random.random() < st['twinkle_chance']:
-        p = random.randint(0, strip.numPixels()-1)
-        st['twinkle_pixels'].append((p, 3)) # pixel, lifespan=3 frames
-    
-    # update twinkles
-    new_twinkles = []
-    for p, life in st['twinkle_pixels']:
-        if 0 <= p < strip.numPixels():
-            intensity = life / 3.0
-            set_pixel(strip, p, int(255*intensity), int(255*intensity), int(255*intensity))
-        if life > 1:
-            new_twinkles.append((p, life-1))
-    st['twinkle_pixels'] = new_twinkles
+        twinkles.spawn(pos=random.randint(0, len(pixels)-1), life=3) # lifespan=3 frames
+
+    twinkles['tint'] = (255*(twinkles['life'] / 3.0))[:, None]
+    twinkles.draw(pixels)
+    twinkles.cull(twinkles['life'] > 1)
+    twinkles['life'] -= 1
 
 def reset_xmas_scene_state():
     xmas_scene_state.update({
@@ -317,27 +244,21 @@ def reset_xmas_scene_state():
         'hue_base': 0.0,
         'hue_direction': 1,
 
-        'snowflakes': [],
-        'reindeers': [],
-        'santa': None,
-        'treats': [],
-
-        'twinkle_pixels': []
+        **new_actors(),
     })
 
 def xmas_scene_step(strip):
     st = xmas_scene_state
     num_leds = strip.numPixels()
 
+    pixels = strip.pixels
+
     if not st['initialized']:
         st['initialized'] = True
-        fill_all(strip,0,0,0)
+        pixels.fill(0)
 
     st['frame_count'] += 1
 
-    # Fade previous frame a bit for smooth transitions
-    fade_to_black(strip, 20, st['frame_count'])
-
     # Gradually shift hue_base between 0 and ~0.333 (red <-> green)
     if st['hue_direction'] > 0:
         st['hue_base'] += 0.0005
@@ -369,30 +290,14 @@ def xmas_scene_step(strip):
     update_reindeers(strip, st)
     update_santa(strip, st)
 
-    # Draw background gradient
-    # Since we faded to black, we draw background again to ensure it's visible
-    for i in range(num_leds):
-        r,g,b = background_color(i, st, num_leds)
-        # We'll blend the background lightly over what's currently there
-        # But we already faded, so just set background now
-        # Actually, just set it, elements will overwrite as needed.
-        set_pixel(strip, i, r,g,b)
-
-    # Draw snow
-    for s in st['snowflakes']:
-        draw_snowflake(strip, s.pos, s.color)
-
-    # Draw treats
-    for t in st['treats']:
-        draw_treat(strip, t)
-
-    # Draw reindeers
-    for r in st['reindeers']:
-        draw_reindeer(strip, r)
+    # Draw background gradient; it covers every pixel, elements overwrite it as needed
+    draw_background(pixels, st)
 
-    # Draw Santa
-    if st['santa'] is not None:
-        draw_santa(strip, st['santa'])
+    # Draw snow, treats, reindeers and Santa, each layer over the one before
+    st['snowflakes'].draw(pixels)
+    st['treats'].draw(pixels)
+    st['reindeers'].draw(pixels)
+    draw_santa(pixels, st)
 
     # Draw twinkles
-    draw_twinkles(strip, st)
+    draw_twinkles(pixels, st)
@@ -0,0 +1,100 @@
+import logging
+from threading import Lock
+
+from effect_instance import EffectInstance
+
+log = logging.getLogger("smart-led")
+
+
+class Zone:
+    def __init__(self, name, start, end, effect):
+        self.name = name
+        self.start = start
+        self.end = end
+        self.effect = effect
+        self.instance = EffectInstance(effect)
+        self.failed = False
+
+
+class ZoneEngine:
+    """Named LED ranges, each running its own effect instance.
+
+    render() is a single effect step: it runs every zone's instance on a view
+    of the frame it is given, so all zones share one render loop and one
+    output pipeline however many there are. Zones can't overlap; LEDs outside
+    every zone stay dark. Changes can arrive from other threads while the
+    loop runs, so every method takes the engine lock. A zone whose effect
+    raises is blanked and logged without stopping the others.
+    """
+
+    def __init__(self, num_pixels):
+        self.num_pixels = num_pixels
+        self.zones = {}
+        self._lock = Lock()
+        self._dirty = []
+
+    def _check_range(self, name, start, end):
+        if not 0 <= start < end <= self.num_pixels:
+            raise ValueError(f"Zone range must satisfy 0 <= start < end <= {self.num_pixels}")
+        for other in self.zones.values():
+            if other.name != name and start < other.end and other.start < end:
+                raise ValueError(f"Zone overlaps {other.name!r} ({other.start}-{other.end})")
+
+    def _get(self, name):
+        zone = self.zones.get(name)
+        if zone is None:
+            raise ValueError(f"No zone named {name!r}")
+        return zone
+
+    def create(self, name, start, end, effect):
+        with self._lock:
+            if name in self.zones:
+                raise ValueError(f"Zone {name!r} already exists")
+            self._check_range(name, start, end)
+            self.zones[name] = Zone(name, start, end, effect)
+            self._dirty.append((start, end))
+
+    def resize(self, name, start, end):
+        with self._lock:
+            zone = self._get(name)
+            self._check_range(name, start, end)
+            self._dirty.append((zone.start, zone.end))
+            # Effects size their state to the strip length, so restart from defaults
+            self.zones[name] = Zone(name, start, end, zone.effect)
+            self._dirty.append((start, end))
+
+    def assign(self, name, effect):
+        with self._lock:
+            zone = self._get(name)
+            self.zones[name] = Zone(name, zone.start, zone.end, effect)
+            self._dirty.append((zone.start, zone.end))
+
+    def delete(self, name):
+        with self._lock:
+            zone = self.zones.pop(name, None)
+            if zone is None:
+                raise ValueError(f"No zone named {name!r}")
+            self._dirty.append((zone.start, zone.end))
+
+    def render(self, frame):
+        with self._lock:
+            for start, end in self._dirty:
+                frame.pixels[start:end] = 0.0
+            self._dirty.clear()
+            for zone in self.zones.values():
+                view = frame.view(zone.start, zone.end)
+                try:
+                    zone.instance.render(view)
+                except Exception:
+                    # Log the first failure only; a broken effect would repeat it every frame
+                    if not zone.failed:
+                        log.exception("Zone %r effect %r failed", zone.name, zone.effect["key"])
+                        zone.failed = True
+                    view.pixels[:] = 0.0
+
+    def snapshot(self):
+        with self._lock:
+            return [
+                {"name": zone.name, "start": zone.start, "end": zone.end, "effect_key": zone.effect["key"]}
+                for zone in self.zones.values()
+            ]